@@ -0,0 +1,157 @@
+"""Admin order queue: order placed -> order visible on 20 admin pages.
+
+Opens 20 admin sessions on one headless Flet app (the hub gets a running
+event loop and executor, as under `flet run`), then places orders one at
+a time and times how long each takes to reach every session's screen as
+an incremental insert. Also compares the bytes each update sends with
+re-rendering the whole queue, checks the status state machine (including
+two admins racing on one order) and that every page ends up showing
+exactly what get_order_queue returns.
+
+    python scripts/bench_admin_queue.py [orders] [sessions]
+"""
+import asyncio
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_utils import make_temp_db
+from flet_harness import RecordingConnection, make_page
+
+import flet as ft
+from flet.core.pubsub.pubsub_hub import PubSubHub
+
+import exception
+import migrations
+import repository
+from admin_orders import AdminOrderQueue, build_queue_tile
+
+class TimingConnection(RecordingConnection):
+    """Records when each session was last sent an added control"""
+
+    def __init__(self):
+        super().__init__()
+        self.seen = {}
+        self.changed = threading.Condition()
+
+    def send_commands(self, session_id, commands):
+        result = super().send_commands(session_id, commands)
+        if any(command.name == "add" for command in commands):
+            with self.changed:
+                self.seen[session_id] = time.perf_counter()
+                self.changed.notify_all()
+        return result
+
+def open_sessions(conn, loop, count):
+    queues = []
+    for i in range(count):
+        page = ft.Page(conn, f"admin-{i}", loop)
+        queue = AdminOrderQueue(page, on_status=lambda e: None)
+        queue.open()
+        page.views.append(ft.View("/view_orders", [queue.list_view]))
+        page.update()
+        queues.append(queue)
+    return queues
+
+def wait_visible(conn, sessions, since, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    with conn.changed:
+        while not all(conn.seen.get(s, 0) > since for s in sessions):
+            if not conn.changed.wait(deadline - time.perf_counter()):
+                raise TimeoutError("order did not reach every admin page")
+        return [conn.seen[s] for s in sessions]
+
+def check_transitions(order_id):
+    problems = []
+    try:
+        repository.update_order_status(order_id, 'delivered')
+        problems.append("pending order was delivered directly")
+    except exception.OrderError:
+        pass
+    # Several admins press Accept at once, then Prepared and Reject race
+    for statuses in (('accepted',) * 6, ('prepared', 'rejected') * 3):
+        outcomes = []
+        def press(status):
+            try:
+                repository.update_order_status(order_id, status)
+                outcomes.append(status)
+            except exception.OrderError:
+                pass
+        threads = [threading.Thread(target=press, args=(status,)) for status in statuses]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if len(outcomes) != 1:
+            problems.append(f"{len(outcomes)} racing updates to {'/'.join(set(statuses))} succeeded")
+    if outcomes == ['prepared']:
+        repository.update_order_status(order_id, 'delivered')
+    return problems
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    db_path = make_temp_db(users=50)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrations.migrate(conn)
+    conn.close()
+    repository.configure(db_path)
+    user_id = repository.fetch_one("SELECT id FROM users WHERE is_admin=0")[0]
+    food_id = repository.fetch_one("SELECT id FROM food_items WHERE available=1")[0]
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    conn = TimingConnection()
+    conn.pubsubhub = PubSubHub(loop=loop, executor=ThreadPoolExecutor(max_workers=8))
+    queues = open_sessions(conn, loop, sessions)
+    session_ids = [queue.page.session_id for queue in queues]
+
+    commit_ms, visible_ms, last_ms = [], [], []
+    conn.reset()
+    for _ in range(orders):
+        repository.add_to_cart(user_id, food_id, 1)
+        start = time.perf_counter()
+        order_id = repository.place_order(user_id)
+        committed = time.perf_counter()
+        seen = wait_visible(conn, session_ids, start)
+        commit_ms.append((committed - start) * 1000)
+        visible_ms.extend((t - start) * 1000 for t in seen)
+        last_ms.append((max(seen) - start) * 1000)
+    per_update = conn.bytes_sent / (orders * sessions)
+
+    # What re-rendering the whole queue on every change would send and cost
+    rows = repository.get_order_queue()
+    page, rebuild_conn = make_page()
+    list_view = ft.ListView(expand=1)
+    page.views.append(ft.View("/view_orders", [list_view]))
+    page.update()
+    start = time.perf_counter()
+    list_view.controls = [build_queue_tile(row, None) for row in rows]
+    list_view.update()
+    rebuild_ms = (time.perf_counter() - start) * 1000
+    rebuild = rebuild_conn.bytes_sent
+
+    problems = check_transitions(order_id)
+    time.sleep(0.5)
+    expected = [row[0] for row in repository.get_order_queue(orders + len(rows))]
+    stale = sum(1 for queue in queues if queue.order_ids() != expected)
+    if stale:
+        problems.append(f"{stale} admin pages out of sync with the queue")
+
+    p95 = statistics.quantiles(visible_ms, n=20)[-1]
+    print(f"{orders} orders placed, {sessions} admin sessions open")
+    print(f"  place_order commit:      median {statistics.median(commit_ms):6.2f} ms")
+    print(f"  placed -> visible:       median {statistics.median(visible_ms):6.2f} ms, p95 {p95:6.2f} ms")
+    print(f"  placed -> on all pages:  median {statistics.median(last_ms):6.2f} ms, max {max(last_ms):6.2f} ms")
+    print(f"  per page per new order:  {per_update:8.0f} bytes")
+    print(f"  re-rendering {len(rows)} open orders instead: {rebuild} bytes, {rebuild_ms:.1f} ms per page")
+    print("state machine and sync: " + ("OK" if not problems else "FAILED\n  " + "\n  ".join(problems)))
+    loop.call_soon_threadsafe(loop.stop)
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Admin dashboard stats at 1M orders: four COUNT(*) queries vs app_counters.
+
+Fills a database with a million orders (the counter triggers fire for
+each), times both ways of reading the dashboard numbers, reports what
+the triggers add to order inserts, and checks the counters still match
+real counts after status changes and deletions.
+
+    python scripts/bench_admin_stats.py [orders]
+"""
+import random
+import sqlite3
+import sys
+import time
+
+from bench_utils import make_temp_db
+
+import migrations
+import repository
+
+STATUSES = ['pending', 'accepted', 'prepared', 'delivered', 'rejected']
+
+def counted_stats(conn):
+    # What get_admin_stats did before
+    return {
+        'total_orders': conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0],
+        'pending_orders': conn.execute("SELECT COUNT(*) FROM orders WHERE status='pending'").fetchone()[0],
+        'total_food_items': conn.execute("SELECT COUNT(*) FROM food_items").fetchone()[0],
+        'total_customers': conn.execute("SELECT COUNT(*) FROM users WHERE is_admin=0").fetchone()[0],
+    }
+
+def insert_orders(conn, count, rng):
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO orders (user_id, status, total_amount) VALUES (2, ?, 10)",
+        ((rng.choice(STATUSES),) for _ in range(count))
+    )
+    conn.commit()
+    return time.perf_counter() - start
+
+def timed_ms(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+def trigger_overhead(rng, count=100000):
+    """Seconds to insert `count` orders with and without the counter triggers"""
+    results = []
+    for keep_triggers in (False, True):
+        conn = sqlite3.connect(make_temp_db())
+        migrations.migrate(conn)
+        if not keep_triggers:
+            for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'app_counters_%'").fetchall():
+                conn.execute(f"DROP TRIGGER {name}")
+        results.append(insert_orders(conn, count, rng))
+        conn.close()
+    return results
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(9)
+    db_path = make_temp_db(users=2000)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrations.migrate(conn)
+    elapsed = insert_orders(conn, count, rng)
+    print(f"{count} orders inserted in {elapsed:.1f}s")
+
+    repository.configure(db_path)
+    stats, counters_ms = timed_ms(repository.get_admin_stats, 1000)
+    with repository.pool.connection() as read_conn:
+        expected, count_ms = timed_ms(lambda: counted_stats(read_conn), 5)
+    print(f"  four COUNT(*) queries {count_ms:10.3f} ms per dashboard")
+    print(f"  app_counters          {counters_ms:10.3f} ms per dashboard")
+    ok = stats == expected
+
+    # Churn: status changes (in and out of pending), deletions, new customers
+    conn.execute("UPDATE orders SET status='accepted' WHERE status='pending' AND id % 7 = 0")
+    conn.execute("UPDATE orders SET status='pending' WHERE status='rejected' AND id % 5 = 0")
+    conn.execute("DELETE FROM orders WHERE id % 11 = 0")
+    conn.execute("INSERT INTO users (username, password, email) VALUES ('late', 'x', 'late@canteen.com')")
+    conn.execute("UPDATE users SET is_admin=1 WHERE username='student3'")
+    conn.commit()
+    conn.close()
+    after_churn = repository.get_admin_stats() == counted_stats(sqlite3.connect(db_path))
+    print(f"counters match COUNT(*): {ok} (after churn: {after_churn})")
+
+    without, with_triggers = trigger_overhead(rng)
+    print(f"trigger cost on 100k order inserts: {without:.2f}s -> {with_triggers:.2f}s")
+    sys.exit(0 if ok and after_churn else 1)
+
+if __name__ == "__main__":
+    main()
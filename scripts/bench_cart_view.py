@@ -0,0 +1,116 @@
+"""Cart screen taps on a 30-item cart: rebuilding the View vs patching rows.
+
+Taps +/- (and the odd delete) on random lines of a 30-item cart on a
+headless Flet page. The old way re-read the cart and pushed a brand new
+View per tap; CartScreen patches the row and the total in place. Reports
+bytes sent and latency per tap, checks the screen agrees with the cart
+afterwards and that a failed write puts the previous quantity back.
+
+    python scripts/bench_cart_view.py [taps] [items]
+"""
+import random
+import statistics
+import sys
+import time
+
+from bench_utils import make_temp_db
+from flet_harness import make_page
+
+import flet as ft
+
+import repository
+from cart_screen import CartScreen
+from cart_store import CartStore
+
+def cart_view(page, screen):
+    # The shape of CanteenApp.cart_view
+    page.views.clear()
+    page.views.append(ft.View("/cart", [
+        ft.AppBar(title=ft.Text("Your Cart")),
+        screen.list,
+        ft.Divider(),
+        ft.Container(content=ft.Row([screen.total_text, screen.checkout_button]), padding=16)
+    ]))
+    page.update()
+
+def new_screen(store, user_id):
+    return CartScreen(store.get_cart_items(user_id), None, None, None)
+
+def run_taps(taps, rng, food_ids, tap):
+    sizes, times = [], []
+    for _ in range(taps):
+        food_id = rng.choice(food_ids)
+        change = rng.choice((1, 1, -1))
+        start = time.perf_counter()
+        sent = tap(food_id, change)
+        times.append((time.perf_counter() - start) * 1000)
+        sizes.append(sent)
+    return sizes, times
+
+def report(label, sizes, times):
+    p95 = statistics.quantiles(times, n=20)[-1]
+    print(f"  {label:18} {statistics.mean(sizes):9.0f} bytes/tap  {statistics.median(times):7.2f} ms median  {p95:7.2f} ms p95")
+
+def main():
+    taps = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    items = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    rng = random.Random(21)
+    repository.configure(make_temp_db(extra_items=items))
+    user_id = repository.fetch_one("SELECT id FROM users WHERE is_admin=0")[0]
+    food_ids = [row[0] for row in repository.fetch_all("SELECT id FROM food_items WHERE available=1 LIMIT ?", (items,))]
+    store = CartStore(enabled=True, flush_interval=60)
+    for food_id in food_ids:
+        # Start high enough that '-' taps never empty a line
+        store.add_to_cart(user_id, food_id, taps)
+
+    print(f"{taps} taps on a {len(food_ids)}-item cart")
+    page, conn = make_page()
+
+    # Before: every tap re-read the cart and pushed a new View
+    def rebuild(food_id, change):
+        store.change_cart_quantity(user_id, food_id, change)
+        conn.reset()
+        cart_view(page, new_screen(store, user_id))
+        return conn.bytes_sent
+    report("rebuild View", *run_taps(taps, rng, food_ids, rebuild))
+
+    screen = new_screen(store, user_id)
+    cart_view(page, screen)
+    def patch(food_id, change):
+        conn.reset()
+        screen.change_quantity(
+            food_id, screen.quantity(food_id) + change,
+            lambda: store.change_cart_quantity(user_id, food_id, change)
+        )
+        return conn.bytes_sent
+    report("patch in place", *run_taps(taps, rng, food_ids, patch))
+
+    conn.reset()
+    screen.change_quantity(food_ids[0], 0, lambda: store.remove_from_cart(user_id, food_ids[0]))
+    print(f"  delete one line:   {conn.bytes_sent} bytes")
+
+    problems = []
+    expected = {item[0]: item[4] for item in store.get_cart_items(user_id)}
+    shown = {food_id: screen.quantity(food_id) for food_id in food_ids if screen.quantity(food_id)}
+    if shown != expected:
+        problems.append("screen quantities differ from the cart")
+
+    # A write that fails shows the previous quantity again
+    def failing_write():
+        raise RuntimeError("database is locked")
+    food_id = food_ids[1]
+    before = screen.quantity(food_id)
+    try:
+        screen.change_quantity(food_id, before + 1, failing_write)
+        problems.append("failed write did not raise")
+    except RuntimeError:
+        pass
+    row = screen.rows[food_id]
+    if screen.quantity(food_id) != before or row.quantity_text.value != str(before):
+        problems.append("failed write was not rolled back")
+    print("consistency and rollback: " + ("OK" if not problems else "FAILED\n  " + "\n  ".join(problems)))
+    store.close()
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Database commits per minute from cart edits: direct vs write-behind cart.
+
+Simulated students tap +/-/add in their carts at human speed. Both carts
+write through repository.writer with the app's own connection pragmas
+(WAL, synchronous=NORMAL). Under NORMAL a WAL commit is not fsynced (only
+checkpoints are), so what is counted is commits: writer transactions and
+WAL appends, not fsyncs. Also checks that edits left in the journal by a
+"crashed" store are recovered.
+
+    python scripts/bench_cart_writes.py [students] [seconds]
+"""
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+from bench_utils import make_temp_db
+
+import migrations
+import repository
+from cart_store import CartStore
+
+def prepare(students):
+    db_path = make_temp_db(users=students)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrations.migrate(conn)
+    user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE is_admin=0")][:students]
+    food_ids = [row[0] for row in conn.execute("SELECT id FROM food_items")]
+    conn.close()
+    repository.configure(db_path)
+    return user_ids, food_ids
+
+def simulate(store, user_ids, food_ids, seconds):
+    deadline = time.monotonic() + seconds
+    taps = [0]
+    lock = threading.Lock()
+
+    def student(user_id):
+        rng = random.Random(user_id)
+        count = 0
+        while time.monotonic() < deadline:
+            food_id = rng.choice(food_ids[:8])
+            action = rng.random()
+            if action < 0.5:
+                store.add_to_cart(user_id, food_id, 1)
+            elif action < 0.9:
+                store.change_cart_quantity(user_id, food_id, rng.choice((1, -1)))
+            else:
+                store.remove_from_cart(user_id, food_id)
+            count += 1
+            time.sleep(rng.uniform(0.2, 1.0))
+        with lock:
+            taps[0] += count
+
+    threads = [threading.Thread(target=student, args=(user_id,)) for user_id in user_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.flush()
+    return taps[0]
+
+def run(mode, students, seconds):
+    user_ids, food_ids = prepare(students)
+    store = CartStore(enabled=(mode == "write-behind"))
+    before = repository.writer.batches
+    taps = simulate(store, user_ids, food_ids, seconds)
+    commits = repository.writer.batches - before
+    store.close()
+    per_minute = commits * 60 / seconds
+    print(f"  {mode:13} {taps:6} taps {commits:6} commits {per_minute:8.0f} commits/min")
+    return per_minute
+
+def check_recovery():
+    user_ids, food_ids = prepare(1)
+    user_id, food_id = user_ids[0], food_ids[0]
+    crashed = CartStore(enabled=True, flush_interval=3600)
+    crashed.add_to_cart(user_id, food_id, 3)
+    crashed.change_cart_quantity(user_id, food_id, 2)
+    # Never flushed or closed: the quantity only exists in the journal
+    assert repository.get_cart_quantity(user_id, food_id) == 0
+
+    restarted = CartStore(enabled=True)
+    quantity = restarted.get_cart_quantity(user_id, food_id)
+    restarted.close()
+    stored = repository.get_cart_quantity(user_id, food_id)
+    ok = quantity == stored == 5
+    print(f"crash recovery: journal replayed, quantity {stored} ({'OK' if ok else 'MISMATCH'})")
+    return ok
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 15
+    print(f"{students} students tapping for {seconds:.0f}s each run")
+    direct = run("direct", students, seconds)
+    behind = run("write-behind", students, seconds)
+    print(f"commits per minute: {direct:.0f} -> {behind:.0f} ({direct / max(behind, 1):.0f}x fewer)")
+    sys.exit(0 if check_recovery() else 1)
+
+if __name__ == "__main__":
+    main()
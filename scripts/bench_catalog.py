@@ -0,0 +1,68 @@
+"""DB round trips and latency of menu browsing with and without the catalog cache.
+
+Simulates students switching category tabs and opening food details, then
+prints the catalog hit/miss counters.
+
+    python scripts/bench_catalog.py [browse_actions]
+"""
+import random
+import sys
+import time
+
+from bench_utils import make_temp_db
+
+import repository
+from catalog import MenuCatalog
+
+def count_queries():
+    """Wrap the repository read helpers so every query is counted"""
+    counter = {'queries': 0}
+    for name in ("fetch_all", "fetch_one"):
+        original = getattr(repository, name)
+
+        def counting(*args, _original=original):
+            counter['queries'] += 1
+            return _original(*args)
+        setattr(repository, name, counting)
+    return counter
+
+def browse_uncached(actions, category_ids, food_ids, rng):
+    for _ in range(actions):
+        repository.get_categories()
+        repository.get_food_items(rng.choice(category_ids))
+        item = repository.get_food_item(rng.choice(food_ids))
+        repository.get_category_name(item[4])
+
+def browse_cached(menu, actions, category_ids, food_ids, rng):
+    for _ in range(actions):
+        menu.categories()
+        menu.food_items(rng.choice(category_ids))
+        item = menu.food_item(rng.choice(food_ids))
+        menu.category_name(item[4])
+
+def main():
+    actions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repository.configure(make_temp_db(extra_items=2000))
+    counter = count_queries()
+    category_ids = [row[0] for row in repository.get_categories()]
+    food_ids = [row[0] for row in repository.get_food_items()]
+
+    counter['queries'] = 0
+    start = time.perf_counter()
+    browse_uncached(actions, category_ids, food_ids, random.Random(1))
+    uncached_time = time.perf_counter() - start
+    uncached_queries = counter['queries']
+
+    menu = MenuCatalog()
+    counter['queries'] = 0
+    start = time.perf_counter()
+    browse_cached(menu, actions, category_ids, food_ids, random.Random(1))
+    cached_time = time.perf_counter() - start
+
+    print(f"{actions} browse actions (tabs + details) over {len(food_ids)} items")
+    print(f"  no cache      : {uncached_queries:6} queries  {uncached_time * 1000:8.1f} ms")
+    print(f"  catalog cache : {counter['queries']:6} queries  {cached_time * 1000:8.1f} ms")
+    print(f"  counters      : {menu.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Cold start of the app: import, database bootstrap and first dashboard render.
+
+Every run is a fresh interpreter (as on app start or a Flet hot reload)
+that imports main, runs main() on a headless page and renders the
+dashboard, timing each phase. Three starts are compared on a database
+with many students:
+
+  before   what importing database.py used to do: init_db() plus reading
+           and printing every user
+  upgrade  bootstrap() on a database whose user_version is behind
+  current  bootstrap() on an up to date database (every normal start)
+
+    python scripts/bench_cold_start.py [runs] [students]
+"""
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+PHASES = ("import", "db init", "main()", "dashboard")
+
+def child(db_path, mode):
+    os.chdir(os.path.dirname(db_path))
+    start = time.perf_counter()
+    from flet_harness import attach_client_storage, make_page
+    import main
+    import database
+    timings = {"import": time.perf_counter() - start}
+
+    start = time.perf_counter()
+    if mode == "before":
+        database.init_db(db_path)
+        conn = sqlite3.connect(db_path)
+        with open(os.devnull, "w") as out:
+            for user in conn.execute("SELECT * FROM users").fetchall():
+                print(user, file=out)
+        conn.close()
+        database._bootstrapped.add(database.DB_PATH)
+    else:
+        database.bootstrap(database.DB_PATH)
+    timings["db init"] = time.perf_counter() - start
+
+    page, conn = make_page()
+    conn.page_url = "http://localhost:8550"
+    user_id = sqlite3.connect(db_path).execute("SELECT id FROM users WHERE is_admin=0").fetchone()[0]
+    attach_client_storage(page, {"user_id": user_id, "is_admin": False})
+    start = time.perf_counter()
+    main.main(page)
+    timings["main()"] = time.perf_counter() - start
+
+    app = page.on_route_change.__self__
+    start = time.perf_counter()
+    app.route_change("/user_dashboard")
+    timings["dashboard"] = time.perf_counter() - start
+    sys.__stdout__.write(json.dumps(timings) + "\n")
+
+def run(db_path, mode, runs):
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(runs):
+        if mode == "upgrade":
+            conn = sqlite3.connect(db_path)
+            conn.execute("PRAGMA user_version=0")
+            conn.close()
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", db_path, mode],
+            capture_output=True, text=True, check=True
+        )
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        for phase in PHASES:
+            samples[phase].append(timings[phase] * 1000)
+    return {phase: statistics.median(values) for phase, values in samples.items()}
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    students = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    from bench_utils import make_temp_db
+    db_path = make_temp_db(users=students)
+
+    print(f"cold start, median of {runs} fresh processes, {students} students")
+    print(f"  {'':8}" + "".join(f"{phase:>12}" for phase in PHASES) + f"{'total':>12}")
+    for mode in ("before", "upgrade", "current"):
+        medians = run(db_path, mode, runs)
+        print(f"  {mode:8}" + "".join(f"{medians[p]:10.1f}ms" for p in PHASES) + f"{sum(medians.values()):10.1f}ms")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        sys.stdout = open(os.devnull, "w")  # the app's route logging
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,87 @@
+"""Requests/sec of simulated browsing sessions: connect-per-call vs the shared pool.
+
+    python scripts/bench_connection_pool.py [sessions] [clicks_per_session]
+"""
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+from bench_utils import make_temp_db
+
+import repository
+
+def old_style_click(db_path, user_id, food_id, category_id):
+    # Mirrors the handlers before the pool: one fresh connection per query
+    for sql, params in (
+        ("SELECT * FROM categories ORDER BY name", ()),
+        ("SELECT * FROM food_items WHERE category_id=? AND available=1", (category_id,)),
+        ("SELECT * FROM food_items WHERE id=?", (food_id,)),
+        ("SELECT AVG(rating), COUNT(*) FROM reviews WHERE food_item_id=?", (food_id,)),
+        ("SELECT quantity FROM cart_items WHERE user_id=? AND food_item_id=?", (user_id, food_id)),
+    ):
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+def pooled_click(db_path, user_id, food_id, category_id):
+    repository.get_categories()
+    repository.get_food_items(category_id)
+    repository.get_food_item(food_id)
+    repository.get_rating_summary(food_id)
+    repository.get_cart_quantity(user_id, food_id)
+
+def run(click, db_path, sessions, clicks):
+    """(completed clicks per second, failed clicks) over all sessions"""
+    conn = sqlite3.connect(db_path)
+    food_ids = [row[0] for row in conn.execute("SELECT id FROM food_items")]
+    category_ids = [row[0] for row in conn.execute("SELECT id FROM categories")]
+    conn.close()
+
+    completed = []
+    errors = []
+    def session(seed):
+        rng = random.Random(seed)
+        done = 0
+        for _ in range(clicks):
+            try:
+                click(db_path, seed + 1, rng.choice(food_ids), rng.choice(category_ids))
+                done += 1
+            except Exception as e:
+                # A failed click is not a served request
+                errors.append(e)
+        completed.append(done)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(completed) / elapsed, errors
+
+def report(label, rate, errors, baseline=None):
+    speedup = f"  ({rate / baseline:.1f}x)" if baseline else ""
+    failed = f"  {len(errors)} failed, e.g. {errors[0]!r}" if errors else ""
+    print(f"  {label:16} : {rate:9.1f} req/s{speedup}{failed}")
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    clicks = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    # Bootstrapped (migrated) copy: the pooled reads use food_item_stats
+    db_path = make_temp_db(extra_items=2000, users=sessions)
+    repository.configure(db_path)
+
+    before, before_errors = run(old_style_click, db_path, sessions, clicks)
+    after, after_errors = run(pooled_click, db_path, sessions, clicks)
+    print(f"{sessions} sessions x {clicks} clicks (5 queries per click)")
+    report("connect per call", before, before_errors)
+    report("connection pool", after, after_errors, baseline=before)
+    sys.exit(1 if before_errors or after_errors else 0)
+
+if __name__ == "__main__":
+    main()
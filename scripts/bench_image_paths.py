@@ -0,0 +1,47 @@
+"""Cost of resolving image paths for 1,000 cards: per-call stats vs the asset manifest.
+
+    python scripts/bench_image_paths.py [cards]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+from bench_utils import SRC
+
+from asset_manifest import AssetManifest
+
+def old_get_image_path(db_path=None):
+    # helper_function.get_image_path before the manifest
+    assets_dir = Path("assets")
+    absolute_assets = Path("E:/TO-DO-LIST-Project/SchoolProject/CSB_Final_Project/src/assets")
+    working_assets = absolute_assets if absolute_assets.exists() else assets_dir
+    default_image = working_assets / "default.png"
+    if db_path:
+        potential_path = working_assets / db_path
+        if potential_path.exists():
+            return str(potential_path)
+    return str(default_image)
+
+def run(resolve, names):
+    start = time.perf_counter()
+    for name in names:
+        resolve(name)
+    return time.perf_counter() - start
+
+def main():
+    cards = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    # Run from src/ like `flet run` does, so "assets/" resolves
+    os.chdir(SRC)
+    names = (["burger.png", "missing.png", None, "default.png"] * cards)[:cards]
+
+    manifest = AssetManifest()
+    manifest.refresh()
+    old = min(run(old_get_image_path, names) for _ in range(5))
+    new = min(run(manifest.resolve, names) for _ in range(5))
+    print(f"resolving {cards} card images (best of 5)")
+    print(f"  Path.exists() per call : {old * 1000:8.3f} ms  ({old / cards * 1e6:.2f} us/card)")
+    print(f"  asset manifest         : {new * 1000:8.3f} ms  ({new / cards * 1e6:.2f} us/card)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Bytes sent for food images per dashboard load: originals vs generated variants.
+
+Builds a throwaway assets folder with one distinct image per menu item,
+runs the image pipeline over it and compares the size of what each screen
+would load.
+
+    python scripts/bench_image_variants.py
+"""
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from bench_utils import SEED_DB, SRC
+
+from PIL import Image
+
+from asset_manifest import AssetManifest
+from image_pipeline import ImagePipeline, VARIANT_SIZES
+from menu_grid import GRID_PAGE_SIZE
+
+def make_assets(names):
+    folder = Path(tempfile.mkdtemp(prefix="canteen-assets-"))
+    shutil.copy(SRC / "assets" / "default.png", folder / "default.png")
+    with Image.open(SRC / "assets" / "burger.png") as source:
+        source.load()
+        for i, name in enumerate(names):
+            # Distinct content per item so variants are not shared
+            source.rotate(i * 7 % 360).save(folder / name)
+    return folder
+
+def main():
+    conn = sqlite3.connect(SEED_DB)
+    names = sorted({row[0] for row in conn.execute("SELECT image_path FROM food_items WHERE image_path IS NOT NULL")})
+    conn.close()
+
+    assets = AssetManifest((make_assets(names),))
+    pipeline = ImagePipeline(assets)
+    start = time.perf_counter()
+    pipeline.warm_up()
+    pipeline.wait()
+    elapsed = time.perf_counter() - start
+    print(f"generated {len(VARIANT_SIZES)} variants for {len(names) + 1} images in {elapsed:.2f}s")
+
+    cards = names[:GRID_PAGE_SIZE]
+    print(f"  {'screen':10} {'images':>6} {'original KB':>12} {'variant KB':>11} {'saved':>7}")
+    for size in VARIANT_SIZES:
+        original = sum(Path(assets.resolve(name)).stat().st_size for name in cards)
+        variant = sum(Path(pipeline.variant(name, size)).stat().st_size for name in cards)
+        print(f"  {size:10} {len(cards):6} {original / 1024:12.1f} {variant / 1024:11.1f} {1 - variant / original:7.0%}")
+
+    original = sum(Path(assets.resolve(name)).stat().st_size for name in cards)
+    variant = sum(Path(pipeline.variant(name, "grid")).stat().st_size for name in cards)
+    print(f"dashboard load ({len(cards)} grid cards): {(original - variant) / 1024:.1f} KB saved")
+    pipeline.shutdown()
+
+if __name__ == "__main__":
+    main()
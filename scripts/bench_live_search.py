@@ -0,0 +1,90 @@
+"""Keystrokes vs searches executed for search-as-you-type.
+
+Simulates students typing queries letter by letter (with realistic gaps
+between keys, and a pause now and then) into LiveSearch and reports how
+many database searches were actually run. Then checks that every prefix
+of some accented queries gives the same results narrowed from the prefix
+cache as from a fresh FTS query.
+
+    python scripts/bench_live_search.py [students]
+"""
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+from bench_utils import make_temp_db
+
+import migrations
+import repository
+import search
+
+TYPED = ["burger", "spicy noodles", "kimchi fries", "smoked taco", "pizza", "chese"]
+# Names the FTS tokenizer folds (accents) or keeps (ß, ligature, full width)
+FOLDED_ITEMS = ["Café Latte", "Crème Brûlée", "Jalapeño Poppers", "Straße Pretzel", "ﬁsh Taco", "Ｍatcha Tea", "Fish_Chips Basket"]
+FOLDED_QUERIES = ["cafe latte", "café", "creme brulee", "jalapeno", "strasse", "straße", "fish", "matcha", "fish chips"]
+
+def student(seed, sessions):
+    rng = random.Random(seed)
+    shown = []
+    live = search.LiveSearch(lambda query, results: shown.append(query), delay=0.15)
+    sessions.append(live)
+    for _ in range(3):
+        text = ""
+        for letter in rng.choice(TYPED):
+            text += letter
+            live.on_input(text)
+            # ~120 ms between keys, sometimes a pause long enough to search
+            time.sleep(rng.choice([0.08, 0.1, 0.12, 0.14, 0.3]))
+        time.sleep(0.3)
+
+def check_prefix_cache():
+    """Queries where narrowing cached results disagrees with a fresh search"""
+    problems = []
+    live = search.LiveSearch(lambda query, results: None)
+    for query in FOLDED_QUERIES:
+        for end in range(1, len(query) + 1):
+            text = query[:end]
+            narrowed = {item[1] for item in live.lookup(text)}
+            fresh = {item[1] for item in search.LiveSearch(lambda q, r: None).lookup(text)}
+            if narrowed != fresh:
+                problems.append(f"{text!r}: cache {sorted(narrowed)} vs fts {sorted(fresh)}")
+    return problems
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    db_path = make_temp_db(extra_items=300)
+    conn = sqlite3.connect(db_path)
+    migrations.migrate(conn)
+    conn.executemany(
+        "INSERT INTO food_items (name, description, price, category_id, image_path, available) "
+        "VALUES (?, '', 5, (SELECT MIN(id) FROM categories), 'burger.png', 1)",
+        ((name,) for name in FOLDED_ITEMS)
+    )
+    conn.commit()
+    conn.close()
+    repository.configure(db_path)
+
+    sessions = []
+    threads = [threading.Thread(target=student, args=(i, sessions)) for i in range(students)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    totals = {}
+    for live in sessions:
+        for key, value in live.metrics().items():
+            totals[key] = totals.get(key, 0) + value
+    print(f"{students} students typing 3 queries each")
+    for key, value in totals.items():
+        print(f"  {key:18} {value}")
+    print(f"  searches/keystroke {totals['searches_executed'] / totals['keystrokes']:.2f}")
+
+    problems = check_prefix_cache()
+    print("prefix cache vs fts: " + ("OK" if not problems else "FAILED\n  " + "\n  ".join(problems)))
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Login throughput at different scrypt cost settings.
+
+Simulates a login storm: many sessions verifying passwords at once through
+the bounded hashing pool, and reports logins/sec and p99 latency per cost.
+Also checks that a legacy SHA-256 row verifies and is flagged for rehash,
+and how long a cheap tap from another session waits for a Flet handler
+thread behind a login storm, with handlers that wait for the hash vs
+handlers that hand it off (CanteenApp.login).
+
+    python scripts/bench_login.py [sessions] [logins_per_session]
+"""
+import hashlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from bench_utils import percentile
+
+import passwords
+
+COSTS = [2 ** 12, 2 ** 13, 2 ** 14, 2 ** 15]
+# Event handler threads of the simulated Flet session executor
+HANDLER_THREADS = 8
+
+def storm(stored, sessions, logins):
+    latencies = []
+    lock = threading.Lock()
+
+    def session():
+        for _ in range(logins):
+            start = time.perf_counter()
+            assert passwords.run_hashing(passwords.verify_password, stored, "hunter2")
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies) / (time.perf_counter() - start), percentile(latencies, 99)
+
+def tap_wait(stored, logins, blocking):
+    """Seconds a no-op handler waits behind `logins` login handlers"""
+    handlers = ThreadPoolExecutor(HANDLER_THREADS)
+    hashes = []
+
+    def login():
+        if blocking:
+            passwords.run_hashing(passwords.verify_password, stored, "hunter2")
+        else:
+            hashes.append(passwords.submit_hashing(passwords.verify_password, stored, "hunter2"))
+
+    for _ in range(logins):
+        handlers.submit(login)
+    start = time.perf_counter()
+    handlers.submit(lambda: None).result()
+    waited = time.perf_counter() - start
+    handlers.shutdown(wait=True)
+    wait(hashes)
+    return waited
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    legacy = hashlib.sha256(b"hunter2").hexdigest()
+    assert passwords.verify_password(legacy, "hunter2") and passwords.needs_rehash(legacy)
+
+    print(f"{sessions} sessions x {logins} logins, {passwords.HASH_WORKERS} hashing workers")
+    print(f"  {'scrypt N':>9} {'memory':>8} {'logins/s':>9} {'p99 ms':>8}")
+    rate, p99 = storm(legacy, sessions, logins)
+    print(f"  {'sha256':>9} {'-':>8} {rate:9.1f} {p99 * 1000:8.1f}")
+    for n in COSTS:
+        stored = passwords.hash_password("hunter2", n=n)
+        rate, p99 = storm(stored, sessions, logins)
+        memory = 128 * n * passwords.SCRYPT_R // (1024 * 1024)
+        print(f"  {n:9} {memory:6}MB {rate:9.1f} {p99 * 1000:8.1f}")
+
+    stored = passwords.hash_password("hunter2")
+    logins = sessions * logins
+    print(f"tap from another session behind {logins} logins, {HANDLER_THREADS} handler threads")
+    print(f"  handler waits for the hash : {tap_wait(stored, logins, True) * 1000:8.1f} ms")
+    print(f"  handler hands the hash off : {tap_wait(stored, logins, False) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Controls and bytes sent per category tab switch on the dashboard grid.
+
+Compares the old update_food_grid (clear and rebuild every card) with the
+keyed FoodGrid, on a headless page, for a 500-item menu.
+
+    python scripts/bench_menu_grid.py [items]
+"""
+import sqlite3
+import sys
+import time
+
+from bench_utils import make_temp_db
+from flet_harness import make_page
+
+import flet as ft
+
+import repository
+from menu_grid import FoodGrid, build_food_card
+
+def rebuild_grid(grid, items):
+    # What update_food_grid did before: a brand new card tree for every item
+    grid.controls.clear()
+    for item in items:
+        grid.controls.append(build_food_card(item, lambda item_id: None))
+    grid.update()
+
+def measure(switch, tabs, page, conn):
+    conn.reset()
+    start = time.perf_counter()
+    for items in tabs:
+        switch(items)
+    elapsed = time.perf_counter() - start
+    stats = conn.stats()
+    n = len(tabs)
+    return stats['added'] / n, stats['bytes'] / n, elapsed / n * 1000
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repository.configure(make_temp_db(extra_items=max(0, items - 49)))
+    menu = repository.get_food_items()[:items]
+    by_category = {}
+    for item in menu:
+        by_category.setdefault(item[4], []).append(item)
+    # The tab sequence a student clicks through: All, each category, back to All
+    tabs = [menu] + list(by_category.values()) + [menu]
+
+    page, conn = make_page()
+    old_grid = ft.GridView(runs_count=3, max_extent=200)
+    page.add(old_grid)
+    rebuild_grid(old_grid, menu)
+    old = measure(lambda tab: rebuild_grid(old_grid, tab), tabs * 3, page, conn)
+
+    page, conn = make_page()
+    food_grid = FoodGrid(page, on_open=lambda item_id: None)
+    page.add(food_grid.grid)
+    food_grid.show(menu)
+    new = measure(food_grid.show, tabs * 3, page, conn)
+
+    print(f"{len(menu)} items, {len(by_category)} categories, averages per tab switch")
+    print(f"  {'':22} {'controls sent':>14} {'bytes sent':>12} {'ms':>8}")
+    print(f"  {'clear + rebuild':22} {old[0]:14.0f} {old[1]:12.0f} {old[2]:8.2f}")
+    print(f"  {'keyed FoodGrid':22} {new[0]:14.0f} {new[1]:12.0f} {new[2]:8.2f}")
+    print(f"  cards built by FoodGrid: {food_grid.cards_built}")
+
+if __name__ == "__main__":
+    main()
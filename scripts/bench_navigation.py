@@ -0,0 +1,95 @@
+"""Navigation latency: dashboard -> food details -> back, with and without the view cache.
+
+Drives CanteenApp.route_change on a headless page (page.go is made
+synchronous so the app's own navigation runs inline) and times each step
+of dashboard -> details -> back loops over a handful of items, first with
+every view built from scratch, then with the per-session view cache.
+Finally checks that a cart change and a menu change are not served from
+stale cached views.
+
+    python scripts/bench_navigation.py [loops] [extra menu items]
+"""
+import os
+import statistics
+import sys
+import time
+
+from bench_utils import make_temp_db
+from flet_harness import attach_client_storage, make_page
+
+def make_app(user_id, cache_size):
+    import main
+    from view_cache import ViewCache
+
+    page, conn = make_page()
+    conn.page_url = "http://localhost:8550"
+    attach_client_storage(page, {"user_id": user_id, "is_admin": False})
+    app = main.CanteenApp(page)
+    app.view_cache = ViewCache(size=cache_size)
+    def go(route, **kwargs):
+        page.route = route
+        app.route_change(route)
+    page.go = go
+    return app, page, conn
+
+def back(app, page):
+    # What the client's back button does (CanteenApp.view_pop)
+    app.view_pop(page.views[-1])
+
+def run_loops(app, page, conn, food_ids, loops):
+    steps = {"dashboard": [], "details": [], "back": []}
+    sent = {"dashboard": 0, "details": 0, "back": 0}
+    for i in range(loops):
+        food_id = food_ids[i % len(food_ids)]
+        for step, action in (
+            ("dashboard", lambda: page.go("/user_dashboard")),
+            ("details", lambda: page.go(f"/food_details/{food_id}")),
+            ("back", lambda: back(app, page)),
+        ):
+            conn.reset()
+            start = time.perf_counter()
+            action()
+            steps[step].append((time.perf_counter() - start) * 1000)
+            sent[step] += conn.bytes_sent
+    return steps, {step: total / loops for step, total in sent.items()}
+
+def main():
+    loops = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    items = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    db_path = make_temp_db(extra_items=items)
+    # database.py and repository default to ./canteen.db: point them at the copy
+    os.chdir(os.path.dirname(db_path))
+    import repository
+    from catalog import catalog
+    repository.configure(db_path)
+    user_id = repository.fetch_one("SELECT id FROM users WHERE is_admin=0")[0]
+    food_ids = [item[0] for item in catalog.food_items()[:5]]
+
+    print(f"{loops} dashboard -> details -> back loops, {len(catalog.food_items())} menu items")
+    for label, size in (("no cache", 0), ("view cache", 16)):
+        app, page, conn = make_app(user_id, size)
+        steps, sent = run_loops(app, page, conn, food_ids, loops)
+        print(f"  {label}:")
+        for step, samples in steps.items():
+            p95 = statistics.quantiles(samples, n=20)[-1]
+            print(f"    {step:10} {statistics.median(samples):7.2f} ms median {p95:7.2f} ms p95 {sent[step]:9.0f} bytes")
+
+    # Cached views must not outlive the data they show
+    problems = []
+    page.go(f"/food_details/{food_ids[0]}")
+    details = page.views[-1]
+    app.add_to_cart(food_ids[0], 2)
+    page.go("/user_dashboard")
+    page.go(f"/food_details/{food_ids[0]}")
+    if page.views[-1] is details:
+        problems.append("details view reused after a cart change")
+    dashboard = page.views[0]
+    catalog.invalidate()
+    page.go("/user_dashboard")
+    if page.views[0] is dashboard:
+        problems.append("dashboard reused after a menu change")
+    print("invalidation: " + ("OK" if not problems else "FAILED\n  " + "\n  ".join(problems)))
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Cost of opening past orders: two queries vs snapshot vs LRU-cached snapshot.
+
+Opens a run of orders the way students browse their history (recent ones
+far more often than old ones) and checks that snapshots match the
+normalized tables, including after a status change.
+
+    python scripts/bench_order_details.py [orders] [opens]
+"""
+import random
+import sys
+import time
+
+from bench_utils import make_temp_db
+from bench_order_history import seed_orders
+
+import repository
+from order_cache import OrderCache
+
+def two_queries(order_id):
+    # What show_order_details did before
+    return repository.get_order_header(order_id), repository.get_order_lines(order_id)
+
+def same_order(order_id):
+    # Amounts compared to the cent: JSON keeps 15 significant digits
+    (header, lines), (old_header, old_lines) = repository.get_order_details(order_id), two_queries(order_id)
+    cents = lambda amount: round(amount, 2)
+    return (
+        header[:2] + (cents(header[2]), header[3]) == old_header[:2] + (cents(old_header[2]), old_header[3])
+        and sorted((name, qty, cents(price)) for name, qty, price in lines)
+        == sorted((name, qty, cents(price)) for name, qty, price in old_lines)
+    )
+
+def per_open(func, order_ids):
+    start = time.perf_counter()
+    for order_id in order_ids:
+        func(order_id)
+    return (time.perf_counter() - start) / len(order_ids) * 1e6
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    opens = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    db_path = make_temp_db()
+    user_id = seed_orders(db_path, count)
+    repository.configure(db_path)
+    order_ids = [row[0] for row in repository.get_order_history(user_id, limit=count)]
+    # Seeded straight into the tables, so build their snapshots like place_order does
+    repository.writer.run(lambda conn: conn.executemany(
+        repository.ORDER_SNAPSHOT_SQL, ((order_id,) for order_id in order_ids)
+    ))
+
+    mismatches = [order_id for order_id in order_ids if not same_order(order_id)]
+    order_id = order_ids[0]
+    repository.writer.run(lambda conn: conn.execute("UPDATE orders SET status='rejected' WHERE id=?", (order_id,)))
+    if not same_order(order_id) or repository.get_order_details(order_id)[0][1] != 'rejected':
+        mismatches.append(order_id)
+    print(f"snapshots matching header + lines: {len(order_ids) - len(mismatches)}/{len(order_ids)}"
+          f" (status change patched: {order_id not in mismatches})")
+
+    rng = random.Random(3)
+    # Newest orders are opened far more often
+    browsing = [order_ids[min(int(rng.expovariate(1 / 40)), len(order_ids) - 1)] for _ in range(opens)]
+    cache = OrderCache()
+    print(f"{opens} order opens over {len(set(browsing))} distinct orders")
+    print(f"  two queries          {per_open(two_queries, browsing):8.1f} us/open  (2 reads)")
+    print(f"  snapshot             {per_open(repository.get_order_details, browsing):8.1f} us/open  (1 read)")
+    cached = per_open(cache.get, browsing)
+    # Open (e.g. pending) orders are never cached, so they are read every time
+    print(f"  snapshot + LRU cache {cached:8.1f} us/open  ({cache.misses} reads, {cache.hits} hits)")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Orders per second for 1, 10 and 50-line carts: Python loop vs INSERT ... SELECT.
+
+The loop version is what place_order did before: read the cart, compute
+the total in Python and insert one order line per statement. Both run as
+one write-queue job; only the order placement itself is timed, refilling
+the cart is not.
+
+    python scripts/bench_place_order.py [orders_per_size]
+"""
+import sqlite3
+import sys
+import time
+
+from bench_utils import make_temp_db
+
+import exception
+import migrations
+import repository
+
+def loop_place_order(user_id):
+    cart_items = repository.get_cart_items(user_id)
+    total = sum(item[3] * item[4] for item in cart_items)
+    def job(conn):
+        order_id = conn.execute(
+            "INSERT INTO orders (user_id, total_amount) VALUES (?, ?)",
+            (user_id, total)
+        ).lastrowid
+        for item in cart_items:
+            conn.execute(
+                "INSERT INTO order_items (order_id, food_item_id, quantity, price_at_order) VALUES (?, ?, ?, ?)",
+                (order_id, item[0], item[4], item[3])
+            )
+        conn.execute("DELETE FROM cart_items WHERE user_id=?", (user_id,))
+        return order_id
+    return repository.writer.run(job)
+
+def fill_cart(user_id, food_ids):
+    repository.writer.run(lambda conn: conn.executemany(
+        "INSERT INTO cart_items (user_id, food_item_id, quantity) VALUES (?, ?, 2)",
+        ((user_id, food_id) for food_id in food_ids)
+    ))
+
+def measure(place, user_id, food_ids, orders):
+    elapsed = 0.0
+    for _ in range(orders):
+        fill_cart(user_id, food_ids)
+        start = time.perf_counter()
+        place(user_id)
+        elapsed += time.perf_counter() - start
+    return orders / elapsed
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    db_path = make_temp_db(extra_items=100, users=1)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrations.migrate(conn)
+    user_id = conn.execute("SELECT id FROM users WHERE is_admin=0").fetchone()[0]
+    food_ids = [row[0] for row in conn.execute("SELECT id FROM food_items WHERE available=1")]
+    conn.close()
+    repository.configure(db_path)
+
+    # Same cart, same result: the SQL total matches the Python one
+    fill_cart(user_id, food_ids[:10])
+    expected = sum(item[3] * item[4] for item in repository.get_cart_items(user_id))
+    order_id = repository.place_order(user_id)
+    total = repository.get_order_header(order_id)[2]
+    assert abs(total - expected) < 1e-9, (total, expected)
+
+    # An unavailable line refuses the whole order and leaves the cart alone
+    fill_cart(user_id, food_ids[:3])
+    repository.writer.run(lambda conn: conn.execute("UPDATE food_items SET available=0 WHERE id=?", (food_ids[1],)))
+    try:
+        repository.place_order(user_id)
+        raise AssertionError("order with an unavailable item was accepted")
+    except exception.OrderError:
+        pass
+    assert len(repository.get_cart_lines(user_id)) == 3
+    repository.writer.run(lambda conn: conn.execute("UPDATE food_items SET available=1 WHERE id=?", (food_ids[1],)))
+    repository.writer.run(lambda conn: conn.execute("DELETE FROM cart_items WHERE user_id=?", (user_id,)))
+
+    print(f"{orders} orders per cart size")
+    print(f"  {'lines':>5} {'loop orders/s':>14} {'batched orders/s':>17} {'speedup':>8}")
+    for lines in (1, 10, 50):
+        cart = food_ids[:lines]
+        loop = measure(loop_place_order, user_id, cart, orders)
+        batched = measure(repository.place_order, user_id, cart, orders)
+        print(f"  {lines:5} {loop:14.0f} {batched:17.0f} {batched / loop:7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Rating summary cost on the details page: AVG over reviews vs food_item_stats.
+
+Loads a review-heavy menu, times the old aggregate query against the
+trigger-maintained row, measures what the triggers add to review writes,
+then churns reviews (inserts, rating edits, moves, deletes) and checks
+with review_stats that the aggregates did not drift.
+
+    python scripts/bench_rating_summary.py [items] [reviews]
+"""
+import random
+import sqlite3
+import sys
+import time
+
+from bench_utils import make_temp_db
+
+import migrations
+import repository
+import review_stats
+
+def old_rating_summary(food_id):
+    avg_rating, review_count = repository.fetch_one(
+        "SELECT AVG(rating), COUNT(*) FROM reviews WHERE food_item_id=?", (food_id,)
+    )
+    return avg_rating or 0, review_count
+
+def insert_reviews(conn, rows):
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO reviews (user_id, food_item_id, order_id, rating) VALUES (1, ?, 1, ?)", rows
+    )
+    conn.commit()
+    return time.perf_counter() - start
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    reviews = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    rng = random.Random(11)
+    db_path = make_temp_db(extra_items=items)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrations.migrate(conn)
+    food_ids = [row[0] for row in conn.execute("SELECT id FROM food_items")]
+    rows = [(rng.choice(food_ids), rng.randint(1, 5)) for _ in range(reviews)]
+
+    with_triggers = insert_reviews(conn, rows)
+    print(f"{reviews} reviews over {len(food_ids)} items, inserted in {with_triggers:.2f}s with triggers")
+
+    repository.configure(db_path)
+    sample = [rng.choice(food_ids) for _ in range(2000)]
+    for label, func in (("AVG(rating), COUNT(*)", old_rating_summary), ("food_item_stats", repository.get_rating_summary)):
+        start = time.perf_counter()
+        for food_id in sample:
+            func(food_id)
+        print(f"  {label:22} {(time.perf_counter() - start) / len(sample) * 1e6:9.1f} us per details page")
+    mismatched = sum(
+        1 for food_id in sample
+        if abs(old_rating_summary(food_id)[0] - repository.get_rating_summary(food_id)[0]) > 1e-9
+        or old_rating_summary(food_id)[1] != repository.get_rating_summary(food_id)[1]
+    )
+
+    # Churn: new reviews, edited ratings, reviews moved to another item, deletions
+    ids = [row[0] for row in conn.execute("SELECT id FROM reviews")]
+    insert_reviews(conn, [(rng.choice(food_ids), rng.randint(1, 5)) for _ in range(2000)])
+    conn.executemany("UPDATE reviews SET rating=? WHERE id=?", ((rng.randint(1, 5), rid) for rid in rng.sample(ids, 2000)))
+    conn.executemany("UPDATE reviews SET food_item_id=? WHERE id=?", ((rng.choice(food_ids), rid) for rid in rng.sample(ids, 500)))
+    conn.executemany("DELETE FROM reviews WHERE id=?", ((rid,) for rid in rng.sample(ids, 2000)))
+    conn.commit()
+    drift_after_churn = len(review_stats.find_drift(conn))
+
+    # Simulate drift (e.g. a bulk import with triggers off) and repair it
+    conn.execute("UPDATE food_item_stats SET rating_count = rating_count + 1 WHERE food_item_id=?", (food_ids[0],))
+    conn.commit()
+    detected = len(review_stats.find_drift(conn))
+    conn.isolation_level = None
+    review_stats.rebuild(conn)
+    repaired = not review_stats.find_drift(conn)
+    conn.close()
+
+    print(f"summaries differing from AVG/COUNT: {mismatched}")
+    print(f"drift after churn: {drift_after_churn}, injected drift detected: {detected}, rebuilt clean: {repaired}")
+    sys.exit(0 if mismatched == 0 and drift_after_churn == 0 and detected == 1 and repaired else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Reviews screen: page reads, first-page cache and review eligibility.
+
+Checks the rules first: only items from delivered orders can be reviewed,
+once per order line even under concurrent double submits, and a posted
+review shows up on the (cached) first page straight away. Then times the
+first page cold and cached, a deep cursor page against OFFSET, and the
+eligibility lookup against joining orders and order_items.
+
+    python scripts/bench_reviews.py [reviews]
+"""
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+from bench_utils import make_temp_db
+
+import exception
+import migrations
+import repository
+import reviews
+
+def naive_eligibility(user_id, food_id):
+    # Without reviewable_items: walk the user's delivered orders
+    return repository.fetch_one("""
+        SELECT o.id FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id
+        WHERE o.user_id=? AND o.status='delivered' AND oi.food_item_id=?
+          AND NOT EXISTS (SELECT 1 FROM reviews r WHERE r.order_id = o.id AND r.food_item_id = oi.food_item_id)
+        LIMIT 1
+    """, (user_id, food_id))
+
+def timed_us(func, *args, repeat=500):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def check_rules(user_id, food_ids):
+    problems = []
+    food_id, other_id = food_ids[0], food_ids[1]
+    for food in (food_id, other_id):
+        repository.add_to_cart(user_id, food, 1)
+    order_id = repository.place_order(user_id)
+    if repository.get_reviewable_order(user_id, food_id) is not None:
+        problems.append("pending order was reviewable")
+
+    repository.writer.run(lambda conn: conn.execute("UPDATE orders SET status='delivered' WHERE id=?", (order_id,)))
+    if repository.get_reviewable_order(user_id, food_id) != order_id:
+        problems.append("delivered order was not reviewable")
+    if repository.get_reviewable_order(user_id, food_ids[2]) is not None:
+        problems.append("item never ordered was reviewable")
+
+    before = reviews.review_cache.first_page(food_id)
+    # Five racing taps on "Post Review": exactly one may succeed
+    outcomes = []
+    threads = [
+        threading.Thread(target=lambda: outcomes.append(_try_post(user_id, food_id)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if outcomes.count(True) != 1:
+        problems.append(f"{outcomes.count(True)} reviews posted for one order line")
+    after = reviews.review_cache.first_page(food_id)
+    if len(after) != min(len(before) + 1, repository.REVIEW_PAGE_SIZE) or after[0][2] != "race":
+        problems.append("new review missing from the cached first page")
+    if repository.get_reviewable_order(user_id, other_id) != order_id:
+        problems.append("reviewing one line consumed another")
+    return problems
+
+def _try_post(user_id, food_id):
+    try:
+        reviews.post_review(user_id, food_id, 4, "race")
+        return True
+    except exception.ReviewError:
+        return False
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(5)
+    db_path = make_temp_db(users=200)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrations.migrate(conn)
+    user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE is_admin=0")]
+    food_ids = [row[0] for row in conn.execute("SELECT id FROM food_items WHERE available=1")]
+    popular = food_ids[0]
+    conn.executemany(
+        "INSERT INTO reviews (user_id, food_item_id, order_id, rating, comment, review_date) VALUES (?, ?, 1, ?, ?, ?)",
+        (
+            (rng.choice(user_ids), popular, rng.randint(1, 5), f"review {i}",
+             f"2024-{1 + i % 12:02d}-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:00")
+            for i in range(count)
+        )
+    )
+    # A regular with a long delivered history that never included our item
+    regular = user_ids[1]
+    for i in range(2000):
+        order_id = conn.execute(
+            "INSERT INTO orders (user_id, total_amount, status) VALUES (?, 5, 'delivered')", (regular,)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO order_items (order_id, food_item_id, quantity, price_at_order) VALUES (?, ?, 1, 5)",
+            (order_id, food_ids[3 + i % 10])
+        )
+    conn.commit()
+    conn.close()
+    repository.configure(db_path)
+
+    problems = check_rules(user_ids[0], food_ids)
+    print("rules: " + ("OK" if not problems else "FAILED\n  " + "\n  ".join(problems)))
+
+    reviews.review_cache.clear()
+    cold = timed_us(repository.get_reviews, popular)
+    reviews.review_cache.first_page(popular)
+    cached = timed_us(reviews.review_cache.first_page, popular)
+    print(f"{count} reviews on one item")
+    print(f"  first page: {cold:8.1f} us from the index, {cached:6.2f} us cached")
+
+    # Page 201 by cursor vs by OFFSET
+    cursor, page = None, []
+    for _ in range(200):
+        page = repository.get_reviews(popular, cursor)
+        cursor = (page[-1][3], page[-1][0])
+    deep_cursor = timed_us(repository.get_reviews, popular, cursor, repeat=100)
+    deep_offset = timed_us(lambda: repository.fetch_all("""
+        SELECT r.id, r.rating, r.comment, r.review_date, u.username
+        FROM reviews r JOIN users u ON r.user_id = u.id
+        WHERE r.food_item_id=? ORDER BY r.review_date DESC, r.id DESC LIMIT 20 OFFSET 4000
+    """, (popular,)), repeat=100)
+    print(f"  page 201:   {deep_cursor:8.1f} us by cursor, {deep_offset:8.1f} us by OFFSET")
+
+    # An item the regular never ordered: the join has to walk every delivered
+    # order (for an item with thousands of reviews it is far worse still)
+    never_ordered = food_ids[2]
+    eligible = timed_us(repository.get_reviewable_order, regular, never_ordered)
+    naive = timed_us(naive_eligibility, regular, never_ordered, repeat=100)
+    print(f"eligibility, user with 2000 delivered orders: {eligible:.1f} us lookup vs {naive:.1f} us join")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Route resolution: the old hand-written checks in route_change vs router.Router.
+
+Resolves a mix of the app's routes (static, parameterized, guarded and
+unknown) many times both ways and reports the cost per lookup, after
+checking that the router returns the expected routes, typed parameters
+and guards.
+
+    python scripts/bench_router.py [lookups]
+"""
+import sys
+import time
+
+import bench_utils  # noqa: F401  (puts src/ on sys.path)
+
+from router import ADMIN, PUBLIC, USER, Router
+
+PATTERNS = [
+    ("/", PUBLIC, {}),
+    ("/register", PUBLIC, {}),
+    ("/user_dashboard", USER, {}),
+    ("/food_details", USER, {}),
+    ("/food_details/:food_id", USER, {"food_id": int}),
+    ("/reviews/:food_id", USER, {"food_id": int}),
+    ("/cart", USER, {}),
+    ("/checkout", USER, {}),
+    ("/order_history", USER, {}),
+    ("/order_details/:order_id", USER, {"order_id": int}),
+    ("/admin_dashboard", ADMIN, {}),
+    ("/view_orders", ADMIN, {}),
+]
+
+PATHS = [
+    "/user_dashboard", "/food_details/17", "/cart", "/food_details/4", "/checkout",
+    "/order_history", "/order_details/120", "/reviews/17", "/admin_dashboard", "/view_orders",
+    "/nowhere", "/food_details/abc", "/cart?from=menu",
+]
+
+OLD_ROUTES = {pattern: pattern for pattern, _, _ in PATTERNS}
+
+def old_resolve(route):
+    # route_change before the router, minus the UI side effects
+    food_id = None
+    if route.startswith("/food_details/"):
+        parts = route.split("/")
+        if len(parts) >= 3:
+            try:
+                food_id = int(parts[2])
+                route = "/food_details/:food_id"
+            except ValueError:
+                return None
+    protected_routes = [
+        "/user_dashboard", "/admin_dashboard", "/food_details",
+        "/food_details/:food_id", "/view_orders"
+    ]
+    protected = route in protected_routes
+    admin_routes = ["/admin_dashboard", "/view_orders"]
+    admin = route in admin_routes
+    view = OLD_ROUTES.get(route)
+    if not view:
+        return None
+    return view, food_id, protected, admin
+
+def check(router):
+    problems = []
+    expected = {
+        "/food_details/17": ("/food_details/:food_id", {"food_id": 17}, USER),
+        "/order_details/120": ("/order_details/:order_id", {"order_id": 120}, USER),
+        "/view_orders": ("/view_orders", {}, ADMIN),
+        "/cart?from=menu": ("/cart", {}, USER),
+        "/cart/": ("/cart", {}, USER),
+        "/": ("/", {}, PUBLIC),
+    }
+    for path, (pattern, params, guard) in expected.items():
+        match = router.resolve(path)
+        if match is None or (match[0].pattern, match[1], match[0].guard) != (pattern, params, guard):
+            problems.append(f"{path} resolved to {match and (match[0].pattern, match[1], match[0].guard)}")
+    for path in ("/nowhere", "/food_details/abc", "/food_details/1/2", "/reviews"):
+        if router.resolve(path) is not None:
+            problems.append(f"{path} should not resolve")
+    return problems
+
+def timed_us(func, lookups):
+    start = time.perf_counter()
+    for i in range(lookups):
+        func(PATHS[i % len(PATHS)])
+    return (time.perf_counter() - start) / lookups * 1e6
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    router = Router()
+    for pattern, guard, types in PATTERNS:
+        router.add(pattern, pattern, guard, **types)
+
+    problems = check(router)
+    print("resolution: " + ("OK" if not problems else "FAILED\n  " + "\n  ".join(problems)))
+    print(f"{lookups} lookups over {len(PATHS)} paths")
+    print(f"  hand-written checks {timed_us(old_resolve, lookups):6.3f} us per route change")
+    print(f"  Router.resolve      {timed_us(router.resolve, lookups):6.3f} us per route change")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Menu search latency: LOWER(...) LIKE '%q%' vs the FTS5 index.
+
+Builds a synthetic catalog (100k items by default), migrates it and times
+both searches for a handful of typical queries.
+
+    python scripts/bench_search.py [items]
+"""
+import sqlite3
+import sys
+
+from bench_utils import make_temp_db, timed
+
+import migrations
+import repository
+import search
+
+QUERIES = ["burger", "spicy noodles", "kimchi", "smo", "curry rice", "buger", "pizza with salsa"]
+
+def like_search(query):
+    # The query _perform_search ran before the FTS index
+    pattern = f"%{query.lower()}%"
+    return repository.fetch_all(
+        "SELECT * FROM food_items WHERE (LOWER(name) LIKE ? OR LOWER(description) LIKE ?) AND available=1",
+        (pattern, pattern)
+    )
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    db_path = make_temp_db(extra_items=items)
+    conn = sqlite3.connect(db_path)
+    migrations.migrate(conn)
+    conn.close()
+    repository.configure(db_path)
+
+    print(f"{items} synthetic items, median of 5 runs")
+    print(f"  {'query':18} {'LIKE ms':>9} {'rows':>7}   {'FTS5 ms':>9} {'rows':>5}")
+    for query in QUERIES:
+        like_rows, like_time = timed(like_search, query, repeat=5)
+        fts_rows, fts_time = timed(search.search_menu, query, repeat=5)
+        print(f"  {query:18} {like_time * 1000:9.2f} {len(like_rows):7}   {fts_time * 1000:9.2f} {len(fts_rows):5}")
+    print(f"  (FTS results are capped at {search.SEARCH_LIMIT}, ranked by bm25)")
+
+if __name__ == "__main__":
+    main()
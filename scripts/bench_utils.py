@@ -0,0 +1,82 @@
+"""Shared helpers for the benchmark and check scripts in this folder.
+
+Scripts never touch the real canteen.db: they work on a throwaway copy in a
+temporary directory, optionally padded with synthetic menu items and users,
+and bootstrapped the way the app does on start.
+"""
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+SEED_DB = ROOT / "canteen.db"
+
+ADJECTIVES = ["Spicy", "Crispy", "Grilled", "Fresh", "Smoked", "Sweet", "Hot", "Classic", "Garlic", "Cheesy"]
+DISHES = ["Burger", "Noodles", "Rice", "Salad", "Sandwich", "Wrap", "Soup", "Pizza", "Curry", "Taco", "Pasta", "Smoothie"]
+SIDES = ["fries", "chips", "kimchi", "pickles", "salsa", "coleslaw", "toast", "egg"]
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+def make_temp_db(extra_items: int = 0, users: int = 0, seed: int = 42, bootstrap: bool = True) -> str:
+    """Copy the seed database to a temp dir and add synthetic rows.
+
+    With `bootstrap` the copy then goes through database.bootstrap(), as on
+    app start (WAL and every migration); without it the copy keeps the seed's
+    schema, for measuring the code paths from before the migrations.
+    """
+    tmp_dir = Path(tempfile.mkdtemp(prefix="canteen-bench-"))
+    db_path = tmp_dir / "canteen.db"
+    shutil.copy(SEED_DB, db_path)
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    category_ids = [row[0] for row in conn.execute("SELECT id FROM categories")]
+    conn.executemany(
+        "INSERT INTO food_items (name, description, price, category_id, image_path, available) "
+        "VALUES (?, ?, ?, ?, ?, 1)",
+        (
+            (
+                f"{rng.choice(ADJECTIVES)} {rng.choice(DISHES)} {i}",
+                f"{rng.choice(ADJECTIVES).lower()} {rng.choice(DISHES).lower()} with {rng.choice(SIDES)}",
+                round(rng.uniform(1, 15), 2),
+                rng.choice(category_ids),
+                "burger.png",
+            )
+            for i in range(extra_items)
+        )
+    )
+    conn.executemany(
+        "INSERT INTO users (username, password, email) VALUES (?, ?, ?)",
+        ((f"student{i}", "x", f"student{i}@canteen.com") for i in range(users))
+    )
+    conn.commit()
+    conn.close()
+    if bootstrap:
+        # Imported here so importing bench_utils stays as cheap as adding src/ to the path
+        import database
+        database.bootstrap(str(db_path))
+    return str(db_path)
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def timed(func, *args, repeat: int = 1):
+    """Run func `repeat` times and return (last result, median seconds)"""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        samples.append(time.perf_counter() - start)
+    return result, statistics.median(samples)
@@ -0,0 +1,103 @@
+"""Concurrent duplicate checkout submits must create exactly one order.
+
+For every student, many threads submit the same checkout (same
+idempotency key) at once, like a "Place Order" button hammered on a slow
+network. Each student must end up with one order, every submit must get
+that order's id back, and a late retry must be answered from the index
+without a write. Exits non-zero on any violation.
+
+    python scripts/check_idempotent_checkout.py [students] [taps]
+"""
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+from bench_utils import make_temp_db
+
+import exception
+import migrations
+import repository
+
+def main() -> int:
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    taps = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    db_path = make_temp_db(users=students)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrations.migrate(conn)
+    user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE is_admin=0")][:students]
+    food_ids = [row[0] for row in conn.execute("SELECT id FROM food_items WHERE available=1 LIMIT 3")]
+    conn.close()
+    repository.configure(db_path)
+
+    keys = {}
+    for user_id in user_ids:
+        for food_id in food_ids:
+            repository.add_to_cart(user_id, food_id, 1)
+        keys[user_id] = uuid.uuid4().hex
+
+    results = {user_id: [] for user_id in user_ids}
+    errors = []
+    start_line = threading.Barrier(students * taps)
+
+    def submit(user_id):
+        start_line.wait()
+        try:
+            results[user_id].append(repository.place_order(user_id, keys[user_id]))
+        except exception.OrderError as e:
+            errors.append(f"user {user_id}: {e}")
+
+    threads = [
+        threading.Thread(target=submit, args=(user_id,))
+        for user_id in user_ids for _ in range(taps)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    problems = list(errors)
+    for user_id in user_ids:
+        # Only orders from this run: the seed database already has some
+        orders = repository.fetch_all(
+            "SELECT id FROM orders WHERE user_id=? AND idempotency_key IS NOT NULL",
+            (user_id,)
+        )
+        returned = set(results[user_id])
+        if len(orders) != 1:
+            problems.append(f"user {user_id}: {len(orders)} orders created")
+        elif returned != {orders[0][0]}:
+            problems.append(f"user {user_id}: submits returned {sorted(returned)}, order is {orders[0][0]}")
+
+    # A retry long after the first submit is a single indexed read
+    user_id = user_ids[0]
+    commits = repository.writer.batches
+    start = time.perf_counter()
+    retried = repository.place_order(user_id, keys[user_id])
+    elapsed = (time.perf_counter() - start) * 1000
+    if retried != results[user_id][0] or repository.writer.batches != commits:
+        problems.append("late retry did not return the existing order without a write")
+
+    # The unique index rejects a second order with the same key outright
+    try:
+        repository.writer.run(lambda conn: conn.execute(
+            "INSERT INTO orders (user_id, total_amount, idempotency_key) VALUES (?, 0, ?)",
+            (user_id, keys[user_id])
+        ))
+        problems.append("unique index accepted a duplicate idempotency key")
+    except sqlite3.IntegrityError:
+        pass
+
+    print(f"{students} students x {taps} concurrent submits -> {students * taps} calls")
+    print(f"late retry answered in {elapsed:.2f} ms without a commit")
+    if problems:
+        print("FAILED:\n  " + "\n  ".join(problems))
+        return 1
+    print("OK: one order per checkout key")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Start-up import budget: `python -X importtime -c "import main"`.
+
+Imports main in fresh interpreters (bytecode compiled first, as in a
+packaged `flet build` app) and fails when
+
+  - a module that only some sessions need is imported at start-up
+    (admin screens, the image pipeline's Pillow / process pool, ...), or
+  - the best run exceeds the budget: the app's own share (main minus the
+    flet framework it imports) or the whole import.
+
+Flet itself is most of the total and varies a lot between runs, so the
+app share has the tighter budget; the best of several runs is compared.
+
+    python scripts/check_import_time.py [runs] [app budget ms] [total budget ms]
+"""
+import compileall
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from bench_utils import SRC
+
+RUNS = 10
+APP_BUDGET_MS = 25.0
+TOTAL_BUDGET_MS = 1500.0
+# Loaded on first use only, never by `import main`
+DEFERRED = (
+    "admin_screens", "admin_orders",   # admin routes
+    "image_pipeline", "PIL", "multiprocessing", "concurrent.futures.process",   # image pipeline
+    "tabulate",   # reporting scripts
+)
+
+def import_times():
+    """(module name, depth, self us, cumulative us) for one fresh `import main`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue   # the header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(own), int(cumulative)))
+    return rows
+
+def is_framework(name):
+    # Imported directly by main but not part of the app (or the stdlib)
+    top = name.split(".")[0]
+    return not (SRC / f"{top}.py").exists() and top not in sys.stdlib_module_names
+
+def split_main(rows):
+    """main's cumulative time, the part spent in framework packages and
+    (name, cumulative) of the app modules main imports directly"""
+    children = []
+    for name, depth, _, cumulative in rows:
+        if depth == 0:
+            if name == "main":
+                framework = sum(c for n, c in children if is_framework(n))
+                return cumulative, framework, [(n, c) for n, c in children if not is_framework(n)]
+            children = []
+        elif depth == 1:
+            children.append((name, cumulative))
+    raise RuntimeError("main was not imported")
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    app_budget = float(sys.argv[2]) if len(sys.argv) > 2 else APP_BUDGET_MS
+    total_budget = float(sys.argv[3]) if len(sys.argv) > 3 else TOTAL_BUDGET_MS
+    compileall.compile_dir(str(SRC), maxlevels=0, quiet=1)
+
+    totals, apps = [], []
+    app_modules = defaultdict(list)
+    problems = []
+    for _ in range(runs):
+        rows = import_times()
+        total, framework, children = split_main(rows)
+        totals.append(total / 1000)
+        apps.append((total - framework) / 1000)
+        for name, cumulative in children:
+            app_modules[name].append(cumulative / 1000)
+    loaded = {name for name, _, _, _ in rows}
+    for name in DEFERRED:
+        if name in loaded:
+            problems.append(f"{name} is imported at start-up")
+
+    print(f"import main, {runs} fresh processes: best / median")
+    print(f"  total       {min(totals):8.1f} ms {statistics.median(totals):8.1f} ms   budget {total_budget:.0f} ms")
+    print(f"  app share   {min(apps):8.1f} ms {statistics.median(apps):8.1f} ms   budget {app_budget:.0f} ms")
+    print("  slowest app imports (best run):")
+    slowest = sorted(app_modules.items(), key=lambda item: -min(item[1]))[:6]
+    for name, samples in slowest:
+        print(f"    {name:20} {min(samples):6.1f} ms")
+    if min(totals) > total_budget:
+        problems.append(f"import main took {min(totals):.1f} ms (budget {total_budget:.0f} ms)")
+    if min(apps) > app_budget:
+        problems.append(f"the app's own imports took {min(apps):.1f} ms (budget {app_budget:.0f} ms)")
+    print("start-up imports: " + ("OK" if not problems else "FAILED\n  " + "\n  ".join(problems)))
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
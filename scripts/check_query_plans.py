@@ -0,0 +1,38 @@
+"""Fail if any hot query still scans a table after migrations.
+
+Runs the migrations against a copy of canteen.db, prints EXPLAIN QUERY PLAN
+for every query in migrations.HOT_QUERIES and exits non-zero on a SCAN that
+is not one of migrations.ACCEPTED_SCANS.
+
+    python scripts/check_query_plans.py
+"""
+import sqlite3
+import sys
+
+from bench_utils import make_temp_db
+
+import migrations
+
+def main() -> int:
+    # The seed's schema, so every migration is applied here
+    conn = sqlite3.connect(make_temp_db(extra_items=1000, bootstrap=False))
+    applied = migrations.migrate(conn)
+    print(f"schema version {migrations.current_version(conn)} (applied {applied or 'none'})")
+
+    for name, (sql, params) in migrations.HOT_QUERIES.items():
+        plan = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        accepted = f"   (accepted: {migrations.ACCEPTED_SCANS[name]})" if name in migrations.ACCEPTED_SCANS else ""
+        print(f"  {name:16} {' | '.join(plan)}{accepted}")
+
+    scans = migrations.find_table_scans(conn)
+    conn.close()
+    if scans:
+        print("\nTable scans found:")
+        for name, detail in scans:
+            print(f"  {name}: {detail}")
+        return 1
+    print("\nOK: no hot query scans a table unexpectedly")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""A headless Flet page for measuring what the app sends to the client.
+
+RecordingConnection stands in for the websocket connection: it serializes
+every command batch the way Flet does, counts bytes and added controls,
+and answers "add" commands with fresh control ids so the page keeps
+working as if a client were attached.
+"""
+import asyncio
+import itertools
+import json
+from types import SimpleNamespace
+
+import bench_utils  # noqa: F401  (puts src/ on sys.path)
+
+import flet as ft
+from flet.core.connection import Connection
+from flet.core.protocol import CommandEncoder
+
+class RecordingConnection(Connection):
+    def __init__(self):
+        super().__init__()
+        self._ids = itertools.count(1)
+        self.reset()
+
+    def reset(self):
+        self.batches = 0
+        self.bytes_sent = 0
+        self.controls_added = 0
+        self.controls_removed = 0
+
+    def send_command(self, session_id, command):
+        return self.send_commands(session_id, [command])
+
+    def send_commands(self, session_id, commands):
+        self.batches += 1
+        self.bytes_sent += len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")).encode())
+        results = []
+        for command in commands:
+            if command.name == "add":
+                ids = [f"_{next(self._ids)}" for _ in command.commands]
+                self.controls_added += len(ids)
+                results.append(" ".join(ids))
+            elif command.name == "remove":
+                self.controls_removed += len(command.values)
+        return SimpleNamespace(results=results, error="")
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'bytes': self.bytes_sent,
+            'added': self.controls_added,
+            'removed': self.controls_removed,
+        }
+
+def make_page():
+    conn = RecordingConnection()
+    page = ft.Page(conn, "bench-session", asyncio.new_event_loop())
+    return page, conn
+
+class MemoryClientStorage:
+    """page.client_storage without a client: values live in a dict"""
+
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = value
+        return True
+
+    def contains_key(self, key):
+        return key in self.values
+
+    def remove(self, key):
+        return self.values.pop(key, None) is not None
+
+def attach_client_storage(page, values=None):
+    page._Page__client_storage = MemoryClientStorage(values)
+    return page.client_storage
@@ -0,0 +1,121 @@
+"""Hammer concurrent checkouts and report commit latency.
+
+Each simulated student adds a few items to the cart and places an order,
+over and over. The old path (own connection, rollback journal, default
+busy handling) is compared with WAL + the repository write queue.
+
+    python scripts/load_test_checkout.py [students] [orders_per_student]
+"""
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+from bench_utils import make_temp_db, percentile
+
+import repository
+
+def old_style_checkout(db_path, user_id, food_ids):
+    # What add_to_cart/place_order did before: their own connection and commit
+    for food_id in food_ids:
+        conn = sqlite3.connect(db_path, timeout=0.5)
+        try:
+            row = conn.execute(
+                "SELECT quantity FROM cart_items WHERE user_id=? AND food_item_id=?",
+                (user_id, food_id)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE cart_items SET quantity=? WHERE user_id=? AND food_item_id=?",
+                    (row[0] + 1, user_id, food_id)
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO cart_items (user_id, food_item_id, quantity) VALUES (?, ?, 1)",
+                    (user_id, food_id)
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    conn = sqlite3.connect(db_path, timeout=0.5)
+    try:
+        cart = conn.execute('''
+            SELECT fi.id, fi.name, fi.description, fi.price, ci.quantity, fi.image_path
+            FROM cart_items ci JOIN food_items fi ON ci.food_item_id = fi.id
+            WHERE ci.user_id=?
+        ''', (user_id,)).fetchall()
+        order_id = conn.execute(
+            "INSERT INTO orders (user_id, total_amount) VALUES (?, ?)",
+            (user_id, sum(item[3] * item[4] for item in cart))
+        ).lastrowid
+        for item in cart:
+            conn.execute(
+                "INSERT INTO order_items (order_id, food_item_id, quantity, price_at_order) VALUES (?, ?, ?, ?)",
+                (order_id, item[0], item[4], item[3])
+            )
+        conn.execute("DELETE FROM cart_items WHERE user_id=?", (user_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+def queued_checkout(db_path, user_id, food_ids):
+    for food_id in food_ids:
+        repository.add_to_cart(user_id, food_id, 1)
+    repository.place_order(user_id)
+
+def run(checkout, db_path, students, orders):
+    conn = sqlite3.connect(db_path)
+    food_ids = [row[0] for row in conn.execute("SELECT id FROM food_items")]
+    user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE is_admin=0")][:students]
+    conn.close()
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def student(user_id):
+        rng = random.Random(user_id)
+        for _ in range(orders):
+            start = time.perf_counter()
+            try:
+                checkout(db_path, user_id, rng.sample(food_ids, 3))
+            except sqlite3.OperationalError as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=student, args=(uid,)) for uid in user_ids]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+def report(label, latencies, errors, elapsed):
+    print(f"  {label}")
+    print(f"    checkouts ok   : {len(latencies)} ({len(latencies) / elapsed:.1f}/s)")
+    print(f"    failed         : {len(errors)}" + (f"  e.g. {errors[0]!r}" if errors else ""))
+    print(f"    p50 / p99 (ms) : {percentile(latencies, 50) * 1000:.1f} / {percentile(latencies, 99) * 1000:.1f}")
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    orders = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"{students} students x {orders} checkouts (3 cart adds + order each)")
+
+    # The old path on the seed's schema and rollback journal
+    db_path = make_temp_db(extra_items=500, users=students, bootstrap=False)
+    report("rollback journal, connection per call", *run(old_style_checkout, db_path, students, orders))
+
+    # Bootstrapped like the app: WAL and every migration (idempotency keys included)
+    db_path = make_temp_db(extra_items=500, users=students)
+    repository.configure(db_path)
+    report("WAL + write queue (group commit)", *run(queued_checkout, db_path, students, orders))
+    print(f"    commits        : {repository.writer.batches} for {repository.writer.jobs_committed} writes")
+
+if __name__ == "__main__":
+    main()
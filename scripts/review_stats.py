@@ -0,0 +1,78 @@
+"""Verify (and optionally rebuild) the per-item review aggregates.
+
+food_item_stats holds each item's rating sum and count, kept current by
+triggers on reviews. This recomputes them from reviews in bulk, reports
+every item whose stored values drifted, and with --fix rewrites the whole
+table in one transaction. Exits 1 when drift was found and not fixed.
+
+    python scripts/review_stats.py [--fix] [path/to/canteen.db]
+"""
+import sys
+from typing import List, Tuple
+
+from bench_utils import SEED_DB
+
+import migrations
+import repository
+
+# (food_item_id, expected_sum, expected_count, stored_sum, stored_count)
+DRIFT_SQL = """
+    SELECT food_item_id, expected_sum, expected_count, stored_sum, stored_count FROM (
+        SELECT r.food_item_id, r.rating_sum AS expected_sum, r.rating_count AS expected_count,
+               COALESCE(st.rating_sum, 0) AS stored_sum, COALESCE(st.rating_count, 0) AS stored_count
+        FROM (
+            SELECT food_item_id, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+            FROM reviews GROUP BY food_item_id
+        ) r
+        LEFT JOIN food_item_stats st ON st.food_item_id = r.food_item_id
+        UNION ALL
+        SELECT st.food_item_id, 0, 0, st.rating_sum, st.rating_count
+        FROM food_item_stats st
+        WHERE NOT EXISTS (SELECT 1 FROM reviews WHERE food_item_id = st.food_item_id)
+    )
+    WHERE expected_sum != stored_sum OR expected_count != stored_count
+    ORDER BY food_item_id
+"""
+
+def find_drift(conn) -> List[Tuple]:
+    return conn.execute(DRIFT_SQL).fetchall()
+
+def rebuild(conn) -> int:
+    """Recompute every aggregate from reviews; returns the number of items"""
+    # BEGIN IMMEDIATE holds off review writes (and their triggers) meanwhile
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM food_item_stats")
+        count = conn.execute("""
+            INSERT INTO food_item_stats (food_item_id, rating_sum, rating_count)
+            SELECT food_item_id, SUM(rating), COUNT(*) FROM reviews GROUP BY food_item_id
+        """).rowcount
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return count
+
+def main(argv) -> int:
+    fix = "--fix" in argv
+    paths = [arg for arg in argv if not arg.startswith("--")]
+    db_path = paths[0] if paths else str(SEED_DB)
+
+    conn = repository.open_connection(db_path, isolation_level=None)
+    try:
+        # Make sure food_item_stats and its triggers exist
+        migrations.migrate(conn)
+        drift = find_drift(conn)
+        for food_id, expected_sum, expected_count, stored_sum, stored_count in drift:
+            print(f"  item {food_id}: stored {stored_sum}/{stored_count}, "
+                  f"reviews say {expected_sum}/{expected_count}")
+        print(f"{db_path}: {len(drift)} item(s) with drifted review aggregates")
+        if drift and fix:
+            print(f"rebuilt aggregates for {rebuild(conn)} item(s)")
+            return 0
+        return 1 if drift else 0
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,89 @@
+"""Parallel cart taps must add up exactly.
+
+Many threads fire add_to_cart / change_cart_quantity for the same few
+(user, item) lines at once. Afterwards every line must hold exactly the
+expected quantity, and lines driven to zero must be gone. Exits non-zero
+on any mismatch.
+
+    python scripts/stress_cart.py [threads] [taps_per_thread]
+"""
+import sqlite3
+import sys
+import threading
+from collections import Counter
+
+from bench_utils import make_temp_db
+
+import migrations
+import repository
+
+def main() -> int:
+    threads_count = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    taps = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    db_path = make_temp_db(users=4)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrations.migrate(conn)
+    user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE is_admin=0 LIMIT 4")]
+    food_ids = [row[0] for row in conn.execute("SELECT id FROM food_items LIMIT 3")]
+    conn.close()
+    repository.configure(db_path)
+
+    lines = [(user_id, food_id) for user_id in user_ids for food_id in food_ids]
+    expected = Counter()
+    lock = threading.Lock()
+
+    def tapper(index):
+        local = Counter()
+        for tap in range(taps):
+            user_id, food_id = lines[(index + tap) % len(lines)]
+            if tap % 4 == 3:
+                # +1 on a line that already exists (added in an earlier tap)
+                if repository.change_cart_quantity(user_id, food_id, 1) is not None:
+                    local[(user_id, food_id)] += 1
+            else:
+                repository.add_to_cart(user_id, food_id, 2)
+                local[(user_id, food_id)] += 2
+        with lock:
+            expected.update(local)
+
+    threads = [threading.Thread(target=tapper, args=(i,)) for i in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Drain one line to zero with concurrent -1 taps; it must disappear, not go negative
+    drained = lines[0]
+    quantity = expected.pop(drained)
+    threads = [
+        threading.Thread(target=repository.change_cart_quantity, args=(*drained, -1))
+        for _ in range(quantity + 10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    actual = {
+        (user_id, food_id): qty
+        for user_id, food_id, qty in repository.fetch_all("SELECT user_id, food_item_id, quantity FROM cart_items")
+    }
+    errors = [
+        f"{line}: expected {qty}, got {actual.get(line)}"
+        for line, qty in expected.items() if actual.get(line) != qty
+    ]
+    if drained in actual:
+        errors.append(f"{drained}: drained line still present with quantity {actual[drained]}")
+
+    total = sum(expected.values()) + quantity
+    print(f"{threads_count} threads x {taps} taps over {len(lines)} cart lines ({total} units)")
+    if errors:
+        print("MISMATCH:\n  " + "\n  ".join(errors))
+        return 1
+    print("OK: every line holds exactly the expected quantity")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
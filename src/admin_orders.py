@@ -0,0 +1,135 @@
+import threading
+from typing import Callable, Dict, List, Tuple
+
+import flet as ft
+
+import repository
+from order_events import ORDER_TOPIC, order_events
+from order_history import status_color
+
+ORDER_QUEUE_SIZE = repository.ORDER_QUEUE_SIZE
+# Tiles per Column in the queue's ListView. Flet diffs every control under
+# the one being updated, so an order event only updates its own chunk.
+QUEUE_CHUNK_SIZE = 20
+
+_forward_lock = threading.Lock()
+_forwarded_hubs: Dict[int, object] = {}
+
+def forward_to_pubsub(page: ft.Page):
+    """Relay order_events to the pubsub hub of the page's app, once per hub.
+
+    Every session of a Flet app shares one hub. It calls each subscribed
+    page's handler on that page's own executor and drops the subscription
+    when the session closes, so admin pages never hear about orders on the
+    writer's thread or after they are gone.
+    """
+    hub = page.connection.pubsubhub
+    with _forward_lock:
+        if id(hub) in _forwarded_hubs:
+            return
+        # The hub is kept referenced so its id cannot be reused
+        _forwarded_hubs[id(hub)] = hub
+    order_events.subscribe(lambda event: hub.send_all_on_topic(ORDER_TOPIC, event))
+
+def build_status_actions(order: Tuple, on_status: Callable) -> ft.Row:
+    """One button per status the order may move to; data is (order id, status)"""
+    return ft.Row([
+        ft.TextButton(
+            status.capitalize(),
+            data=(order[0], status),
+            on_click=on_status
+        )
+        for status in repository.ORDER_TRANSITIONS.get(order[2], ())
+    ], tight=True)
+
+def build_queue_tile(order: Tuple, on_status: Callable) -> ft.ListTile:
+    return ft.ListTile(
+        data=order[0],
+        title=ft.Text(f"Order #{order[0]} - {order[4]}"),
+        subtitle=ft.Column([
+            ft.Text(f"Date: {order[1]}"),
+            ft.Text(f"Total: ${order[3]:.2f}"),
+            ft.Text(f"Status: {order[2]}", color=status_color(order[2]))
+        ]),
+        trailing=build_status_actions(order, on_status)
+    )
+
+#Admin order queue
+class AdminOrderQueue:
+    """Open orders for the admin, kept current by order events.
+
+    The queue is read once when the screen opens. After that, new orders
+    are inserted at the top and status changes patch the one affected
+    tile (or remove it once the order is delivered or rejected), so a
+    busy canteen never makes an admin page re-read or re-send the list.
+    Tiles sit in chunks of QUEUE_CHUNK_SIZE; only a new order that needs
+    a fresh chunk updates the whole ListView.
+    """
+
+    def __init__(self, page: ft.Page, on_status: Callable, size: int = ORDER_QUEUE_SIZE):
+        self.page = page
+        self.on_status = on_status
+        self.size = size
+        self._lock = threading.Lock()
+        self._tiles: Dict[int, Tuple[ft.ListTile, ft.Column]] = {}
+        self.list_view = ft.ListView(expand=1)
+
+    def open(self):
+        """Subscribe, then read the queue; events racing the read are deduplicated"""
+        forward_to_pubsub(self.page)
+        # One handler per topic and session: reopening the screen replaces it
+        self.page.pubsub.subscribe_topic(ORDER_TOPIC, self._on_event)
+        orders = repository.get_order_queue(self.size)
+        with self._lock:
+            for order in orders:
+                if order[0] in self._tiles:
+                    continue
+                chunks = self.list_view.controls
+                if not chunks or len(chunks[-1].controls) >= QUEUE_CHUNK_SIZE:
+                    chunks.append(ft.Column(spacing=0))
+                self._add_tile(order, chunks[-1], len(chunks[-1].controls))
+
+    def close(self):
+        self.page.pubsub.unsubscribe_topic(ORDER_TOPIC)
+
+    def order_ids(self) -> List[int]:
+        """Ids of the orders on screen, top to bottom"""
+        with self._lock:
+            return [tile.data for chunk in self.list_view.controls for tile in chunk.controls]
+
+    def _add_tile(self, order: Tuple, chunk: ft.Column, index: int):
+        tile = build_queue_tile(order, self.on_status)
+        self._tiles[order[0]] = (tile, chunk)
+        chunk.controls.insert(index, tile)
+
+    def _on_event(self, topic: str, event: Dict):
+        order = event['order']
+        with self._lock:
+            tile, chunk = self._tiles.get(order[0], (None, None))
+            if event['type'] == 'placed':
+                if tile is not None:
+                    return
+                chunks = self.list_view.controls
+                if chunks and len(chunks[0].controls) < QUEUE_CHUNK_SIZE:
+                    changed = chunks[0]
+                else:
+                    chunks.insert(0, ft.Column(spacing=0))
+                    changed = self.list_view
+                self._add_tile(order, chunks[0], 0)
+            elif tile is None:
+                # Not on this page (beyond the first ORDER_QUEUE_SIZE orders)
+                return
+            elif order[2] not in repository.ORDER_TRANSITIONS:
+                # Delivered or rejected: off the queue
+                del self._tiles[order[0]]
+                chunk.controls.remove(tile)
+                changed = chunk
+                if not chunk.controls:
+                    self.list_view.controls.remove(chunk)
+                    changed = self.list_view
+            else:
+                tile.subtitle.controls[2] = ft.Text(f"Status: {order[2]}", color=status_color(order[2]))
+                tile.trailing = build_status_actions(order, self.on_status)
+                changed = tile
+            if self.list_view.page:
+                changed.update()
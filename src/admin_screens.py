@@ -0,0 +1,111 @@
+from typing import Callable, Dict
+
+import flet as ft
+
+import repository
+from admin_orders import AdminOrderQueue
+from helper_function import show_error_dialog
+
+# Imported by CanteenApp the first time an admin route opens, so student
+# sessions never load this module, admin_orders or the order pubsub relay.
+
+STAT_LABELS = (
+    ('total_orders', "Total Orders"),
+    ('pending_orders', "Pending Orders"),
+    ('total_food_items', "Total Food Items"),
+    ('total_customers', "Total Customers"),
+)
+
+#Reporting
+def admin_stats(page: ft.Page) -> Dict:
+    try:
+        return repository.get_admin_stats()
+    except Exception as e:
+        show_error_dialog(page, str(e))
+        return {}
+
+def stat_card(label: str, value) -> ft.Card:
+    return ft.Card(
+        content=ft.Container(
+            content=ft.Column([
+                ft.Text(label, size=16),
+                ft.Text(value, size=24, weight=ft.FontWeight.BOLD)
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            padding=20,
+            width=150,
+            height=150
+        )
+    )
+
+#Admin views
+def dashboard_view(page: ft.Page, on_logout: Callable) -> ft.View:
+    stats = admin_stats(page)
+    stats_row = ft.Row(
+        [stat_card(label, stats.get(name, 0)) for name, label in STAT_LABELS],
+        spacing=20, wrap=True
+    )
+
+    quick_actions = ft.Row([
+        ft.ElevatedButton(
+            "Manage Categories",
+            icon=ft.icons.CATEGORY,
+            on_click=lambda _: page.go("/food_categories")
+        ),
+        ft.ElevatedButton(
+            "Manage Food Items",
+            icon=ft.icons.RESTAURANT,
+            on_click=lambda _: page.go("/manage_food")
+        ),
+        ft.ElevatedButton(
+            "View Orders",
+            icon=ft.icons.LIST_ALT,
+            on_click=lambda _: page.go("/view_orders")
+        )
+    ], spacing=10)
+
+    return ft.View(
+        "/admin_dashboard",
+        [
+            ft.AppBar(
+                title=ft.Text("Admin Dashboard"),
+                actions=[
+                    ft.PopupMenuButton(
+                        items=[
+                            ft.PopupMenuItem(
+                                text="Profile",
+                                icon=ft.icons.PERSON,
+                                on_click=lambda _: page.go("/profile")
+                            ),
+                            ft.PopupMenuItem(
+                                text="Logout",
+                                icon=ft.icons.LOGOUT,
+                                on_click=on_logout
+                            )
+                        ]
+                    )
+                ]
+            ),
+            ft.Text("Overview", size=20),
+            stats_row,
+            ft.Divider(),
+            ft.Text("Quick Actions", size=20),
+            quick_actions
+        ],
+        scroll=ft.ScrollMode.AUTO
+    )
+
+def open_order_queue(page: ft.Page, on_status: Callable) -> AdminOrderQueue:
+    # Read once; new orders and status changes arrive through page.pubsub
+    queue = AdminOrderQueue(page, on_status=on_status)
+    queue.open()
+    return queue
+
+def orders_view(queue: AdminOrderQueue) -> ft.View:
+    return ft.View(
+        "/view_orders",
+        [
+            ft.AppBar(title=ft.Text("Orders")),
+            queue.list_view
+        ]
+    )
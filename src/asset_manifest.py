@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Where images may live, most specific first. The first existing folder wins.
+ASSET_DIRS = (
+    Path("E:/TO-DO-LIST-Project/SchoolProject/CSB_Final_Project/src/assets"),
+    Path("assets"),
+    Path(__file__).resolve().parent / "assets",
+)
+DEFAULT_IMAGE = "default.png"
+# How often (seconds) lookups may stat the assets folder to notice new uploads
+WATCH_INTERVAL = 10.0
+
+#Asset manifest
+class AssetManifest:
+    """Relative filename -> resolved path for every file in the assets folder.
+
+    Built with one directory scan, so resolving an image is a dict lookup
+    instead of several filesystem stats per card. The folder's mtime is
+    re-checked at most every WATCH_INTERVAL seconds and the manifest is
+    rebuilt when top-level files were added or removed; `refresh()` forces
+    it (call it after saving an uploaded image).
+    """
+
+    def __init__(self, asset_dirs=ASSET_DIRS, watch_interval: float = WATCH_INTERVAL):
+        self.asset_dirs = asset_dirs
+        self.watch_interval = watch_interval
+        self._lock = threading.Lock()
+        self._files: Dict[str, str] = {}
+        self._root: Optional[Path] = None
+        self._mtime = None
+        self._last_check = 0.0
+        self.default_path = str(Path("assets") / DEFAULT_IMAGE)
+        self.scans = 0
+
+    def _find_root(self) -> Path:
+        for folder in self.asset_dirs:
+            if folder.is_dir():
+                return folder
+        return self.asset_dirs[-1]
+
+    def refresh(self):
+        with self._lock:
+            root = self._find_root()
+            files = {}
+            mtime = None
+            if root.is_dir():
+                mtime = root.stat().st_mtime
+                for folder, _, names in os.walk(root):
+                    for name in names:
+                        path = Path(folder) / name
+                        files[path.relative_to(root).as_posix()] = str(path)
+            self._root = root
+            self._files = files
+            self._mtime = mtime
+            self._last_check = time.monotonic()
+            self.default_path = files.get(DEFAULT_IMAGE, str(root / DEFAULT_IMAGE))
+            self.scans += 1
+
+    def _check_for_changes(self):
+        now = time.monotonic()
+        if self._root is not None and now - self._last_check < self.watch_interval:
+            return
+        self._last_check = now
+        try:
+            mtime = self._root.stat().st_mtime if self._root is not None else None
+        except OSError:
+            mtime = None
+        if self._root is None or mtime != self._mtime:
+            self.refresh()
+
+    @property
+    def root(self) -> Path:
+        self._check_for_changes()
+        return self._root
+
+    def files(self) -> Dict[str, str]:
+        self._check_for_changes()
+        return dict(self._files)
+
+    def has(self, db_path: Optional[str]) -> bool:
+        self._check_for_changes()
+        return bool(db_path) and db_path.replace("\\", "/") in self._files
+
+    def resolve(self, db_path: Optional[str] = None) -> str:
+        self._check_for_changes()
+        if db_path:
+            path = self._files.get(db_path.replace("\\", "/"))
+            if path is not None:
+                return path
+        return self.default_path
+
+manifest = AssetManifest()
@@ -0,0 +1,150 @@
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import flet as ft
+
+from helper_function import get_image_path
+
+def line_total_text(item: Tuple, quantity: int) -> str:
+    return f"${item[3]:.2f} x {quantity} = ${item[3] * quantity:.2f}"
+
+#Cart rows
+class CartRow:
+    """One cart line: the row control plus the texts a tap changes"""
+
+    def __init__(self, item: Tuple, on_decrease: Callable, on_increase: Callable, on_remove: Callable):
+        self.item = item
+        self.quantity = item[4]
+        self.line_text = ft.Text(line_total_text(item, self.quantity), size=14)
+        self.quantity_text = ft.Text(str(self.quantity), size=14)
+        self.control = ft.Container(
+            content=ft.Row(
+                controls=[
+                    ft.Image(
+                        src=get_image_path(item[5], "cart"),
+                        width=60,
+                        height=60,
+                        fit=ft.ImageFit.COVER,
+                        border_radius=ft.border_radius.all(8)
+                    ),
+                    ft.Container(
+                        content=ft.Column(
+                            [
+                                ft.Text(item[1], size=16, weight=ft.FontWeight.BOLD),
+                                self.line_text,
+                            ],
+                            spacing=2
+                        ),
+                        expand=True,
+                        padding=ft.padding.only(left=10)
+                    ),
+                    ft.Row(
+                        controls=[
+                            ft.IconButton(
+                                icon=ft.icons.REMOVE,
+                                icon_size=16,
+                                data=item[0],  # Store the item ID in the button's data attribute
+                                on_click=on_decrease
+                            ),
+                            self.quantity_text,
+                            ft.IconButton(
+                                icon=ft.icons.ADD,
+                                icon_size=16,
+                                data=item[0],
+                                on_click=on_increase
+                            ),
+                            ft.IconButton(
+                                icon=ft.icons.DELETE,
+                                icon_color=ft.colors.RED_600,
+                                icon_size=18,
+                                data=item[0],
+                                on_click=on_remove
+                            ),
+                        ],
+                        spacing=5
+                    )
+                ],
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                vertical_alignment=ft.CrossAxisAlignment.CENTER
+            ),
+            padding=10,
+            border=ft.border.all(0.5, ft.colors.GREY_300),
+            border_radius=10,
+            margin=ft.margin.symmetric(vertical=4, horizontal=8)
+        )
+
+    def set_quantity(self, quantity: int):
+        self.quantity = quantity
+        self.line_text.value = line_total_text(self.item, quantity)
+        self.quantity_text.value = str(quantity)
+        # Hidden rather than removed, so a rolled back delete keeps its place
+        self.control.visible = quantity > 0
+
+#Cart screen
+class CartScreen:
+    """The cart list, its total and the checkout button, keyed by food id.
+
+    A quantity tap patches the one row and the total in place and sends
+    just those controls, instead of re-reading the cart and pushing a new
+    View. Changes are applied optimistically: change_quantity() shows the
+    new quantity first, then runs the write, and puts the old quantity
+    back if the write fails.
+    """
+
+    def __init__(self, items: List[Tuple], on_decrease: Callable, on_increase: Callable, on_remove: Callable):
+        self._lock = threading.Lock()
+        self.rows: Dict[int, CartRow] = {
+            item[0]: CartRow(item, on_decrease, on_increase, on_remove) for item in items
+        }
+        self.list = ft.Column(
+            [row.control for row in self.rows.values()],
+            scroll=ft.ScrollMode.AUTO,
+            expand=True
+        )
+        self.total_text = ft.Text(size=18, weight=ft.FontWeight.BOLD)
+        self.checkout_button = ft.ElevatedButton("Checkout")
+        self._refresh_total()
+
+    def quantity(self, food_id: int) -> Optional[int]:
+        row = self.rows.get(food_id)
+        return row.quantity if row and row.quantity > 0 else None
+
+    def _refresh_total(self):
+        total = sum(row.item[3] * row.quantity for row in self.rows.values())
+        self.total_text.value = f"Total: ${total:.2f}"
+        self.checkout_button.disabled = not any(row.quantity for row in self.rows.values())
+
+    def _show(self, row: CartRow, quantity: int):
+        was_visible = row.control.visible
+        row.set_quantity(quantity)
+        self._refresh_total()
+        if row.control.visible != was_visible:
+            controls = [row.control]
+        else:
+            controls = [row.line_text, row.quantity_text]
+        if self.list.page:
+            self.list.page.update(*controls, self.total_text, self.checkout_button)
+
+    def change_quantity(self, food_id: int, quantity: int, write: Callable[[], Optional[int]]) -> Optional[int]:
+        """Show `quantity` for the line, then run `write`.
+
+        `write` returns the quantity the cart really holds (None when the
+        line is gone), which wins if it differs from the optimistic one.
+        When it raises, the previous quantity is shown again and the error
+        is re-raised.
+        """
+        with self._lock:
+            row = self.rows.get(food_id)
+            if row is None:
+                return None
+            previous = row.quantity
+            self._show(row, max(quantity, 0))
+            try:
+                actual = write()
+            except Exception:
+                self._show(row, previous)
+                raise
+            actual = actual or 0
+            if actual != row.quantity:
+                self._show(row, actual)
+            return actual
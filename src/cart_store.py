@@ -0,0 +1,274 @@
+import atexit
+import glob
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import repository
+from catalog import catalog
+
+# Keep carts in memory and write them to cart_items in batches. Off by
+# default: every cart edit commits straight to the database. Checkout does
+# not yet hold the store across flush -> place_order -> forget, so an edit
+# from another session in between would be dropped from memory but still
+# replayed from the journal on restart.
+WRITE_BEHIND = False
+# Seconds between background flushes of changed carts
+FLUSH_INTERVAL = 2.0
+JOURNAL_SUFFIX = ".cart-journal"
+
+#Cart store
+class CartStore:
+    """In-memory carts, written behind to the database.
+
+    While write-behind is enabled, the carts held here are the source of
+    truth: edits only touch memory plus one line appended to a journal
+    file, and changed carts are written to cart_items together in one
+    transaction every FLUSH_INTERVAL seconds, before checkout and on exit.
+
+    Journal lines hold the absolute quantity of a cart line, so replaying
+    them is idempotent. The journal is split into numbered segments; a
+    flush starts a new segment and deletes the older ones once its commit
+    succeeded. Segments left over after a crash are replayed into the
+    database the next time the store is used. Lines are handed to the OS
+    on every edit but never fsynced, so a process crash loses nothing; a
+    power cut can lose what the database has not checkpointed yet, as any
+    write under synchronous=NORMAL can.
+    """
+
+    def __init__(self, enabled: bool = WRITE_BEHIND, flush_interval: float = FLUSH_INTERVAL):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._carts: Dict[int, Dict[int, int]] = {}
+        self._dirty: Set[int] = set()
+        self._journal = None
+        self._journal_prefix = None
+        self._segment = 0
+        self._timer: Optional[threading.Timer] = None
+        self._stopped = False
+        self.flushes = 0
+        self.lines_written = 0
+
+    def _segment_path(self, number: int) -> str:
+        return f"{self._journal_prefix}.{number}"
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        segments = []
+        for path in glob.glob(glob.escape(self._journal_prefix) + ".*"):
+            suffix = path.rsplit(".", 1)[1]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        return sorted(segments)
+
+    def _open_segment(self):
+        self._segment += 1
+        self._journal = open(self._segment_path(self._segment), "a", encoding="ascii")
+
+    def _append(self, user_id: int, food_id: int, quantity: int):
+        self._journal.write(f"{user_id} {food_id} {quantity}\n")
+        # Reaches the OS (and so survives an app crash) without an fsync
+        self._journal.flush()
+
+    def _recover(self):
+        """Replay journal segments left behind by a previous run"""
+        segments = self._segments()
+        if not segments:
+            return
+        carts: Dict[int, Dict[int, int]] = {}
+        for _, path in segments:
+            with open(path, encoding="ascii", errors="replace") as journal:
+                for line in journal:
+                    parts = line.split()
+                    # A torn last line from a crash is skipped
+                    if len(parts) != 3 or not all(part.lstrip("-").isdigit() for part in parts):
+                        continue
+                    user_id, food_id, quantity = map(int, parts)
+                    carts.setdefault(user_id, {})[food_id] = quantity
+        repository.writer.run(lambda conn: _apply_lines(conn, carts))
+        for _, path in segments:
+            os.remove(path)
+        self._segment = segments[-1][0]
+
+    def _ensure_started(self):
+        db_path = repository.pool.db_path
+        if self._journal is not None and self._journal_prefix == db_path + JOURNAL_SUFFIX:
+            return
+        if self._journal is not None:
+            # Pointed at another database (scripts): unflushed edits stay in
+            # the old database's journal and are replayed when it is used again
+            self._journal.close()
+            self._carts.clear()
+            self._dirty.clear()
+        self._journal_prefix = db_path + JOURNAL_SUFFIX
+        self._segment = 0
+        self._recover()
+        self._open_segment()
+
+    def _schedule_flush(self):
+        if self._timer is None and not self._stopped:
+            self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Cart flush failed, will retry: {e}")
+            with self._lock:
+                self._schedule_flush()
+
+    def _cart(self, user_id: int) -> Dict[int, int]:
+        self._ensure_started()
+        cart = self._carts.get(user_id)
+        if cart is None:
+            cart = dict(repository.get_cart_lines(user_id))
+            self._carts[user_id] = cart
+        return cart
+
+    def _set(self, user_id: int, food_id: int, quantity: int):
+        cart = self._carts[user_id]
+        if quantity > 0:
+            cart[food_id] = quantity
+        else:
+            cart.pop(food_id, None)
+        self._append(user_id, food_id, quantity)
+        self._dirty.add(user_id)
+        self._schedule_flush()
+
+    def get_cart_quantity(self, user_id: int, food_id: int) -> int:
+        if not self.enabled:
+            return repository.get_cart_quantity(user_id, food_id)
+        with self._lock:
+            return self._cart(user_id).get(food_id, 0)
+
+    def get_cart_items(self, user_id: int) -> List[Tuple]:
+        """Cart rows shaped like repository.get_cart_items"""
+        if not self.enabled:
+            return repository.get_cart_items(user_id)
+        with self._lock:
+            lines = list(self._cart(user_id).items())
+        items = []
+        for food_id, quantity in lines:
+            food = catalog.food_item(food_id)
+            if food is not None:
+                items.append((food[0], food[1], food[2], food[3], quantity, food[5]))
+        return items
+
+    def add_to_cart(self, user_id: int, food_id: int, quantity: int) -> int:
+        if not self.enabled:
+            return repository.add_to_cart(user_id, food_id, quantity)
+        with self._lock:
+            new_quantity = self._cart(user_id).get(food_id, 0) + quantity
+            self._set(user_id, food_id, new_quantity)
+            return new_quantity
+
+    def change_cart_quantity(self, user_id: int, food_id: int, quantity_change: int) -> Optional[int]:
+        if not self.enabled:
+            return repository.change_cart_quantity(user_id, food_id, quantity_change)
+        with self._lock:
+            cart = self._cart(user_id)
+            if food_id not in cart:
+                return None
+            new_quantity = max(cart[food_id] + quantity_change, 0)
+            self._set(user_id, food_id, new_quantity)
+            return new_quantity
+
+    def remove_from_cart(self, user_id: int, food_id: int):
+        if not self.enabled:
+            return repository.remove_from_cart(user_id, food_id)
+        with self._lock:
+            if food_id in self._cart(user_id):
+                self._set(user_id, food_id, 0)
+
+    def forget(self, user_id: int):
+        """Drop a cart from memory after the database changed it (e.g. checkout)"""
+        with self._lock:
+            self._carts.pop(user_id, None)
+            self._dirty.discard(user_id)
+
+    def flush(self) -> int:
+        """Write every changed cart to the database; returns the number of carts"""
+        if not self.enabled:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                if self._journal is None or not self._dirty:
+                    return 0
+                carts = {user_id: dict(self._carts.get(user_id, {})) for user_id in self._dirty}
+                self._dirty.clear()
+                # Edits from here on go to a new segment
+                self._journal.close()
+                flushed_segment = self._segment
+                self._open_segment()
+
+            try:
+                repository.writer.run(lambda conn: _replace_carts(conn, carts))
+            except Exception:
+                with self._lock:
+                    # Keep the journal and retry these carts next time
+                    self._dirty.update(user_id for user_id in carts if user_id in self._carts)
+                raise
+
+            for number, path in self._segments():
+                if number <= flushed_segment:
+                    os.remove(path)
+            self.flushes += 1
+            self.lines_written += sum(len(cart) for cart in carts.values())
+            return len(carts)
+
+    def close(self):
+        """Flush pending carts and stop the background flush"""
+        with self._lock:
+            self._stopped = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+                # Everything is in the database now
+                for _, path in self._segments():
+                    os.remove(path)
+
+def _apply_lines(conn, carts: Dict[int, Dict[int, int]]):
+    for user_id, lines in carts.items():
+        for food_id, quantity in lines.items():
+            if quantity > 0:
+                conn.execute("""
+                    INSERT INTO cart_items (user_id, food_item_id, quantity)
+                    SELECT ?, id, ? FROM food_items WHERE id=?
+                    ON CONFLICT (user_id, food_item_id) DO UPDATE SET quantity = excluded.quantity
+                """, (user_id, quantity, food_id))
+            else:
+                conn.execute(
+                    "DELETE FROM cart_items WHERE user_id=? AND food_item_id=?",
+                    (user_id, food_id)
+                )
+
+def _replace_carts(conn, carts: Dict[int, Dict[int, int]]):
+    conn.executemany(
+        "DELETE FROM cart_items WHERE user_id=?",
+        ((user_id,) for user_id in carts)
+    )
+    # Skips lines whose food item was deleted in the meantime
+    conn.executemany("""
+        INSERT INTO cart_items (user_id, food_item_id, quantity)
+        SELECT ?, id, ? FROM food_items WHERE id=?
+    """, (
+        (user_id, quantity, food_id)
+        for user_id, lines in carts.items()
+        for food_id, quantity in lines.items()
+    ))
+
+cart_store = CartStore()
+
+# Registered after repository's own handler, so it runs first and the
+# writer is still there for the final flush
+atexit.register(cart_store.close)
@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import repository
+
+# How often (seconds) to read the menu version (app_counters, see
+# migrations.py) to notice menu edits made by another process. In between,
+# reads never touch the database.
+MENU_VERSION_CHECK_INTERVAL = 5.0
+
+#Menu catalog cache
+class MenuSnapshot:
+    """Immutable view of the menu: categories and available items"""
+
+    def __init__(self, categories: List[Tuple], items: List[Tuple]):
+        self.categories = categories
+        self.items = items
+        self.category_names = {category[0]: category[1] for category in categories}
+        self.items_by_id = {item[0]: item for item in items}
+        self.items_by_category: Dict[int, List[Tuple]] = {category[0]: [] for category in categories}
+        for item in items:
+            self.items_by_category.setdefault(item[4], []).append(item)
+
+class MenuCatalog:
+    """Process-wide, read-mostly cache of the menu.
+
+    The whole menu is loaded in one go and served from memory until it is
+    invalidated, either by `invalidate()` (called by anything that edits
+    categories or food items) or when the menu version, bumped by triggers
+    on those two tables only, shows an edit by another connection or
+    process. Cart, order and review writes do not change it.
+    """
+
+    def __init__(self, check_interval: float = MENU_VERSION_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[MenuSnapshot] = None
+        self._version = 0
+        self._snapshot_version = -1
+        # (database path, menu version) seen at the last check
+        self._menu_version = None
+        self._last_check = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.fallbacks = 0
+
+    def invalidate(self):
+        """Bump the menu version; the next read reloads the catalog"""
+        with self._lock:
+            self._version += 1
+
+    def version(self) -> int:
+        """Menu version; changes whenever the menu has to be reloaded"""
+        with self._lock:
+            if self._database_changed():
+                self._version += 1
+            return self._version
+
+    def _database_changed(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        menu_version = (repository.pool.db_path, repository.get_menu_version())
+        changed = self._menu_version is not None and menu_version != self._menu_version
+        self._menu_version = menu_version
+        return changed
+
+    def snapshot(self) -> MenuSnapshot:
+        with self._lock:
+            if self._database_changed():
+                self._version += 1
+            if self._snapshot is not None and self._snapshot_version == self._version:
+                self.hits += 1
+                return self._snapshot
+
+            self.misses += 1
+            version = self._version
+            snapshot = MenuSnapshot(repository.get_categories(), repository.get_food_items())
+            self._snapshot = snapshot
+            self._snapshot_version = version
+            self.loads += 1
+            return snapshot
+
+    def categories(self) -> List[Tuple]:
+        return self.snapshot().categories
+
+    def food_items(self, category_id: Optional[int] = None) -> List[Tuple]:
+        snapshot = self.snapshot()
+        if category_id:
+            return snapshot.items_by_category.get(category_id, [])
+        return snapshot.items
+
+    def food_item(self, food_id: int) -> Optional[Tuple]:
+        item = self.snapshot().items_by_id.get(food_id)
+        if item is None:
+            # Unavailable items are not cached but can still be linked to
+            self.fallbacks += 1
+            item = repository.get_food_item(food_id)
+        return item
+
+    def category_name(self, category_id: int) -> Optional[str]:
+        return self.snapshot().category_names.get(category_id)
+
+    def stats(self) -> Dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'loads': self.loads,
+            'fallbacks': self.fallbacks,
+            'version': self._version,
+        }
+
+catalog = MenuCatalog()
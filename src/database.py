@@ -1,9 +1,26 @@
 import sqlite3
-import hashlib
+import threading
+import migrations
+import passwords
+
+DB_PATH = 'canteen.db'
+# Stored in PRAGMA user_version once init_db() has brought a database up to
+# the newest migration; bootstrap() skips all DDL while it matches
+SCHEMA_VERSION = migrations.MIGRATIONS[-1][0]
+
+_bootstrap_lock = threading.Lock()
+_bootstrapped = set()
+
 #Database
-def init_db():
-    conn = sqlite3.connect('canteen.db')
+def init_db(db_path: str = DB_PATH):
+    """Create the base tables and the admin account, then apply migrations"""
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
+
+    # WAL lets menu reads run while an order is being written. It is stored
+    # in the database file, so it only needs to be set once here; the other
+    # tuning PRAGMAs are per connection (see repository.CONNECTION_PRAGMAS).
+    cursor.execute("PRAGMA journal_mode=WAL")
     
     # Users table
     cursor.execute('''
@@ -77,24 +94,40 @@ def init_db():
     )''')
     
     # Create admin if not exists
-    cursor.execute("SELECT * FROM users WHERE username='admin'")
+    cursor.execute("SELECT 1 FROM users WHERE username='admin'")
     if not cursor.fetchone():
-        hashed_password = hashlib.sha256('admin123'.encode()).hexdigest()
+        hashed_password = passwords.hash_password('admin123')
         cursor.execute(
-            "INSERT INTO users (username, password, email, is_admin) VALUES (?, ?, ?, ?)",
+            "INSERT OR IGNORE INTO users (username, password, email, is_admin) VALUES (?, ?, ?, ?)",
             ('admin', hashed_password, 'admin@canteen.com', True)
         )
     
     conn.commit()
-    conn.close()
 
-init_db()
+    # Versioned schema changes on top of the base tables (see migrations.py)
+    migrations.migrate(conn)
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    conn.close()
 
-conn = sqlite3.connect('canteen.db')
-cursor = conn.cursor()
-cursor.execute("SELECT * FROM users")
-users = cursor.fetchall()
-for user in users:
-    print(user)
+def bootstrap(db_path: str = DB_PATH) -> bool:
+    """Make sure the database is ready before the app uses it.
 
-conn.close()
\ No newline at end of file
+    Runs init_db() only when PRAGMA user_version is behind SCHEMA_VERSION
+    (a new database, or the first start after an upgrade); otherwise it
+    costs one PRAGMA read, and nothing at all on later calls in the same
+    process. Safe to call from every entry point. Returns True when
+    init_db() ran.
+    """
+    with _bootstrap_lock:
+        if db_path in _bootstrapped:
+            return False
+        conn = sqlite3.connect(db_path)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+        ran = version < SCHEMA_VERSION
+        if ran:
+            init_db(db_path)
+        _bootstrapped.add(db_path)
+        return ran
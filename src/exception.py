@@ -4,4 +4,8 @@ class AuthError(Exception):
 class DatabaseError(Exception):
     pass
 class ValidationErro(Exception):
+    pass
+class OrderError(Exception):
+    pass
+class ReviewError(Exception):
     pass
\ No newline at end of file
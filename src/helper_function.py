@@ -1,16 +1,8 @@
 import flet as ft
-import hashlib
-import sqlite3
 from typing import Optional, List, Dict, Tuple
-import os
-from pathlib import Path
+from asset_manifest import manifest
+from catalog import catalog
 #Helper Functions
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_password(hashed_password: str, user_password: str) -> bool:
-    return hashed_password == hash_password(user_password)
-
 def get_current_user_id(page: ft.Page) -> Optional[int]:
     return page.client_storage.get("user_id")
 
@@ -52,52 +44,30 @@ def show_view(page: ft.Page, view):
 
 def get_categories(page: ft.Page) -> List[Tuple]:
     try:
-        conn = sqlite3.connect('canteen.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM categories ORDER BY name")
-        return cursor.fetchall()
+        return catalog.categories()
     except Exception as e:
         show_error_dialog(page, str(e))
         return []
-    finally:
-        conn.close()
 
 def get_food_items(page: ft.Page, category_id: Optional[int] = None) -> List[Tuple]:
     try:
-        conn = sqlite3.connect('canteen.db')
-        cursor = conn.cursor()
-
-        if category_id:
-            cursor.execute(
-            "SELECT * FROM food_items WHERE category_id=? AND available=1",
-                    (category_id,)
-            )
-        else:
-            cursor.execute("SELECT * FROM food_items WHERE available=1")
-
-        return cursor.fetchall()
+        return catalog.food_items(category_id)
     except Exception as e:
         show_error_dialog(page, str(e))
+        return []
 
-import os
-from pathlib import Path
+def get_image_path(db_path=None, size=None):
+    """Handles all image paths consistently.
 
-# Add this right after your imports
-def get_image_path(db_path=None):
-    """Handles all image paths consistently"""
-    # 1. Define possible locations
-    assets_dir = Path("assets")
-    absolute_assets = Path("E:/TO-DO-LIST-Project/SchoolProject/CSB_Final_Project/src/assets")
-    
-    # 2. Determine which assets location exists
-    working_assets = absolute_assets if absolute_assets.exists() else assets_dir
-    
-    # 3. Handle default image
-    default_image = working_assets / "default.png"
-    
-    # 4. Return the appropriate path
-    if db_path:
-        potential_path = working_assets / db_path
-        if potential_path.exists():
-            return str(potential_path)
-    return str(default_image)
\ No newline at end of file
+    With a size name from image_pipeline.VARIANT_SIZES ("grid", "search",
+    "cart", "details") the pre-scaled WebP variant is returned once it has
+    been generated; until then, and without a size, the original file.
+    """
+    if size:
+        # Loaded by the first sized image, not at start-up
+        from image_pipeline import pipeline
+        variant = pipeline.variant(db_path, size)
+        if variant:
+            return variant
+    # Resolved from the asset manifest built at startup (no filesystem stats per call)
+    return manifest.resolve(db_path)
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from asset_manifest import AssetManifest, manifest, DEFAULT_IMAGE
+
+# Display size (logical px) and fit of every place a food image is shown.
+# "fill" stretches like ft.ImageFit.FILL, "cover" crops like ft.ImageFit.COVER.
+VARIANT_SIZES = {
+    "search": (50, 50, "fill"),
+    "cart": (60, 60, "cover"),
+    "grid": (160, 120, "fill"),
+    "details": (300, 300, "fill"),
+}
+# Variants are rendered at this multiple of the display size for sharp
+# images on high-density screens (never larger than the source)
+PIXEL_RATIO = 2
+WEBP_QUALITY = 80
+# Sub-folder of the assets folder holding the generated, content-addressed files
+VARIANTS_DIR = "variants"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+MAX_WORKERS = 2
+
+def pillow_available() -> bool:
+    # Looked up, not imported: only the worker processes need Pillow itself
+    return find_spec("PIL") is not None
+
+def render_variants(source: str, out_dir: str) -> Dict[str, str]:
+    """Render every size of one image; returns size name -> variant filename.
+
+    Runs in a worker process. Files are named after the hash of the source
+    bytes, so identical uploads share variants and existing ones are kept.
+    """
+    from PIL import Image, ImageOps
+
+    data = Path(source).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    os.makedirs(out_dir, exist_ok=True)
+
+    results = {}
+    image = None
+    try:
+        for name, (width, height, fit) in VARIANT_SIZES.items():
+            filename = f"{digest}_{width}x{height}.webp"
+            target = Path(out_dir) / filename
+            if not target.exists():
+                if image is None:
+                    image = Image.open(source)
+                    image.load()
+                scale = max(1, min(PIXEL_RATIO, image.width / width, image.height / height))
+                size = (round(width * scale), round(height * scale))
+                if fit == "cover":
+                    variant = ImageOps.fit(image, size, Image.LANCZOS)
+                else:
+                    variant = image.resize(size, Image.LANCZOS)
+                partial = target.with_name(target.name + ".part")
+                variant.save(partial, "WEBP", quality=WEBP_QUALITY, method=4)
+                os.replace(partial, target)
+            results[name] = filename
+    finally:
+        if image is not None:
+            image.close()
+    return results
+
+#Image pipeline
+class ImagePipeline:
+    """Pre-generated, size-specific WebP variants of the food images.
+
+    Variants are rendered on a small process pool (worker processes import
+    this module, not main.py's app) so bulk uploads never block the UI;
+    until an image's variants are ready, callers get the original file,
+    and so they do after a failed render until `invalidate()`.
+    Without Pillow installed the pipeline stays disabled and everything
+    keeps using the originals.
+    """
+
+    def __init__(self, assets: AssetManifest = manifest, max_workers: int = MAX_WORKERS):
+        self.assets = assets
+        self.max_workers = max_workers
+        self.enabled = pillow_available()
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self._variants: Dict[Tuple[str, str], str] = {}
+        self._pending: Dict[str, Future] = {}
+        # Images whose render failed: served as originals until invalidate()
+        self._failed: Set[str] = set()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            try:
+                # Imported here: it pulls in multiprocessing, which app start-up
+                # should not pay for
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            except (ImportError, NotImplementedError, OSError):
+                # Platforms without multiprocessing (e.g. some mobile builds)
+                self._executor = ThreadPoolExecutor(self.max_workers)
+        return self._executor
+
+    def _variants_dir(self) -> Path:
+        return self.assets.root / VARIANTS_DIR
+
+    def submit(self, db_path: str) -> Optional[Future]:
+        """Queue variant generation for an image in the assets folder"""
+        if not self.enabled or not self.assets.has(db_path):
+            return None
+        with self._lock:
+            future = self._pending.get(db_path)
+            if future is not None:
+                return future
+            if db_path in self._failed:
+                return None
+            if all((db_path, size) in self._variants for size in VARIANT_SIZES):
+                return None
+            source = os.path.abspath(self.assets.resolve(db_path))
+            future = self._get_executor().submit(render_variants, source, str(self._variants_dir().resolve()))
+            self._pending[db_path] = future
+        future.add_done_callback(lambda f, name=db_path: self._record(name, f))
+        return future
+
+    def _record(self, db_path: str, future: Future):
+        with self._lock:
+            self._pending.pop(db_path, None)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                # Not retried on every card render; invalidate() tries again
+                self._failed.add(db_path)
+                return
+            folder = self._variants_dir()
+            for size, filename in future.result().items():
+                self._variants[(db_path, size)] = str(folder / filename)
+
+    def invalidate(self, db_path: str):
+        """Forget an image's variants or failed render (e.g. after it was replaced) and rebuild them"""
+        with self._lock:
+            self._failed.discard(db_path)
+            for size in VARIANT_SIZES:
+                self._variants.pop((db_path, size), None)
+        self.submit(db_path)
+
+    def warm_up(self):
+        """Queue every image in the assets folder; returns immediately"""
+        for name in self.assets.files():
+            if not name.startswith(VARIANTS_DIR + "/") and name.lower().endswith(IMAGE_EXTENSIONS):
+                self.submit(name)
+
+    def warm_up_in_background(self) -> threading.Thread:
+        """warm_up() on a daemon thread, so starting the pool stays off app start-up"""
+        thread = threading.Thread(target=self.warm_up, name="image-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def wait(self):
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.exception()
+
+    def variant(self, db_path: Optional[str], size: str) -> Optional[str]:
+        """Path of the ready variant for this size, or None (generation is queued)"""
+        if not self.enabled or size not in VARIANT_SIZES:
+            return None
+        name = db_path if self.assets.has(db_path) else DEFAULT_IMAGE
+        path = self._variants.get((name, size))
+        if path is None:
+            self.submit(name)
+        return path
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+pipeline = ImagePipeline()
@@ -1,13 +1,25 @@
 import flet as ft
 
 import sqlite3
-import hashlib
-import datetime
-from typing import Optional, List, Dict, Tuple
+import uuid
+from typing import Optional, List, Tuple
 import database
 import exception
 import helper_function
+import passwords
+import repository
+import reviews
+import search
+from catalog import catalog
+from cart_store import cart_store
+from cart_screen import CartScreen
 from helper_function import show_error_dialog, show_success_dialog, get_categories, get_food_items, get_image_path
+from menu_grid import FoodGrid
+from order_cache import order_cache
+from order_history import OrderHistoryList, status_color as order_status_color
+from reviews import ReviewList
+from router import ADMIN, PUBLIC, USER, Router
+from view_cache import ViewCache
 
 # Exception handling classes
 class AuthError(Exception):
@@ -28,6 +40,8 @@ class CanteenApp:
         self.page = page
         self._init_search_dialog()
         self.current_food_id = None
+        # Per-session cache of built views (see route_change)
+        self.view_cache = ViewCache()
         self.page.title = "Canteen Food Ordering System"
         self.page.theme_mode = ft.ThemeMode.LIGHT
         self.page.padding = 20
@@ -37,16 +51,31 @@ class CanteenApp:
         self.page.on_view_pop = self.view_pop
         self.page.go("/")
 
-        self.routes = {
-            "/": self.login_view,
-            "/register": self.register_view,
-            "/user_dashboard": self.user_dashboard_view,
-            "/food_details": self.food_details_view,
-            "/food_details/:food_id": self.food_details_view,
-            "/cart": self.cart_view,
-            "/checkout": self.checkout_view,
-            "/order_history": self.order_history_view,
-            "/order_details": self.show_order_details
+        # Compiled once; guards say who may open each route
+        self.router = Router()
+        self.router.add("/", self.login_view)
+        self.router.add("/register", self.register_view)
+        self.router.add("/user_dashboard", self.user_dashboard_view, guard=USER)
+        self.router.add("/food_details", self.food_details_view, guard=USER)
+        self.router.add("/food_details/:food_id", self.food_details_view, guard=USER, food_id=int)
+        self.router.add("/reviews/:food_id", self.show_reviews, guard=USER, food_id=int)
+        self.router.add("/cart", self.cart_view, guard=USER)
+        self.router.add("/checkout", self.checkout_view, guard=USER)
+        self.router.add("/order_history", self.order_history_view, guard=USER)
+        self.router.add("/order_details/:order_id", self.show_order_details, guard=USER, order_id=int)
+        self.router.add("/admin_dashboard", self.admin_dashboard_view, guard=ADMIN)
+        self.router.add("/view_orders", self.view_orders_view, guard=ADMIN)
+
+        # Views kept between visits: the tags of the data they show, the
+        # attributes their handlers use, re-pointed when a view is reused,
+        # and what else to reset then (called with the route's params)
+        self.cached_routes = {
+            "/user_dashboard": (("menu",), ("menu_grid", "food_grid"), None),
+            "/food_details/:food_id": (
+                ("menu", "cart", "reviews"),
+                ("food_quantity", "food_add_to_cart_btn"),
+                self.reuse_food_details
+            )
         }
 
     def view_pop(self, view):
@@ -59,62 +88,80 @@ class CanteenApp:
             self.page.go(top_view.route)
 
     def route_change(self, e):
-        route = e.route if hasattr(e, 'route') else e
-        print(f"Route changed to: {route}")
-
-        # Handle food details route with ID
-        if route.startswith("/food_details/"):
-            parts = route.split("/")
-            if len(parts) >= 3:
-                try:
-                    self.current_food_id = int(parts[2])
-                    route = "/food_details/:food_id"
-                except ValueError:
-                    show_error_dialog(self.page, "Invalid food ID")
-                    self.page.go("/user_dashboard")
-                    return
+        path = e.route if hasattr(e, 'route') else e
+        print(f"Route changed to: {path}")
+
+        match = self.router.resolve(path)
+        if match is None:
+            self.page.views.append(self.not_found_view(path))
+            self.page.update()
+            return
+        route, params = match
 
         # Clear views if going to root
-        if route == "/":
+        if route.pattern == "/":
             self.page.views.clear()
 
-        # Authentication check for protected routes
-        protected_routes = [
-            "/user_dashboard", "/admin_dashboard", "/food_details", 
-            "/food_details/:food_id"
-        ]
-        
-        if route in protected_routes and not helper_function.get_current_user_id(self.page):
+        if route.guard != PUBLIC and not helper_function.get_current_user_id(self.page):
             self.page.go("/")
             return
-
-        # Admin routes check
-        admin_routes = ["/admin_dashboard"]
-        if route in admin_routes and not helper_function.is_admin(self.page):
+        if route.guard == ADMIN and not helper_function.is_admin(self.page):
             self.page.go("/user_dashboard")
             return
 
-        # Get the view function from routes
-        view_func = self.routes.get(route)
-        if not view_func:
-            show_error_dialog(self.page, "Page not found")
-            self.page.go("/")
+        # Back navigation (view_pop) lands on a view still on the stack:
+        # keep it as it is; cached routes check their copy is still fresh
+        cached = self.cached_routes.get(route.pattern)
+        top = self.page.views[-1] if self.page.views else None
+        if top is not None and top.route == path and not cached:
+            self.page.update()
             return
 
-        # Create the view
-        view = view_func()
+        # Create the view, or reuse the control tree built on an earlier visit
+        view = None
+        if cached:
+            key = (route.pattern, *params.values())
+            hit = self.view_cache.get(key)
+            if hit:
+                view, state = hit
+                for name, value in state.items():
+                    setattr(self, name, value)
+                reuse = cached[2]
+                if reuse is not None:
+                    reuse(**params)
+        if view is None:
+            view = route.view(**params)
+            if cached and view is not None:
+                tags, attributes, _ = cached
+                self.view_cache.put(key, view, tags, {name: getattr(self, name) for name in attributes})
 
         # Special handling for user_dashboard - don't allow back navigation to login
-        if route == "/user_dashboard":
+        if route.pattern == "/user_dashboard":
             # Clear all views except the current one
             self.page.views.clear()
             self.page.views.append(view)
         else:
             # Normal navigation behavior for other routes
-            if not self.page.views or self.page.views[-1].route != route:
+            if view is not None and (not self.page.views or self.page.views[-1].route != view.route):
                 self.page.views.append(view)
                 
         self.page.update()
+
+    def not_found_view(self, path: str) -> ft.View:
+        return ft.View(
+            path,
+            [
+                ft.AppBar(title=ft.Text("Page not found")),
+                ft.Text(f"There is nothing at {path}"),
+                ft.ElevatedButton("Home", on_click=lambda _: self.page.go(self.home_route()))
+            ]
+        )
+
+    def home_route(self) -> str:
+        if not helper_function.get_current_user_id(self.page):
+            return "/"
+        return "/admin_dashboard" if helper_function.is_admin(self.page) else "/user_dashboard"
+
     # Authentication Views
     def login_view(self):
         self.login_username_field = ft.TextField(label="Username", autofocus=True, width=300)
@@ -208,16 +255,10 @@ class CanteenApp:
         for category in categories:
             category_tabs.append(ft.Tab(text=category[1], icon=ft.Icons.FASTFOOD))
         
-        self.food_grid = ft.GridView(
-            expand=True,
-            runs_count=3,
-            max_extent=200,
-            child_aspect_ratio=0.85,
-            spacing=10,
-            run_spacing=15,
-            padding=20
-        )
-        self.update_food_grid(food_items)
+        self.menu_grid = FoodGrid(self.page, on_open=lambda item_id: self.page.go(f"/food_details/{item_id}"))
+        self.food_grid = self.menu_grid.grid
+        # Not on the page yet; the view is pushed by route_change
+        self.menu_grid.show(food_items, update=False)
         
         return ft.View(
             "/user_dashboard",
@@ -250,7 +291,15 @@ class CanteenApp:
             spacing=0
         )
 
-    def food_details_view(self):
+    def reuse_food_details(self, food_id: int):
+        # A cached details view is shown as if freshly built: its item is
+        # the current one and the quantity starts at 1 again
+        self.current_food_id = food_id
+        self.food_quantity.value = "1"
+
+    def food_details_view(self, food_id: Optional[int] = None):
+        if food_id is not None:
+            self.current_food_id = food_id
         food_id = self.current_food_id
         if not food_id:
             show_error_dialog(self.page, "No food item selected")
@@ -258,41 +307,23 @@ class CanteenApp:
             return None
         
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM food_items WHERE id=?", (food_id,))
-            food_item = cursor.fetchone()
+            food_item = catalog.food_item(food_id)
 
             if not food_item:
                 raise DatabaseError("Food item not found")
             
-            cursor.execute("SELECT name FROM categories WHERE id=?", (food_item[4],))
-            category_name = cursor.fetchone()[0]
+            category_name = catalog.category_name(food_item[4])
             
             # Check if item is in cart
             in_cart = False
             cart_quantity = 0
             user_id = helper_function.get_current_user_id(self.page)
             if user_id:
-                cursor.execute(
-                    "SELECT quantity FROM cart_items WHERE user_id=? AND food_item_id=?",
-                    (user_id, food_id) 
-                )
-                cart_item = cursor.fetchone()
-                if cart_item:
-                    in_cart = True
-                    cart_quantity = cart_item[0]
+                cart_quantity = cart_store.get_cart_quantity(user_id, food_id)
+                in_cart = cart_quantity > 0
             
             # Get review summary
-            cursor.execute(
-                """
-                SELECT AVG(rating), COUNT(*) 
-                FROM reviews 
-                WHERE food_item_id=?
-                """, (food_id,)
-            )
-            avg_rating, review_count = cursor.fetchone()
-            avg_rating = avg_rating or 0
+            avg_rating, review_count = repository.get_rating_summary(food_id)
 
             # Create UI elements
             self.food_quantity = ft.Text("1", size=20)
@@ -321,7 +352,7 @@ class CanteenApp:
                         center_title=True
                     ),
                     ft.Image(
-                        src=get_image_path(food_item[5]),
+                        src=get_image_path(food_item[5], "details"),
                         width=300,
                         height=300,
                         fit=ft.ImageFit.FILL
@@ -349,7 +380,7 @@ class CanteenApp:
                     self.food_add_to_cart_btn,
                     ft.ElevatedButton(
                         "View Reviews",
-                        on_click=lambda e: self.show_reviews(food_id),
+                        on_click=lambda e: self.page.go(f"/reviews/{food_id}"),
                         width=200
                     ),
                     ft.ElevatedButton(
@@ -363,107 +394,32 @@ class CanteenApp:
         except Exception as e:
             show_error_dialog(self.page, str(e))
             return None
-        finally:
-            conn.close()
 
     # Other methods remain the same as in your original code
     def filter_food_by_category(self, e):
         selected_idx = e.control.selected_index
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
             if selected_idx == 0:
-                cursor.execute("SELECT * FROM food_items WHERE available=1")
-                food_items = cursor.fetchall()
+                food_items = catalog.food_items()
                 self.update_food_grid(food_items)
             else:
-                cursor.execute("SELECT id FROM categories")
-                categories = cursor.fetchall()
+                # Same ordering as the tabs built in user_dashboard_view
+                categories = catalog.categories()
                 category_id = categories[selected_idx-1][0]
-                cursor.execute(
-                    "SELECT * FROM food_items WHERE category_id=? AND available=1", 
-                    (category_id,)
-                )
-                food_items = cursor.fetchall()
+                food_items = catalog.food_items(category_id)
 
                 if not food_items:
                     show_error_dialog(self.page, "No food items found in this category")
-                    self.food_grid.controls.clear()
-                    self.page.update()
+                    self.menu_grid.show([])
                     return
 
                 self.update_food_grid(food_items)
         except Exception as e:
             show_error_dialog(self.page, f"Error filtering food: {str(e)}")
-        finally:
-            conn.close()
 
     def update_food_grid(self, food_items):
-        self.food_grid.controls.clear()
-
-        for item in food_items:
-            food_card = ft.GestureDetector(
-                mouse_cursor=ft.MouseCursor.CLICK,
-                on_tap=lambda e, item_id=item[0]: self.page.go(f"/food_details/{item_id}"),
-                content=ft.Card(
-                    elevation=8,
-                    margin=10,
-                    content=ft.Container(
-                        width=180,
-                        height=220,
-                        padding=10,
-                        content=ft.Column(
-                            [
-                                ft.Container(
-                                    width=160,
-                                    height=120,
-                                    border_radius=10,
-                                    content=ft.Image(
-                                        src=get_image_path(item[5]),
-                                        fit=ft.ImageFit.FILL,
-                                        width=160,
-                                        height=120,
-                                    ),
-                                    bgcolor=ft.Colors.GREY_200,
-                                ),
-                                ft.Column(
-                                    [
-                                        ft.Text(
-                                            item[1],
-                                            size=14,
-                                            weight=ft.FontWeight.BOLD,
-                                            text_align=ft.TextAlign.CENTER,
-                                            width=160,
-                                            max_lines=2,
-                                            overflow=ft.TextOverflow.ELLIPSIS,
-                                        ),
-                                        ft.Text(
-                                            f"${item[3]:.2f}",
-                                            size=14,
-                                            color=ft.Colors.GREEN_700,
-                                            text_align=ft.TextAlign.CENTER,
-                                        ),
-                                    ],
-                                    spacing=5,
-                                    alignment=ft.MainAxisAlignment.CENTER,
-                                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                                ),
-                                ft.ElevatedButton(
-                                    "View Details",
-                                    on_click=lambda e, item_id=item[0]: self.page.go(f"/food_details/{item_id}"),
-                                    width=160,
-                                    height=30,
-                                ),
-                            ],
-                            spacing=8,
-                            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        ),
-                    ),
-                ),
-            )
-            self.food_grid.controls.append(food_card)
-        
-        self.page.update()
+        # Reuses the cards already built for these items and only sends the difference
+        self.menu_grid.show(food_items)
 
     def _init_search_dialog(self):
         """Initialize search dialog components"""
@@ -471,8 +427,11 @@ class CanteenApp:
             label="Search food items",
             autofocus=True,
             width=400,
+            on_change=self._on_search_input,
             on_submit=self._perform_search
         )
+        # Debounced search-as-you-type; results land in _show_live_results
+        self.live_search = search.LiveSearch(self._show_live_results)
         
         self.search_results = ft.ListView(expand=1, spacing=10, height=300)
         
@@ -508,6 +467,8 @@ class CanteenApp:
         # Reset dialog state
         self.search_query.value = ""
         self.search_results.controls.clear()
+        self.live_search.cancel()
+        self.live_search.clear_cache()
         
         # Open dialog
         self.search_dialog.open = True
@@ -515,9 +476,26 @@ class CanteenApp:
 
     def _close_search_dialog(self, e=None):
         """Close the search dialog"""
+        self.live_search.cancel()
         self.search_dialog.open = False
         self.page.update()
 
+    def _on_search_input(self, e):
+        """Search as the user types (debounced)"""
+        query = self.search_query.value.strip()
+        if not query:
+            self.live_search.cancel()
+            self.search_results.controls.clear()
+            self.page.update()
+            return
+        self.live_search.on_input(query)
+
+    def _show_live_results(self, query, results):
+        try:
+            self._show_search_results(results)
+        except Exception as e:
+            show_error_dialog(self.page, f"Search error: {str(e)}")
+
     def _perform_search(self, e=None):
         """Execute search and display results"""
         query = self.search_query.value.strip().lower()
@@ -526,44 +504,40 @@ class CanteenApp:
             return
         
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM food_items WHERE (LOWER(name) LIKE ? OR LOWER(description) LIKE ?) AND available=1",
-                (f"%{query}%", f"%{query}%")
+            # An explicit submit wins over any pending as-you-type search
+            self.live_search.cancel()
+            self._show_search_results(self.live_search.lookup(query))
+        except Exception as e:
+            show_error_dialog(self.page, f"Search error: {str(e)}")
+
+    def _show_search_results(self, results):
+        self.search_results.controls.clear()
+        
+        if not results:
+            self.search_results.controls.append(
+                ft.Text("No items found", italic=True)
             )
-            results = cursor.fetchall()
-            
-            self.search_results.controls.clear()
-            
-            if not results:
+        else:
+            for item in results:
                 self.search_results.controls.append(
-                    ft.Text("No items found", italic=True)
-                )
-            else:
-                for item in results:
-                    self.search_results.controls.append(
-                        ft.ListTile(
-                            leading=ft.Image(
-                                src=get_image_path(item[5]),
-                                width=50,
-                                height=50,
-                                fit=ft.ImageFit.FILL,
-                                border_radius=5
-                            ),
-                            title=ft.Text(item[1]),
-                            subtitle=ft.Text(f"${item[3]:.2f}"),
-                            on_click=lambda e, item_id=item[0]: [
-                                self._close_search_dialog(),
-                                self.page.go(f"/food_details/{item_id}")
-                            ]
-                        )
+                    ft.ListTile(
+                        leading=ft.Image(
+                            src=get_image_path(item[5], "search"),
+                            width=50,
+                            height=50,
+                            fit=ft.ImageFit.FILL,
+                            border_radius=5
+                        ),
+                        title=ft.Text(item[1]),
+                        subtitle=ft.Text(f"${item[3]:.2f}"),
+                        on_click=lambda e, item_id=item[0]: [
+                            self._close_search_dialog(),
+                            self.page.go(f"/food_details/{item_id}")
+                        ]
                     )
-            self.page.update()
-        except Exception as e:
-            show_error_dialog(self.page, f"Search error: {str(e)}")
-        finally:
-            conn.close()
+                )
+        self.page.update()
+
     def cart_increase_quantity(self, e):
         """Handle increase quantity button click"""
         item_id = e.control.data
@@ -600,99 +574,24 @@ class CanteenApp:
             show_error_dialog(self.page, "You need to be logged in to add items to the cart")
             return
         try:
-            conn = sqlite3.connect("canteen.db")
-            cursor = conn.cursor()
-
-            cursor.execute(
-                "SELECT quantity FROM cart_items WHERE user_id=? AND food_item_id=?",
-                (user_id, food_id)
-            )
-            existing_item = cursor.fetchone()
-        
-            if existing_item:
-                new_quantity = existing_item[0] + quantity
-                cursor.execute(
-                    "UPDATE cart_items SET quantity=? WHERE user_id=? AND food_item_id=?",
-                    (new_quantity, user_id, food_id)
-                )
-            else:
-                cursor.execute(
-                    "INSERT INTO cart_items (user_id, food_item_id, quantity) VALUES (?, ?, ?)",
-                    (user_id, food_id, quantity)
-                )
-            
-            conn.commit()
+            new_quantity = cart_store.add_to_cart(user_id, food_id, quantity)
+            self.view_cache.invalidate("cart")
             show_success_dialog(self.page, "Item added to cart successfully")
-            self.food_add_to_cart_btn.text = f"In Cart ({new_quantity if existing_item else quantity})"
+            self.food_add_to_cart_btn.text = f"In Cart ({new_quantity})"
             self.page.update()
         except Exception as e:
             show_error_dialog(self.page, f"Error adding to cart: {str(e)}")
-        finally: 
-            conn.close()
     
     def cart_view(self):
         cart_items = self.get_cart_items()
-        total = sum(item[3] * item[4] for item in cart_items)
-        cart_list = ft.Column(scroll=ft.ScrollMode.AUTO, expand=True)
-
-        for item in cart_items:
-            # Create a container for each cart item
-            item_container = ft.Container(
-                content=ft.Row(
-                    controls=[
-                        ft.Image(
-                            src=get_image_path(item[5]),
-                            width=60,
-                            height=60,
-                            fit=ft.ImageFit.COVER,
-                            border_radius=ft.border_radius.all(8)
-                        ),
-                        ft.Container(
-                            content=ft.Column(
-                                [
-                                    ft.Text(item[1], size=16, weight=ft.FontWeight.BOLD),
-                                    ft.Text(f"${item[3]:.2f} x {item[4]} = ${item[3] * item[4]:.2f}", size=14),
-                                ],
-                                spacing=2
-                            ),
-                            expand=True,
-                            padding=ft.padding.only(left=10)
-                        ),
-                        ft.Row(
-                            controls=[
-                                ft.IconButton(
-                                    icon=ft.icons.REMOVE,
-                                    icon_size=16,
-                                    data=item[0],  # Store the item ID in the button's data attribute
-                                    on_click=self.cart_decrease_quantity
-                                ),
-                                ft.Text(str(item[4]), size=14),
-                                ft.IconButton(
-                                    icon=ft.icons.ADD,
-                                    icon_size=16,
-                                    data=item[0],  # Store the item ID in the button's data attribute
-                                    on_click=self.cart_increase_quantity
-                                ),
-                                ft.IconButton(
-                                    icon=ft.icons.DELETE,
-                                    icon_color=ft.colors.RED_600,
-                                    icon_size=18,
-                                    data=item[0],  # Store the item ID in the button's data attribute
-                                    on_click=self.remove_item
-                                ),
-                            ],
-                            spacing=5
-                        )
-                    ],
-                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                    vertical_alignment=ft.CrossAxisAlignment.CENTER
-                ),
-                padding=10,
-                border=ft.border.all(0.5, ft.colors.GREY_300),
-                border_radius=10,
-                margin=ft.margin.symmetric(vertical=4, horizontal=8)
-            )
-            cart_list.controls.append(item_container)
+        # Rows keyed by food id; quantity taps patch them in place
+        self.cart_screen = CartScreen(
+            cart_items,
+            on_decrease=self.cart_decrease_quantity,
+            on_increase=self.cart_increase_quantity,
+            on_remove=self.remove_item
+        )
+        self.cart_screen.checkout_button.on_click = self.go_to_checkout
 
         # Create the cart view
         cart_view = ft.View(
@@ -705,17 +604,13 @@ class CanteenApp:
                               tooltip="Back to Menu"),
                               center_title=True
                           ),
-                cart_list,
+                self.cart_screen.list,
                 ft.Divider(),
                 ft.Container(
                     content=ft.Row(
                         [
-                            ft.Text(f"Total: ${total:.2f}", size=18, weight=ft.FontWeight.BOLD),
-                            ft.ElevatedButton(
-                                "Checkout",
-                                on_click=self.go_to_checkout,
-                                disabled=len(cart_items) == 0
-                            )
+                            self.cart_screen.total_text,
+                            self.cart_screen.checkout_button
                         ],
                         alignment=ft.MainAxisAlignment.SPACE_BETWEEN
                     ),
@@ -735,49 +630,25 @@ class CanteenApp:
             show_error_dialog(self.page, "Please login to modify cart")
             return
         
-        conn = None
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            
-            # Get current quantity
-            cursor.execute(
-                "SELECT quantity FROM cart_items WHERE user_id=? AND food_item_id=?",
-                (user_id, food_id)
-            )
-            result = cursor.fetchone()
-            
-            if not result:
+            current = self.cart_screen.quantity(food_id)
+            if current is None:
                 show_error_dialog(self.page, "Item not found in cart")
                 return
-                
-            current_quantity = result[0]
-            new_quantity = current_quantity + quantity_change
-            
-            if new_quantity <= 0:
-                # Remove item if quantity reaches 0
-                cursor.execute(
-                    "DELETE FROM cart_items WHERE user_id=? AND food_item_id=?",
-                    (user_id, food_id)
-                )
-            else:
-                # Update quantity
-                cursor.execute(
-                    "UPDATE cart_items SET quantity=? WHERE user_id=? AND food_item_id=?",
-                    (new_quantity, user_id, food_id)
-                )
-            
-            conn.commit()
-            # Refresh the cart view
-            self.cart_view()
+
+            # Shown before the write and rolled back if it fails; the line
+            # is removed when the quantity reaches 0
+            self.cart_screen.change_quantity(
+                food_id, current + quantity_change,
+                lambda: cart_store.change_cart_quantity(user_id, food_id, quantity_change)
+            )
+            self.view_cache.invalidate("cart")
             
         except Exception as e:
             show_error_dialog(self.page, f"Failed to update cart: {str(e)}")
             import traceback
             traceback.print_exc()  # Print full traceback for debugging
-        finally:
-            if conn:
-                conn.close()
+
     def remove_from_cart(self, food_id):
         user_id = helper_function.get_current_user_id(self.page)
         if not user_id:
@@ -785,21 +656,19 @@ class CanteenApp:
             return
         
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM cart_items WHERE user_id=? AND food_item_id=?",
-                (user_id, food_id)
+            self.cart_screen.change_quantity(
+                food_id, 0,
+                lambda: cart_store.remove_from_cart(user_id, food_id)
             )
-            conn.commit()
-            self.cart_view()
+            self.view_cache.invalidate("cart")
             show_success_dialog(self.page, "Item removed from cart successfully")
         except Exception as e:
             show_error_dialog(self.page, f"Error removing item from cart: {str(e)}")
-        finally:
-            conn.close()
 
     def checkout_view(self):
+        # Identifies this checkout; every tap of "Place Order" sends the same
+        # key, so double taps and retries can only ever create one order
+        self.checkout_key = uuid.uuid4().hex
         cart_items = self.get_cart_items()
         total = sum(item[3] * item[4] for item in cart_items)
         order_summary = ft.Column()
@@ -856,51 +725,27 @@ class CanteenApp:
         if not user_id:
             show_error_dialog(self.page, "Please login to place an order")
             return
-        cart_items = self.get_cart_items()
-        if not cart_items:
-            show_error_dialog(self.page, "Your cart is empty")
-            return
         address = self.checkout_address.value.strip()
         if not address:
             show_error_dialog(self.page, "Delivery address is required")
             return 
         
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            
-            # Calculate total
-            total = sum(item[3] * item[4] for item in cart_items)
-            
-            # Create order
-            cursor.execute(
-                "INSERT INTO orders (user_id, total_amount) VALUES (?, ?)",
-                (user_id, total)
-            )
-            order_id = cursor.lastrowid
-            
-            # Add order items
-            for item in cart_items:
-                cursor.execute(
-                    """INSERT INTO order_items 
-                    (order_id, food_item_id, quantity, price_at_order) 
-                    VALUES (?, ?, ?, ?)""",
-                    (order_id, item[0], item[4], item[3])
-                )
-            
-            # Clear cart
-            cursor.execute("DELETE FROM cart_items WHERE user_id=?", (user_id,))
-            
-            conn.commit()
+            # Write pending cart edits first so the database cart matches what was shown
+            cart_store.flush()
+            # Creates the order and its lines and clears the cart in one transaction.
+            # A repeated tap gets the same order back (the cart is empty by then).
+            repository.place_order(user_id, self.checkout_key)
+            cart_store.forget(user_id)
+            self.view_cache.invalidate("cart")
             show_success_dialog(self.page, "Order placed successfully!")
             self.page.go("/user_dashboard")
             
+        except exception.OrderError as e:
+            show_error_dialog(self.page, str(e))
         except Exception as e:
-            conn.rollback()
             show_error_dialog(self.page, f"Order failed: {str(e)}")
             raise OrderError(f"Order processing error: {str(e)}")
-        finally:
-            conn.close()
     
     def order_history_view(self):
         user_id = helper_function.get_current_user_id(self.page)
@@ -909,37 +754,12 @@ class CanteenApp:
             return
 
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, order_date, status, total_amount 
-                FROM orders 
-                WHERE user_id=?
-                ORDER BY order_date DESC
-            """, (user_id,))
-            orders = cursor.fetchall()
-
-            order_list = ft.ListView(expand=1)
-            for order in orders:
-                status_color = {
-                    'pending': ft.colors.ORANGE,
-                    'accepted': ft.colors.BLUE,
-                    'prepared': ft.colors.PURPLE,
-                    'delivered': ft.colors.GREEN,
-                    'rejected': ft.colors.RED
-                }.get(order[2], ft.colors.GREY)
-                
-                order_list.controls.append(
-                    ft.ListTile(
-                        title=ft.Text(f"Order #{order[0]}"),
-                        subtitle=ft.Column([
-                            ft.Text(f"Date: {order[1]}"),
-                            ft.Text(f"Total: ${order[3]:.2f}"),
-                            ft.Text(f"Status: {order[2]}", color=status_color)
-                        ]),
-                        on_click=lambda e, oid=order[0]: self.show_order_details(oid)
-                    )
-                )
+            # First page only; the rest loads as the list is scrolled
+            self.order_history = OrderHistoryList(
+                user_id, on_open=lambda order_id: self.page.go(f"/order_details/{order_id}")
+            )
+            self.order_history.load_more(update=False)
+            order_list = self.order_history.list_view
             
             self.page.views.append(
                 ft.View(
@@ -954,32 +774,22 @@ class CanteenApp:
             
         except Exception as e:
             show_error_dialog(self.page, f"Failed to load orders: {str(e)}")
-        finally:
-            conn.close()
     
     def show_order_details(self, order_id):
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            
-            # Get order info
-            cursor.execute("""
-                SELECT o.order_date, o.status, o.total_amount, u.username 
-                FROM orders o
-                JOIN users u ON o.user_id = u.id
-                WHERE o.id=?
-            """, (order_id,))
-            order_info = cursor.fetchone()
-            
-            # Get order items
-            cursor.execute("""
-                SELECT fi.name, oi.quantity, oi.price_at_order 
-                FROM order_items oi
-                JOIN food_items fi ON oi.food_item_id = fi.id
-                WHERE oi.order_id=?
-            """, (order_id,))
-            order_items = cursor.fetchall()
-            
+            # Header and items, usually already prefetched by the history list
+            history = getattr(self, "order_history", None)
+            if history is not None:
+                order_info, order_items = history.details(order_id)
+            else:
+                order_info, order_items = order_cache.get(order_id)
+
+            # The route takes any id: other users' orders do not exist here
+            if order_info is None or order_info[4] != helper_function.get_current_user_id(self.page):
+                self.page.views.append(self.not_found_view(f"/order_details/{order_id}"))
+                self.page.update()
+                return
+
             # Create order summary
             order_summary = ft.Column()
             for item in order_items:
@@ -987,22 +797,14 @@ class CanteenApp:
                     ft.Text(f"{item[0]} x {item[1]} = ${item[1] * item[2]:.2f}")
                 )
             
-            status_color = {
-                'pending': ft.colors.ORANGE,
-                'accepted': ft.colors.BLUE,
-                'prepared': ft.colors.PURPLE,
-                'delivered': ft.colors.GREEN,
-                'rejected': ft.colors.RED
-            }.get(order_info[1], ft.colors.GREY)
-            
             self.page.views.append(
                 ft.View(
-                    "/order_details/{order_id}",
+                    f"/order_details/{order_id}",
                     [
                         ft.AppBar(title=ft.Text(f"Order #{order_id}")),
                         ft.Text(f"Customer: {order_info[3]}"),
                         ft.Text(f"Date: {order_info[0]}"),
-                        ft.Text(f"Status: {order_info[1]}", color=status_color),
+                        ft.Text(f"Status: {order_info[1]}", color=order_status_color(order_info[1])),
                         ft.Text(f"Total: ${order_info[2]:.2f}", size=16, weight=ft.FontWeight.BOLD),
                         ft.Divider(),
                         ft.Text("Items:", size=14, weight=ft.FontWeight.BOLD),
@@ -1016,119 +818,73 @@ class CanteenApp:
             
         except Exception as e:
             show_error_dialog(self.page, f"Failed to load order details: {str(e)}")
-        finally:
-            conn.close()
 
     def show_reviews(self, food_id):
-        # Implement reviews display
-        show_error_dialog(self.page, "Reviews feature not implemented yet")
-    
-    #Admin Dashboard Views
-    def admin_dashboard_view(self):
-        stats = self.get_admin_stats()
-        
-        stats_row = ft.Row([
-            ft.Card(
-                content=ft.Container(
-                    content=ft.Column([
-                        ft.Text("Total Orders", size=16),
-                        ft.Text(stats['total_orders'], size=24, weight=ft.FontWeight.BOLD)
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    width=150,
-                    height=150
-                )
-            ),
-            ft.Card(
-                content=ft.Container(
-                    content=ft.Column([
-                        ft.Text("Pending Orders", size=16),
-                        ft.Text(stats['pending_orders'], size=24, weight=ft.FontWeight.BOLD)
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    width=150,
-                    height=150
-                )
-            ),
-            ft.Card(
-                content=ft.Container(
-                    content=ft.Column([
-                        ft.Text("Total Food Items", size=16),
-                        ft.Text(stats['total_food_items'], size=24, weight=ft.FontWeight.BOLD)
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    width=150,
-                    height=150
-                )
-            ),
-            ft.Card(
-                content=ft.Container(
-                    content=ft.Column([
-                        ft.Text("Total Customers", size=16),
-                        ft.Text(stats['total_customers'], size=24, weight=ft.FontWeight.BOLD)
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    width=150,
-                    height=150
+        try:
+            food_item = catalog.food_item(food_id)
+            avg_rating, review_count = repository.get_rating_summary(food_id)
+            # First page from the per-item cache; the rest loads on scroll
+            self.review_list = ReviewList(food_id)
+            self.review_list.load_more(update=False)
+
+            controls = [
+                ft.AppBar(title=ft.Text(f"Reviews: {food_item[1]}" if food_item else "Reviews")),
+                ft.Text(f"{avg_rating:.1f} out of 5 ({review_count} reviews)", size=16, weight=ft.FontWeight.BOLD),
+            ]
+
+            # Only students with a delivered, unreviewed order of this item may write one
+            user_id = helper_function.get_current_user_id(self.page)
+            if user_id and repository.get_reviewable_order(user_id, food_id):
+                self.review_rating = ft.Dropdown(
+                    label="Rating",
+                    width=120,
+                    value="5",
+                    options=[ft.dropdown.Option(str(i)) for i in range(5, 0, -1)]
                 )
-            )
-        ], spacing=20, wrap=True)
-        
-        quick_actions = ft.Row([
-            ft.ElevatedButton(
-                "Manage Categories",
-                icon=ft.icons.CATEGORY,
-                on_click=lambda _: self.page.go("/food_categories")
-            ),
-            ft.ElevatedButton(
-                "Manage Food Items",
-                icon=ft.icons.RESTAURANT,
-                on_click=lambda _: self.page.go("/manage_food")
-            ),
-            ft.ElevatedButton(
-                "View Orders",
-                icon=ft.icons.LIST_ALT,
-                on_click=lambda _: self.page.go("/view_orders")
-            )
-        ], spacing=10)
-        
-        self.page.views.append(
-            ft.View(
-                "/admin_dashboard",
-                [
-                    ft.AppBar(
-                        title=ft.Text("Admin Dashboard"),
-                        actions=[
-                            ft.PopupMenuButton(
-                                items=[
-                                    ft.PopupMenuItem(
-                                        text="Profile",
-                                        icon=ft.icons.PERSON,
-                                        on_click=lambda _: self.page.go("/profile")
-                                    ),
-                                    ft.PopupMenuItem(
-                                        text="Logout",
-                                        icon=ft.icons.LOGOUT,
-                                        on_click=self.logout
-                                    )
-                                ]
-                            )
-                        ]
+                self.review_comment = ft.TextField(label="Your review", multiline=True, max_lines=4, width=400)
+                controls += [
+                    ft.Row([self.review_rating, self.review_comment]),
+                    ft.ElevatedButton(
+                        "Post Review",
+                        on_click=lambda e: self.submit_review(food_id),
+                        width=200
                     ),
-                    ft.Text("Overview", size=20),
-                    stats_row,
                     ft.Divider(),
-                    ft.Text("Quick Actions", size=20),
-                    quick_actions
-                ],
-                scroll=ft.ScrollMode.AUTO
-            )
-        )
+                ]
+
+            if not self.review_list.list_view.controls:
+                controls.append(ft.Text("No reviews yet"))
+            controls.append(self.review_list.list_view)
+
+            self.page.views.append(ft.View(f"/reviews/{food_id}", controls))
+            self.page.update()
+        except Exception as e:
+            show_error_dialog(self.page, f"Failed to load reviews: {str(e)}")
+
+    def submit_review(self, food_id):
+        user_id = helper_function.get_current_user_id(self.page)
+        if not user_id:
+            show_error_dialog(self.page, "Please login to post a review")
+            return
+        try:
+            reviews.post_review(user_id, food_id, int(self.review_rating.value), self.review_comment.value.strip())
+            self.view_cache.invalidate("reviews")
+            show_success_dialog(self.page, "Thanks for your review!")
+            # Rebuild the screen so the new review and rating show up
+            self.page.views.pop()
+            self.page.go(f"/reviews/{food_id}")
+        except exception.ReviewError as e:
+            show_error_dialog(self.page, str(e))
+        except Exception as e:
+            show_error_dialog(self.page, f"Failed to post review: {str(e)}")
     
+    #Admin Dashboard Views
+    # Built by admin_screens, imported on the first admin route so student
+    # sessions never load the admin screens or the order queue
+    def admin_dashboard_view(self):
+        import admin_screens
+        self.page.views.append(admin_screens.dashboard_view(self.page, on_logout=self.logout))
+
     def add_category_dialog(self, e):
         pass
     def edit_category_dialog(self, e):
@@ -1158,41 +914,27 @@ class CanteenApp:
     def delete_food_item(self, e):
         pass
     def view_orders_view(self):
-        pass
+        import admin_screens
+        try:
+            self.order_queue = admin_screens.open_order_queue(self.page, on_status=self.update_order_status)
+            self.page.views.append(admin_screens.orders_view(self.order_queue))
+            self.page.update()
+
+        except Exception as e:
+            show_error_dialog(self.page, f"Failed to load orders: {str(e)}")
     def update_order_status(self, e):
-        pass
+        order_id, status = e.control.data
+        try:
+            # The queue tile changes when the status event comes back
+            repository.update_order_status(order_id, status)
+        except exception.OrderError as e:
+            show_error_dialog(self.page, str(e))
+        except Exception as e:
+            show_error_dialog(self.page, f"Failed to update order: {str(e)}")
     def profile_view(self):
         pass
     def update_password(self, e):
         pass
-    def get_admin_stats(self) -> Dict:
-        try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM orders")
-            total_orders = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM orders WHERE status='pending'")
-            pending_orders = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM food_items")
-            total_food_items = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM users WHERE is_admin=0")
-            total_customers = cursor.fetchone()[0]
-            
-            return {
-                'total_orders': total_orders,
-                'pending_orders': pending_orders,
-                'total_food_items': total_food_items,
-                'total_customers': total_customers
-            }
-        except Exception as e:
-            show_error_dialog(self.page, str(e))
-            return {}
-        finally:
-            conn.close()
 
     # Authentication methods
     def login(self, e):
@@ -1203,22 +945,39 @@ class CanteenApp:
             show_error_dialog(self.page, "Username and password are required")
             return
         
-        conn = None
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT id, password, is_admin FROM users WHERE username=?",
-                (username,)
-            )
-            user = cursor.fetchone()
-
+            user = repository.get_user_credentials(username)
             if not user:
                 raise AuthError("Invalid username or password")
-            if not helper_function.verify_password(user[1], password):
+        except AuthError as e:
+            show_error_dialog(self.page, str(e))
+            return
+        except Exception as e:
+            show_error_dialog(self.page, "An error occurred during login")
+            print(f"Login error: {str(e)}")
+            return
+
+        # Only scrypt runs on the hashing pool; the login finishes back on a
+        # session thread, so this handler thread is free again right away
+        passwords.submit_hashing(passwords.verify_password, user[1], password).add_done_callback(
+            lambda future: self.page.run_thread(self.finish_login, future, user, password)
+        )
+
+    def finish_login(self, verified, user, password):
+        """Rest of login, on a session thread once the password was checked"""
+        try:
+            if not verified.result():
                 raise AuthError("Invalid username or password")
+
+            # Upgrade legacy SHA-256 / old-cost hashes now that we know the
+            # password; hashed on the pool, saved without holding up the login
+            if passwords.needs_rehash(user[1]):
+                passwords.submit_hashing(passwords.hash_password, password).add_done_callback(
+                    lambda future: self.page.run_thread(self.save_rehash, future, user[0])
+                )
             
-            # Store user session
+            # Store user session; views built for another user are not reused
+            self.view_cache.clear()
             self.page.client_storage.set("user_id", user[0])
             self.page.client_storage.set("is_admin", bool(user[2]))
 
@@ -1232,9 +991,12 @@ class CanteenApp:
         except Exception as e:
             show_error_dialog(self.page, "An error occurred during login")
             print(f"Login error: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+
+    def save_rehash(self, hashed, user_id):
+        try:
+            repository.update_password_hash(user_id, hashed.result())
+        except Exception as e:
+            print(f"Password rehash failed: {str(e)}")
 
     def register(self, e):
         username = self.register_username.value
@@ -1251,15 +1013,15 @@ class CanteenApp:
             show_error_dialog(self.page, "Passwords don't match")
             return
 
+        # Hashed on the hashing pool; the account is created back on a session thread
+        passwords.submit_hashing(passwords.hash_password, password).add_done_callback(
+            lambda future: self.page.run_thread(self.finish_register, future, username, email, phone)
+        )
+
+    def finish_register(self, hashed, username, email, phone):
+        """Rest of register, on a session thread once the password was hashed"""
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            hashed_password = helper_function.hash_password(password)
-            cursor.execute(
-                "INSERT INTO users (username, email, phone, password) VALUES (?, ?, ?, ?)",
-                (username, email, phone, hashed_password)
-            )
-            conn.commit()
+            repository.create_user(username, email, phone, hashed.result())
 
             show_success_dialog(self.page, "Registration successful! Please login.")
             self.page.go("/")
@@ -1274,13 +1036,11 @@ class CanteenApp:
         
         except Exception as e:
             show_error_dialog(self.page, str(e))
-        finally:
-            if conn:
-                conn.close()
     
     def logout(self, e):
         self.page.client_storage.remove("user_id")
         self.page.client_storage.remove("is_admin")
+        self.view_cache.clear()
         self.page.go("/")
     
     def get_cart_items(self) -> List[Tuple]:
@@ -1289,23 +1049,22 @@ class CanteenApp:
             return []
         
         try:
-            conn = sqlite3.connect('canteen.db')
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT fi.id, fi.name, fi.description, fi.price, ci.quantity, fi.image_path
-                FROM cart_items ci
-                JOIN food_items fi ON ci.food_item_id = fi.id
-                WHERE ci.user_id=?
-            ''', (user_id,))
-            return cursor.fetchall()
+            return cart_store.get_cart_items(user_id)
         except Exception as e:
             show_error_dialog(self.page, str(e))
             return []
-        finally:
-            conn.close()
 
 def main(page: ft.Page):
+    # Creates or upgrades the schema only when PRAGMA user_version is behind
+    database.bootstrap()
+    # Start rendering image variants in the background (no-op once done);
+    # queued from a thread so the first view is not held up by the pool.
+    # Imported here so `import main` does not load the pipeline
+    from image_pipeline import pipeline
+    pipeline.warm_up_in_background()
     app = CanteenApp(page)
 
-ft.app(target=main)
+# Guarded so image pipeline worker processes can import this module safely
+if __name__ == "__main__":
+    ft.app(target=main)
 
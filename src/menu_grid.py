@@ -0,0 +1,130 @@
+import flet as ft
+from typing import Callable, Dict, List, Tuple
+
+from helper_function import get_image_path
+
+# Cards put on the grid at once; more are appended as the user scrolls
+GRID_PAGE_SIZE = 60
+# Load the next page when the scroll position is this close (px) to the end
+SCROLL_LOAD_THRESHOLD = 600
+
+def build_food_card(item: Tuple, on_open: Callable[[int], None]) -> ft.Control:
+    return ft.GestureDetector(
+        mouse_cursor=ft.MouseCursor.CLICK,
+        on_tap=lambda e, item_id=item[0]: on_open(item_id),
+        content=ft.Card(
+            elevation=8,
+            margin=10,
+            content=ft.Container(
+                width=180,
+                height=220,
+                padding=10,
+                content=ft.Column(
+                    [
+                        ft.Container(
+                            width=160,
+                            height=120,
+                            border_radius=10,
+                            content=ft.Image(
+                                src=get_image_path(item[5], "grid"),
+                                fit=ft.ImageFit.FILL,
+                                width=160,
+                                height=120,
+                            ),
+                            bgcolor=ft.Colors.GREY_200,
+                        ),
+                        ft.Column(
+                            [
+                                ft.Text(
+                                    item[1],
+                                    size=14,
+                                    weight=ft.FontWeight.BOLD,
+                                    text_align=ft.TextAlign.CENTER,
+                                    width=160,
+                                    max_lines=2,
+                                    overflow=ft.TextOverflow.ELLIPSIS,
+                                ),
+                                ft.Text(
+                                    f"${item[3]:.2f}",
+                                    size=14,
+                                    color=ft.Colors.GREEN_700,
+                                    text_align=ft.TextAlign.CENTER,
+                                ),
+                            ],
+                            spacing=5,
+                            alignment=ft.MainAxisAlignment.CENTER,
+                            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                        ),
+                        ft.ElevatedButton(
+                            "View Details",
+                            on_click=lambda e, item_id=item[0]: on_open(item_id),
+                            width=160,
+                            height=30,
+                        ),
+                    ],
+                    spacing=8,
+                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                ),
+            ),
+        ),
+    )
+
+#Menu grid
+class FoodGrid:
+    """Dashboard food grid backed by a pool of cards keyed by food item id.
+
+    Showing a new list of items reuses the card already built for each id,
+    so Flet's diff only sends the cards that were added, removed or moved
+    instead of re-serializing the whole grid. Only the first
+    GRID_PAGE_SIZE cards are placed up front; the rest are appended as the
+    user scrolls towards the end.
+    """
+
+    def __init__(self, page: ft.Page, on_open: Callable[[int], None], page_size: int = GRID_PAGE_SIZE):
+        self.page = page
+        self.on_open = on_open
+        self.page_size = page_size
+        self._cards: Dict[int, Tuple[Tuple, ft.Control]] = {}
+        self._items: List[Tuple] = []
+        self.cards_built = 0
+        self.grid = ft.GridView(
+            expand=True,
+            runs_count=3,
+            max_extent=200,
+            child_aspect_ratio=0.85,
+            spacing=10,
+            run_spacing=15,
+            padding=20,
+            on_scroll_interval=100,
+            on_scroll=self._on_scroll
+        )
+
+    def _card(self, item: Tuple) -> ft.Control:
+        cached = self._cards.get(item[0])
+        # Rebuild only when the row itself changed (e.g. a new price)
+        if cached is None or cached[0] != item:
+            cached = (item, build_food_card(item, self.on_open))
+            self._cards[item[0]] = cached
+            self.cards_built += 1
+        return cached[1]
+
+    def show(self, items: List[Tuple], update: bool = True):
+        self._items = items
+        self.grid.controls[:] = [self._card(item) for item in items[:self.page_size]]
+        if update and self.grid.page:
+            self.grid.update()
+
+    def load_more(self) -> bool:
+        shown = len(self.grid.controls)
+        if shown >= len(self._items):
+            return False
+        self.grid.controls.extend(
+            self._card(item) for item in self._items[shown:shown + self.page_size]
+        )
+        if self.grid.page:
+            self.grid.update()
+        return True
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - SCROLL_LOAD_THRESHOLD:
+            self.load_more()
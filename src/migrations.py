@@ -0,0 +1,439 @@
+import sqlite3
+from typing import List, Tuple
+
+#Schema migrations
+# Ordered (version, description, statements). Append new entries at the end
+# and never edit one that has shipped: databases in the field have already
+# recorded it in schema_version.
+MIGRATIONS = [
+    (1, "cart_items table", [
+        '''
+        CREATE TABLE IF NOT EXISTS cart_items (
+            user_id INTEGER NOT NULL,
+            food_item_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (user_id, food_item_id),
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            FOREIGN KEY (food_item_id) REFERENCES food_items(id)
+        )''',
+    ]),
+    (2, "indexes for the hot query paths", [
+        # Menu tabs: WHERE category_id=? AND available=1 / WHERE available=1
+        "CREATE INDEX IF NOT EXISTS idx_food_items_category ON food_items(category_id, available)",
+        "CREATE INDEX IF NOT EXISTS idx_food_items_available ON food_items(available)",
+        # Order history: WHERE user_id=? ORDER BY order_date DESC (covering)
+        "CREATE INDEX IF NOT EXISTS idx_orders_user_date ON orders(user_id, order_date, status, total_amount)",
+        # Order details lines (covering)
+        "CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id, food_item_id, quantity, price_at_order)",
+        # Rating summary: AVG(rating), COUNT(*) WHERE food_item_id=? (covering)
+        "CREATE INDEX IF NOT EXISTS idx_reviews_food ON reviews(food_item_id, rating)",
+    ]),
+    (3, "full-text search index for the menu", [
+        # External-content FTS5 table: stores only the index, rows live in food_items
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS food_items_fts USING fts5(
+            name, description,
+            content='food_items', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS food_items_fts_insert AFTER INSERT ON food_items BEGIN
+            INSERT INTO food_items_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS food_items_fts_delete AFTER DELETE ON food_items BEGIN
+            INSERT INTO food_items_fts(food_items_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS food_items_fts_update AFTER UPDATE OF name, description ON food_items BEGIN
+            INSERT INTO food_items_fts(food_items_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO food_items_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        END''',
+        "INSERT INTO food_items_fts(food_items_fts) VALUES ('rebuild')",
+        # Term list used for typo-tolerant fallback searches
+        "CREATE VIRTUAL TABLE IF NOT EXISTS food_items_vocab USING fts5vocab(food_items_fts, 'row')",
+    ]),
+    (4, "idempotency keys for checkout", [
+        # One key per checkout screen; NULL for orders placed before this
+        "ALTER TABLE orders ADD COLUMN idempotency_key TEXT",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_orders_idempotency_key ON orders(idempotency_key)",
+    ]),
+    (5, "keyset index for order history pages", [
+        # WHERE user_id=? AND (order_date, id) < (?, ?) ORDER BY order_date DESC, id DESC (covering)
+        "CREATE INDEX IF NOT EXISTS idx_orders_user_date_id ON orders(user_id, order_date, id, status, total_amount)",
+        "DROP INDEX IF EXISTS idx_orders_user_date",
+    ]),
+    (6, "denormalized order snapshots", [
+        # Header and lines of an order as one JSON document, written by
+        # repository.place_order; read back with a single primary key lookup
+        '''
+        CREATE TABLE IF NOT EXISTS order_snapshots (
+            order_id INTEGER PRIMARY KEY,
+            snapshot TEXT NOT NULL,
+            FOREIGN KEY (order_id) REFERENCES orders(id)
+        )''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS order_snapshots_status AFTER UPDATE OF status, total_amount ON orders BEGIN
+            UPDATE order_snapshots
+            SET snapshot = json_set(snapshot, '$.status', new.status, '$.total_amount', new.total_amount)
+            WHERE order_id = new.id;
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS order_snapshots_delete AFTER DELETE ON orders BEGIN
+            DELETE FROM order_snapshots WHERE order_id = old.id;
+        END''',
+        # Backfill existing orders
+        '''
+        INSERT OR REPLACE INTO order_snapshots (order_id, snapshot)
+        SELECT o.id, json_object(
+            'order_date', o.order_date,
+            'status', o.status,
+            'total_amount', o.total_amount,
+            'username', u.username,
+            'lines', (
+                SELECT json_group_array(json_array(name, quantity, price_at_order))
+                FROM (
+                    SELECT fi.name, oi.quantity, oi.price_at_order
+                    FROM order_items oi
+                    JOIN food_items fi ON oi.food_item_id = fi.id
+                    WHERE oi.order_id = o.id
+                    ORDER BY oi.rowid
+                )
+            )
+        )
+        FROM orders o
+        JOIN users u ON o.user_id = u.id''',
+    ]),
+    (7, "review aggregates per food item", [
+        # Rating sum and count kept current by the triggers below, so the
+        # average rating of an item is one primary key read
+        '''
+        CREATE TABLE IF NOT EXISTS food_item_stats (
+            food_item_id INTEGER PRIMARY KEY,
+            rating_sum INTEGER NOT NULL DEFAULT 0,
+            rating_count INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (food_item_id) REFERENCES food_items(id)
+        )''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS food_item_stats_insert AFTER INSERT ON reviews BEGIN
+            INSERT INTO food_item_stats (food_item_id, rating_sum, rating_count)
+            VALUES (new.food_item_id, new.rating, 1)
+            ON CONFLICT (food_item_id) DO UPDATE SET
+                rating_sum = rating_sum + excluded.rating_sum,
+                rating_count = rating_count + 1;
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS food_item_stats_delete AFTER DELETE ON reviews BEGIN
+            UPDATE food_item_stats
+            SET rating_sum = rating_sum - old.rating, rating_count = rating_count - 1
+            WHERE food_item_id = old.food_item_id;
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS food_item_stats_update AFTER UPDATE OF rating, food_item_id ON reviews BEGIN
+            UPDATE food_item_stats
+            SET rating_sum = rating_sum - old.rating, rating_count = rating_count - 1
+            WHERE food_item_id = old.food_item_id;
+            INSERT INTO food_item_stats (food_item_id, rating_sum, rating_count)
+            VALUES (new.food_item_id, new.rating, 1)
+            ON CONFLICT (food_item_id) DO UPDATE SET
+                rating_sum = rating_sum + excluded.rating_sum,
+                rating_count = rating_count + 1;
+        END''',
+        # Backfill from the existing reviews
+        '''
+        INSERT OR REPLACE INTO food_item_stats (food_item_id, rating_sum, rating_count)
+        SELECT food_item_id, SUM(rating), COUNT(*) FROM reviews GROUP BY food_item_id''',
+    ]),
+    (8, "review pages and review eligibility", [
+        # Reviews screen: WHERE food_item_id=? AND (review_date, id) < (?, ?)
+        # ORDER BY review_date DESC, id DESC. Ratings now come from
+        # food_item_stats, so the old rating index is no longer read.
+        "CREATE INDEX IF NOT EXISTS idx_reviews_food_date ON reviews(food_item_id, review_date, id)",
+        "DROP INDEX IF EXISTS idx_reviews_food",
+        # One row per delivered order line that has not been reviewed yet.
+        # "May this user review this item?" is a primary key lookup here.
+        '''
+        CREATE TABLE IF NOT EXISTS reviewable_items (
+            user_id INTEGER NOT NULL,
+            food_item_id INTEGER NOT NULL,
+            order_id INTEGER NOT NULL,
+            PRIMARY KEY (user_id, food_item_id, order_id),
+            FOREIGN KEY (order_id) REFERENCES orders(id)
+        ) WITHOUT ROWID''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reviewable_items_delivered
+        AFTER UPDATE OF status ON orders
+        WHEN new.status = 'delivered' AND old.status IS NOT 'delivered' BEGIN
+            INSERT OR IGNORE INTO reviewable_items (user_id, food_item_id, order_id)
+            SELECT new.user_id, oi.food_item_id, new.id
+            FROM order_items oi
+            WHERE oi.order_id = new.id
+              AND NOT EXISTS (
+                  SELECT 1 FROM reviews r
+                  WHERE r.order_id = new.id AND r.food_item_id = oi.food_item_id
+              );
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reviewable_items_undelivered
+        AFTER UPDATE OF status ON orders
+        WHEN old.status = 'delivered' AND new.status IS NOT 'delivered' BEGIN
+            DELETE FROM reviewable_items WHERE user_id = old.user_id AND order_id = old.id;
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reviewable_items_order_delete AFTER DELETE ON orders BEGIN
+            DELETE FROM reviewable_items WHERE user_id = old.user_id AND order_id = old.id;
+        END''',
+        # Backfill from delivered orders
+        '''
+        INSERT OR IGNORE INTO reviewable_items (user_id, food_item_id, order_id)
+        SELECT o.user_id, oi.food_item_id, o.id
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id
+        WHERE o.status = 'delivered'
+          AND NOT EXISTS (
+              SELECT 1 FROM reviews r
+              WHERE r.order_id = o.id AND r.food_item_id = oi.food_item_id
+          )''',
+    ]),
+    (9, "counters for the admin dashboard", [
+        # The four admin dashboard numbers, kept current by triggers so the
+        # dashboard reads four rows instead of counting whole tables
+        '''
+        CREATE TABLE IF NOT EXISTS app_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        ) WITHOUT ROWID''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS app_counters_order_insert AFTER INSERT ON orders BEGIN
+            UPDATE app_counters SET value = value + 1 WHERE name = 'total_orders';
+            UPDATE app_counters SET value = value + (new.status IS 'pending') WHERE name = 'pending_orders';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS app_counters_order_delete AFTER DELETE ON orders BEGIN
+            UPDATE app_counters SET value = value - 1 WHERE name = 'total_orders';
+            UPDATE app_counters SET value = value - (old.status IS 'pending') WHERE name = 'pending_orders';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS app_counters_order_status AFTER UPDATE OF status ON orders
+        WHEN (new.status IS 'pending') != (old.status IS 'pending') BEGIN
+            UPDATE app_counters
+            SET value = value + (new.status IS 'pending') - (old.status IS 'pending')
+            WHERE name = 'pending_orders';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS app_counters_food_insert AFTER INSERT ON food_items BEGIN
+            UPDATE app_counters SET value = value + 1 WHERE name = 'total_food_items';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS app_counters_food_delete AFTER DELETE ON food_items BEGIN
+            UPDATE app_counters SET value = value - 1 WHERE name = 'total_food_items';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS app_counters_user_insert AFTER INSERT ON users BEGIN
+            UPDATE app_counters SET value = value + (new.is_admin IS 0) WHERE name = 'total_customers';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS app_counters_user_delete AFTER DELETE ON users BEGIN
+            UPDATE app_counters SET value = value - (old.is_admin IS 0) WHERE name = 'total_customers';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS app_counters_user_admin AFTER UPDATE OF is_admin ON users BEGIN
+            UPDATE app_counters
+            SET value = value + (new.is_admin IS 0) - (old.is_admin IS 0)
+            WHERE name = 'total_customers';
+        END''',
+        # Backfill
+        '''
+        INSERT OR REPLACE INTO app_counters (name, value) VALUES
+            ('total_orders', (SELECT COUNT(*) FROM orders)),
+            ('pending_orders', (SELECT COUNT(*) FROM orders WHERE status='pending')),
+            ('total_food_items', (SELECT COUNT(*) FROM food_items)),
+            ('total_customers', (SELECT COUNT(*) FROM users WHERE is_admin=0))''',
+    ]),
+    (10, "index for the admin order queue", [
+        # Open orders are a small slice of orders: three index ranges
+        "CREATE INDEX IF NOT EXISTS idx_orders_status_id ON orders(status, id)",
+    ]),
+    (11, "owner of each order snapshot", [
+        # The order details route takes any id: the owner is checked
+        # against the snapshot without another read
+        '''
+        UPDATE order_snapshots
+        SET snapshot = json_set(snapshot, '$.user_id', (SELECT user_id FROM orders WHERE id = order_id))''',
+    ]),
+    (12, "menu version for the catalog cache", [
+        # Bumped by every change to the menu tables and nothing else, so the
+        # catalog cache only reloads when the menu itself changed
+        "INSERT OR IGNORE INTO app_counters (name, value) VALUES ('menu_version', 0)",
+        '''
+        CREATE TRIGGER IF NOT EXISTS menu_version_food_items_insert AFTER INSERT ON food_items BEGIN
+            UPDATE app_counters SET value = value + 1 WHERE name = 'menu_version';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS menu_version_food_items_update AFTER UPDATE ON food_items BEGIN
+            UPDATE app_counters SET value = value + 1 WHERE name = 'menu_version';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS menu_version_food_items_delete AFTER DELETE ON food_items BEGIN
+            UPDATE app_counters SET value = value + 1 WHERE name = 'menu_version';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS menu_version_categories_insert AFTER INSERT ON categories BEGIN
+            UPDATE app_counters SET value = value + 1 WHERE name = 'menu_version';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS menu_version_categories_update AFTER UPDATE ON categories BEGIN
+            UPDATE app_counters SET value = value + 1 WHERE name = 'menu_version';
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS menu_version_categories_delete AFTER DELETE ON categories BEGIN
+            UPDATE app_counters SET value = value + 1 WHERE name = 'menu_version';
+        END''',
+    ]),
+    (13, "drop the index on food_items.available", [
+        # Nearly every item is available: "menu all" reads the table faster
+        # than the index plus a row lookup per item (see ACCEPTED_SCANS)
+        "DROP INDEX IF EXISTS idx_food_items_available",
+    ]),
+]
+
+def current_version(conn: sqlite3.Connection) -> int:
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )''')
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """Apply every migration newer than the recorded schema version.
+
+    Each migration runs in its own transaction together with its
+    schema_version row, so a failure leaves the database at the last
+    fully applied version. Returns the versions applied.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    version = current_version(conn)
+    applied = []
+    for number, description, statements in MIGRATIONS:
+        if number <= version:
+            continue
+        try:
+            conn.execute("BEGIN")
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (number, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(number)
+    return applied
+
+#Query plan check
+# The queries behind the menu, cart, order history/details, rating and
+# admin screens, with sample parameters. None of them may scan a table,
+# except those listed in ACCEPTED_SCANS.
+HOT_QUERIES = {
+    "menu by category": ("SELECT * FROM food_items WHERE category_id=? AND available=1", (1,)),
+    "menu all": ("SELECT * FROM food_items WHERE available=1", ()),
+    "food item": ("SELECT * FROM food_items WHERE id=?", (1,)),
+    "cart quantity": ("SELECT quantity FROM cart_items WHERE user_id=? AND food_item_id=?", (1, 1)),
+    "cart items": ('''
+        SELECT fi.id, fi.name, fi.description, fi.price, ci.quantity, fi.image_path
+        FROM cart_items ci
+        JOIN food_items fi ON ci.food_item_id = fi.id
+        WHERE ci.user_id=?
+    ''', (1,)),
+    "order history": ('''
+        SELECT id, order_date, status, total_amount
+        FROM orders
+        WHERE user_id=?
+        ORDER BY order_date DESC, id DESC
+        LIMIT ?
+    ''', (1, 30)),
+    "order history next page": ('''
+        SELECT id, order_date, status, total_amount
+        FROM orders
+        WHERE user_id=? AND (order_date, id) < (?, ?)
+        ORDER BY order_date DESC, id DESC
+        LIMIT ?
+    ''', (1, "2025-01-01 00:00:00", 1, 30)),
+    "order lines": ('''
+        SELECT fi.name, oi.quantity, oi.price_at_order
+        FROM order_items oi
+        JOIN food_items fi ON oi.food_item_id = fi.id
+        WHERE oi.order_id=?
+    ''', (1,)),
+    "order by idempotency key": ("SELECT id FROM orders WHERE idempotency_key=?", ("key",)),
+    "order snapshot": ("SELECT snapshot FROM order_snapshots WHERE order_id=?", (1,)),
+    "menu version": ("SELECT value FROM app_counters WHERE name=?", ("menu_version",)),
+    "reviews first page": ('''
+        SELECT r.id, r.rating, r.comment, r.review_date, u.username
+        FROM reviews r
+        JOIN users u ON r.user_id = u.id
+        WHERE r.food_item_id=?
+        ORDER BY r.review_date DESC, r.id DESC
+        LIMIT ?
+    ''', (1, 20)),
+    "reviews next page": ('''
+        SELECT r.id, r.rating, r.comment, r.review_date, u.username
+        FROM reviews r
+        JOIN users u ON r.user_id = u.id
+        WHERE r.food_item_id=? AND (r.review_date, r.id) < (?, ?)
+        ORDER BY r.review_date DESC, r.id DESC
+        LIMIT ?
+    ''', (1, "2025-01-01 00:00:00", 1, 20)),
+    "review eligibility": (
+        "SELECT order_id FROM reviewable_items WHERE user_id=? AND food_item_id=? LIMIT 1", (1, 1)
+    ),
+    "admin stats": (
+        "SELECT name, value FROM app_counters WHERE name IN (?, ?, ?, ?)",
+        ('total_orders', 'pending_orders', 'total_food_items', 'total_customers')
+    ),
+    "admin order queue": ('''
+        SELECT o.id, o.order_date, o.status, o.total_amount, u.username
+        FROM orders o
+        JOIN users u ON o.user_id = u.id
+        WHERE o.status IN ('pending', 'accepted', 'prepared')
+        ORDER BY o.id DESC
+        LIMIT ?
+    ''', (100,)),
+    "rating summary": ("SELECT rating_sum, rating_count FROM food_item_stats WHERE food_item_id=?", (1,)),
+    "menu search": ('''
+        SELECT fi.*
+        FROM food_items_fts
+        JOIN food_items fi ON fi.id = food_items_fts.rowid
+        WHERE food_items_fts MATCH ? AND fi.available=1
+        ORDER BY bm25(food_items_fts, 10.0, 1.0)
+        LIMIT ?
+    ''', ('"burger"*', 50)),
+}
+
+# Hot queries that read (nearly) every row anyway, where a full scan is the
+# cheapest plan; query name -> why
+ACCEPTED_SCANS = {
+    "menu all": "every available item, and nearly every item is available",
+}
+
+def find_table_scans(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+    """Return (query name, plan step) for every hot query step that scans a
+    table, other than the ACCEPTED_SCANS"""
+    scans = []
+    for name, (sql, params) in HOT_QUERIES.items():
+        if name in ACCEPTED_SCANS:
+            continue
+        for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params):
+            detail = row[-1]
+            # "SCAN <fts table> VIRTUAL TABLE INDEX" is a full-text index lookup
+            if detail.startswith("SCAN") and "CONSTANT ROW" not in detail and "VIRTUAL TABLE INDEX" not in detail:
+                scans.append((name, detail))
+    return scans
@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import repository
+
+# Statuses after which an order never changes again
+CLOSED_STATUSES = ('delivered', 'rejected')
+# Closed orders kept in memory
+ORDER_CACHE_SIZE = 512
+
+#Order details cache
+class OrderCache:
+    """LRU cache of closed orders' details.
+
+    Delivered and rejected orders are immutable, so once read their
+    snapshot is kept here without any invalidation. Open orders are always
+    read from the database (one primary key lookup on order_snapshots)
+    because their status can still change.
+    """
+
+    def __init__(self, size: int = ORDER_CACHE_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._orders: "OrderedDict[int, Tuple[Optional[Tuple], List[Tuple]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, order_id: int) -> Tuple[Optional[Tuple], List[Tuple]]:
+        """(header, lines) of an order, as repository.get_order_details"""
+        with self._lock:
+            details = self._orders.get(order_id)
+            if details is not None:
+                self._orders.move_to_end(order_id)
+                self.hits += 1
+                return details
+            self.misses += 1
+
+        details = repository.get_order_details(order_id)
+        header = details[0]
+        if header is not None and header[1] in CLOSED_STATUSES:
+            with self._lock:
+                self._orders[order_id] = details
+                self._orders.move_to_end(order_id)
+                while len(self._orders) > self.size:
+                    self._orders.popitem(last=False)
+        return details
+
+    def clear(self):
+        with self._lock:
+            self._orders.clear()
+
+order_cache = OrderCache()
@@ -0,0 +1,45 @@
+import threading
+from typing import Callable, Dict, List, Tuple
+
+# Topic the admin order queue listens on (see admin_orders)
+ORDER_TOPIC = "orders"
+
+#Order events
+class OrderEventBus:
+    """In-process publish/subscribe for order changes.
+
+    repository.place_order and repository.update_order_status publish here
+    once their write has committed. An event is a dict with a 'type'
+    ('placed' or 'status') and the 'order' row as (id, order_date, status,
+    total_amount, username). Handlers run in the publishing thread, so they
+    should hand the event off rather than do slow work themselves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: List[Callable[[Dict], None]] = []
+        self.published = 0
+
+    def subscribe(self, handler: Callable[[Dict], None]):
+        with self._lock:
+            if handler not in self._handlers:
+                self._handlers.append(handler)
+
+    def unsubscribe(self, handler: Callable[[Dict], None]):
+        with self._lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def publish(self, event_type: str, order: Tuple):
+        event = {'type': event_type, 'order': order}
+        with self._lock:
+            handlers = list(self._handlers)
+            self.published += 1
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                # A broken subscriber must not fail the order that was just committed
+                print(f"Order event handler failed: {e}")
+
+order_events = OrderEventBus()
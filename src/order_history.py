@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import flet as ft
+
+import repository
+from order_cache import order_cache
+
+# Orders fetched per page; the next page loads as the user scrolls
+ORDER_PAGE_SIZE = repository.ORDER_HISTORY_PAGE_SIZE
+# Load the next page when the scroll position is this close (px) to the end
+SCROLL_LOAD_THRESHOLD = 400
+
+STATUS_COLORS = {
+    'pending': ft.Colors.ORANGE,
+    'accepted': ft.Colors.BLUE,
+    'prepared': ft.Colors.PURPLE,
+    'delivered': ft.Colors.GREEN,
+    'rejected': ft.Colors.RED
+}
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="canteen-prefetch")
+
+def status_color(status: str) -> str:
+    return STATUS_COLORS.get(status, ft.Colors.GREY)
+
+def build_order_tile(order: Tuple, on_open: Callable[[int], None],
+                     on_hover: Callable[[int], None]) -> ft.Control:
+    return ft.Container(
+        on_hover=lambda e, oid=order[0]: on_hover(oid) if e.data == "true" else None,
+        content=ft.ListTile(
+            title=ft.Text(f"Order #{order[0]}"),
+            subtitle=ft.Column([
+                ft.Text(f"Date: {order[1]}"),
+                ft.Text(f"Total: ${order[3]:.2f}"),
+                ft.Text(f"Status: {order[2]}", color=status_color(order[2]))
+            ]),
+            on_click=lambda e, oid=order[0]: on_open(oid)
+        )
+    )
+
+#Order history list
+class OrderHistoryList:
+    """A user's order history, loaded one keyset page at a time.
+
+    Only the first page is read and rendered when the screen opens; later
+    pages are appended as the list is scrolled towards its end. Details of
+    an order start loading in the background as soon as its tile is
+    hovered or clicked, so the details screen rarely waits on the database.
+    """
+
+    def __init__(self, user_id: int, on_open: Callable[[int], None], page_size: int = ORDER_PAGE_SIZE):
+        self.user_id = user_id
+        self.on_open = on_open
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._details_lock = threading.Lock()
+        self._last_key: Optional[Tuple[str, int]] = None
+        self._exhausted = False
+        self._details: Dict[int, Future] = {}
+        self.pages_loaded = 0
+        self.list_view = ft.ListView(
+            expand=1,
+            on_scroll_interval=100,
+            on_scroll=self._on_scroll
+        )
+
+    def load_more(self, update: bool = True) -> bool:
+        """Append the next page; False when there are no more orders"""
+        with self._lock:
+            if self._exhausted:
+                return False
+            orders = repository.get_order_history(self.user_id, self._last_key, self.page_size)
+            if len(orders) < self.page_size:
+                self._exhausted = True
+            if not orders:
+                return False
+            self._last_key = (orders[-1][1], orders[-1][0])
+            self.pages_loaded += 1
+            self.list_view.controls.extend(
+                build_order_tile(order, self._open, self.prefetch) for order in orders
+            )
+        if update and self.list_view.page:
+            self.list_view.update()
+        return True
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - SCROLL_LOAD_THRESHOLD:
+            self.load_more()
+
+    def prefetch(self, order_id: int) -> Future:
+        with self._details_lock:
+            future = self._details.get(order_id)
+            if future is None:
+                future = _prefetch_pool.submit(order_cache.get, order_id)
+                self._details[order_id] = future
+            return future
+
+    def _open(self, order_id: int):
+        self.prefetch(order_id)
+        self.on_open(order_id)
+
+    def details(self, order_id: int) -> Tuple[Optional[Tuple], List[Tuple]]:
+        """Header and lines of an order, from the prefetch when there is one.
+
+        A prefetch is used once: an open order's status can change before it
+        is opened again, so the next open reads through order_cache, which
+        only keeps closed orders.
+        """
+        future = self.prefetch(order_id)
+        with self._details_lock:
+            if self._details.get(order_id) is future:
+                del self._details[order_id]
+        return future.result()
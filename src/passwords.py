@@ -0,0 +1,72 @@
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+# scrypt cost for new hashes. Stored with every hash, so raising these only
+# affects new passwords; older hashes are upgraded on the next login.
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+# Concurrent hashes allowed; a login storm queues here instead of starving
+# every other session of CPU and memory (each scrypt call uses 128*N*r bytes)
+HASH_WORKERS = 2
+
+_PREFIX = "scrypt"
+_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="canteen-hash")
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p + 1024 * 1024, dklen=KEY_BYTES
+    )
+
+def _parse(stored: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    parts = stored.split("$")
+    if len(parts) != 6 or parts[0] != _PREFIX:
+        return None
+    try:
+        n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+        return n, r, p, base64.b64decode(parts[4]), base64.b64decode(parts[5])
+    except ValueError:
+        return None
+
+#Password hashing
+def hash_password(password: str, n: int = SCRYPT_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> str:
+    """Salted scrypt hash as "scrypt$n$r$p$salt$key" (cost stored per user)"""
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, n, r, p)
+    return f"{_PREFIX}${n}${r}${p}${_b64(salt)}${_b64(key)}"
+
+def verify_password(stored: str, password: str) -> bool:
+    parsed = _parse(stored)
+    if parsed is None:
+        # Legacy rows: unsalted SHA-256 hex digest
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(stored, legacy)
+    n, r, p, salt, key = parsed
+    return hmac.compare_digest(_scrypt(password, salt, n, r, p), key)
+
+def needs_rehash(stored: str) -> bool:
+    """True for legacy SHA-256 rows and hashes made with older cost settings"""
+    parsed = _parse(stored)
+    return parsed is None or parsed[:3] != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+def submit_hashing(func, *args) -> Future:
+    """Queue a hashing function on the bounded hashing pool without waiting.
+
+    Event handlers use this and continue in a done callback, so a login
+    storm queues here instead of holding Flet's handler threads.
+    """
+    return _pool.submit(func, *args)
+
+def run_hashing(func, *args):
+    """Run a hashing function on the bounded hashing pool and wait for it"""
+    return submit_hashing(func, *args).result()
@@ -0,0 +1,676 @@
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Optional, List, Dict, Tuple
+
+import exception
+from order_events import order_events
+
+DB_PATH = 'canteen.db'
+POOL_SIZE = 8
+POOL_TIMEOUT = 10.0
+# Number of compiled statements each connection keeps around for reuse
+STATEMENT_CACHE_SIZE = 256
+# Most writes the writer thread folds into a single commit
+MAX_WRITE_BATCH = 64
+# Orders per order history page
+ORDER_HISTORY_PAGE_SIZE = 30
+# Reviews per page on the reviews screen
+REVIEW_PAGE_SIZE = 20
+# Open orders shown on the admin order queue
+ORDER_QUEUE_SIZE = 100
+
+# Applied once to every connection the pool and the writer open.
+# journal_mode=WAL itself is persistent and set by database.init_db().
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+)
+
+def open_connection(db_path: str = DB_PATH, timeout: float = POOL_TIMEOUT, **kwargs) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        db_path,
+        timeout=timeout,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        **kwargs
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+#Connection pool
+class ConnectionPool:
+    """Bounded, thread-safe pool of SQLite connections.
+
+    Connections are opened lazily up to `size` and handed back out in LIFO
+    order, so a quiet app keeps reusing the same warm connection (and its
+    statement cache) instead of reconnecting and re-reading the schema.
+    """
+
+    def __init__(self, db_path: str = DB_PATH, size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        return open_connection(self.db_path, self.timeout)
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise exception.DatabaseError("Timed out waiting for a database connection")
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Yield a pooled connection and commit on success, rollback on error"""
+        with self.connection() as conn:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+#Write queue
+class WriteQueue:
+    """Serializes every write through one connection on one thread.
+
+    Jobs are callables taking the writer connection. Whatever has queued up
+    while the previous commit was running is applied in a single
+    BEGIN IMMEDIATE ... COMMIT (group commit), each job inside its own
+    savepoint so a failing job only rolls back itself. Readers use the pool
+    and, with WAL, are never blocked by the writer.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_path: str = DB_PATH, max_batch: int = MAX_WRITE_BATCH):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.jobs_committed = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="canteen-db-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, job: Callable[[sqlite3.Connection], object]) -> Future:
+        future = Future()
+        self._ensure_started()
+        self._jobs.put((job, future))
+        return future
+
+    def run(self, job: Callable[[sqlite3.Connection], object]):
+        """Submit a job and wait for its commit; re-raises the job's error"""
+        return self.submit(job).result()
+
+    def _next_batch(self) -> List:
+        batch = [self._jobs.get()]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._jobs.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        try:
+            # isolation_level=None: transactions are managed explicitly below
+            conn = open_connection(self.db_path, isolation_level=None)
+        except Exception as e:
+            with self._lock:
+                self._thread = None
+            self._fail_pending(e)
+            return
+
+        try:
+            while True:
+                batch = self._next_batch()
+                stop = any(item is self._STOP for item in batch)
+                jobs = [item for item in batch if item is not self._STOP]
+                if jobs:
+                    self._apply(conn, jobs)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, jobs: List):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job, future in jobs:
+                conn.execute("SAVEPOINT job")
+                try:
+                    results.append((future, True, job(conn)))
+                    conn.execute("RELEASE job")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    results.append((future, False, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in jobs:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.jobs_committed += len(jobs)
+        for future, ok, value in results:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _fail_pending(self, error: Exception):
+        while True:
+            try:
+                item = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if item is not self._STOP:
+                item[1].set_exception(error)
+
+    def stop(self):
+        """Flush queued writes and stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._jobs.put(self._STOP)
+            thread.join()
+
+pool = ConnectionPool()
+writer = WriteQueue()
+
+def configure(db_path: str = DB_PATH, size: int = POOL_SIZE):
+    """Point the shared pool and writer at another database (used by scripts and benchmarks)"""
+    global pool, writer
+    writer.stop()
+    pool.close()
+    pool = ConnectionPool(db_path, size)
+    writer = WriteQueue(db_path)
+    return pool
+
+@atexit.register
+def _shutdown():
+    writer.stop()
+    pool.close()
+
+def fetch_all(sql: str, params: Tuple = ()) -> List[Tuple]:
+    with pool.connection() as conn:
+        return conn.execute(sql, params).fetchall()
+
+def fetch_one(sql: str, params: Tuple = ()) -> Optional[Tuple]:
+    with pool.connection() as conn:
+        return conn.execute(sql, params).fetchone()
+
+#Menu
+def get_categories() -> List[Tuple]:
+    return fetch_all("SELECT * FROM categories ORDER BY name")
+
+def get_category_name(category_id: int) -> Optional[str]:
+    row = fetch_one("SELECT name FROM categories WHERE id=?", (category_id,))
+    return row[0] if row else None
+
+def get_food_items(category_id: Optional[int] = None) -> List[Tuple]:
+    if category_id:
+        return fetch_all(
+            "SELECT * FROM food_items WHERE category_id=? AND available=1",
+            (category_id,)
+        )
+    return fetch_all("SELECT * FROM food_items WHERE available=1")
+
+def get_food_item(food_id: int) -> Optional[Tuple]:
+    return fetch_one("SELECT * FROM food_items WHERE id=?", (food_id,))
+
+def get_rating_summary(food_id: int) -> Tuple[float, int]:
+    """(average rating, review count) from the trigger-maintained food_item_stats"""
+    row = fetch_one(
+        "SELECT rating_sum, rating_count FROM food_item_stats WHERE food_item_id=?",
+        (food_id,)
+    )
+    if not row or not row[1]:
+        return 0, 0
+    return row[0] / row[1], row[1]
+
+#Reviews
+def get_reviews(food_id: int, before: Optional[Tuple[str, int]] = None,
+                limit: int = REVIEW_PAGE_SIZE) -> List[Tuple]:
+    """One page of an item's reviews, newest first.
+
+    Rows are (id, rating, comment, review_date, username). Pass the
+    (review_date, id) of the last review of the previous page as `before`
+    to get the next one.
+    """
+    if before is None:
+        return fetch_all("""
+            SELECT r.id, r.rating, r.comment, r.review_date, u.username
+            FROM reviews r
+            JOIN users u ON r.user_id = u.id
+            WHERE r.food_item_id=?
+            ORDER BY r.review_date DESC, r.id DESC
+            LIMIT ?
+        """, (food_id, limit))
+    return fetch_all("""
+        SELECT r.id, r.rating, r.comment, r.review_date, u.username
+        FROM reviews r
+        JOIN users u ON r.user_id = u.id
+        WHERE r.food_item_id=? AND (r.review_date, r.id) < (?, ?)
+        ORDER BY r.review_date DESC, r.id DESC
+        LIMIT ?
+    """, (food_id, before[0], before[1], limit))
+
+def get_reviewable_order(user_id: int, food_id: int) -> Optional[int]:
+    """A delivered, not yet reviewed order of this user containing the item"""
+    row = fetch_one(
+        "SELECT order_id FROM reviewable_items WHERE user_id=? AND food_item_id=? LIMIT 1",
+        (user_id, food_id)
+    )
+    return row[0] if row else None
+
+def add_review(user_id: int, food_id: int, rating: int, comment: str) -> int:
+    """Post a review against one of the user's delivered orders of the item.
+
+    Claiming the reviewable_items row and inserting the review happen in
+    the same write, so a user gets one review per delivered order line
+    even when the submit button is tapped twice. Raises
+    exception.ReviewError when there is nothing left to review.
+    """
+    def job(conn):
+        rows = conn.execute("""
+            DELETE FROM reviewable_items
+            WHERE user_id=? AND food_item_id=? AND order_id = (
+                SELECT order_id FROM reviewable_items WHERE user_id=? AND food_item_id=? LIMIT 1
+            )
+            RETURNING order_id
+        """, (user_id, food_id, user_id, food_id)).fetchall()
+        if not rows:
+            raise exception.ReviewError("Only items from your delivered orders can be reviewed")
+        return conn.execute(
+            "INSERT INTO reviews (user_id, food_item_id, order_id, rating, comment) VALUES (?, ?, ?, ?, ?)",
+            (user_id, food_id, rows[0][0], rating, comment)
+        ).lastrowid
+    return writer.run(job)
+
+#Cart
+def get_cart_quantity(user_id: int, food_id: int) -> int:
+    row = fetch_one(
+        "SELECT quantity FROM cart_items WHERE user_id=? AND food_item_id=?",
+        (user_id, food_id)
+    )
+    return row[0] if row else 0
+
+def get_cart_lines(user_id: int) -> List[Tuple[int, int]]:
+    return fetch_all(
+        "SELECT food_item_id, quantity FROM cart_items WHERE user_id=?",
+        (user_id,)
+    )
+
+def get_cart_items(user_id: int) -> List[Tuple]:
+    return fetch_all('''
+        SELECT fi.id, fi.name, fi.description, fi.price, ci.quantity, fi.image_path
+        FROM cart_items ci
+        JOIN food_items fi ON ci.food_item_id = fi.id
+        WHERE ci.user_id=?
+    ''', (user_id,))
+
+def add_to_cart(user_id: int, food_id: int, quantity: int) -> int:
+    """Add quantity of an item to the cart and return the new quantity.
+
+    One upsert on the (user_id, food_item_id) primary key, so concurrent
+    taps add up instead of overwriting each other.
+    """
+    return writer.run(lambda conn: conn.execute("""
+        INSERT INTO cart_items (user_id, food_item_id, quantity) VALUES (?, ?, ?)
+        ON CONFLICT (user_id, food_item_id) DO UPDATE SET quantity = quantity + excluded.quantity
+        RETURNING quantity
+    """, (user_id, food_id, quantity)).fetchall()[0][0])
+
+def change_cart_quantity(user_id: int, food_id: int, quantity_change: int) -> Optional[int]:
+    """Apply a +/- change to a cart line.
+
+    Returns the new quantity (0 when the line was removed) or None when the
+    item is not in the cart. The change is a single guarded UPDATE; only
+    when it would take the quantity to 0 or below is the line deleted
+    instead, by an equally guarded DELETE.
+    """
+    # fetchall() steps RETURNING statements to completion before the commit
+    def job(conn):
+        rows = conn.execute("""
+            UPDATE cart_items SET quantity = quantity + ?
+            WHERE user_id=? AND food_item_id=? AND quantity + ? > 0
+            RETURNING quantity
+        """, (quantity_change, user_id, food_id, quantity_change)).fetchall()
+        if rows:
+            return rows[0][0]
+
+        rows = conn.execute("""
+            DELETE FROM cart_items
+            WHERE user_id=? AND food_item_id=? AND quantity + ? <= 0
+            RETURNING 0
+        """, (user_id, food_id, quantity_change)).fetchall()
+        return 0 if rows else None
+    return writer.run(job)
+
+def remove_from_cart(user_id: int, food_id: int):
+    writer.run(lambda conn: conn.execute(
+        "DELETE FROM cart_items WHERE user_id=? AND food_item_id=?",
+        (user_id, food_id)
+    ).rowcount)
+
+#Orders
+# Header and lines of one order as a JSON document, stored in order_snapshots
+# when the order is placed (status changes are patched in by a trigger)
+ORDER_SNAPSHOT_SQL = """
+    INSERT OR REPLACE INTO order_snapshots (order_id, snapshot)
+    SELECT o.id, json_object(
+        'order_date', o.order_date,
+        'status', o.status,
+        'total_amount', o.total_amount,
+        'username', u.username,
+        'user_id', o.user_id,
+        'lines', (
+            SELECT json_group_array(json_array(name, quantity, price_at_order))
+            FROM (
+                SELECT fi.name, oi.quantity, oi.price_at_order
+                FROM order_items oi
+                JOIN food_items fi ON oi.food_item_id = fi.id
+                WHERE oi.order_id = o.id
+                ORDER BY oi.rowid
+            )
+        )
+    )
+    FROM orders o
+    JOIN users u ON o.user_id = u.id
+    WHERE o.id=?
+"""
+
+def get_order_by_key(idempotency_key: str) -> Optional[int]:
+    row = fetch_one("SELECT id FROM orders WHERE idempotency_key=?", (idempotency_key,))
+    return row[0] if row else None
+
+def place_order(user_id: int, idempotency_key: Optional[str] = None) -> int:
+    """Turn the user's cart into an order, clear the cart and return the order id.
+
+    Runs as one writer job, so inside a single BEGIN IMMEDIATE transaction:
+    the total, the availability check and the price snapshot of every line
+    are all taken from the same state of cart_items and food_items. Raises
+    exception.OrderError when the cart is empty or holds unavailable items.
+
+    With an idempotency key, repeating the call (double taps, retries)
+    returns the order already placed under that key instead of placing
+    another one; a unique index on orders.idempotency_key backs this up.
+
+    A newly placed order is published to order_events after its commit.
+    """
+    if idempotency_key is not None:
+        # Retries after the first submit committed: one indexed read, no write
+        order_id = get_order_by_key(idempotency_key)
+        if order_id is not None:
+            return order_id
+
+    def job(conn):
+        if idempotency_key is not None:
+            # Duplicates queued behind the first submit see its commit here
+            row = conn.execute(
+                "SELECT id FROM orders WHERE idempotency_key=?",
+                (idempotency_key,)
+            ).fetchone()
+            if row:
+                return row[0], None
+
+        # The HAVING clause refuses the order when any line is unavailable
+        rows = conn.execute("""
+            INSERT INTO orders (user_id, total_amount, idempotency_key)
+            SELECT ?, SUM(fi.price * ci.quantity), ?
+            FROM cart_items ci
+            JOIN food_items fi ON ci.food_item_id = fi.id
+            WHERE ci.user_id=?
+            HAVING COUNT(*) > 0 AND MIN(fi.available) = 1
+            RETURNING id, order_date, status, total_amount,
+                      (SELECT username FROM users WHERE users.id = user_id)
+        """, (user_id, idempotency_key, user_id)).fetchall()
+        if not rows:
+            unavailable = conn.execute("""
+                SELECT fi.name FROM cart_items ci
+                JOIN food_items fi ON ci.food_item_id = fi.id
+                WHERE ci.user_id=? AND fi.available=0
+            """, (user_id,)).fetchall()
+            if unavailable:
+                names = ", ".join(row[0] for row in unavailable)
+                raise exception.OrderError(f"No longer available: {names}")
+            raise exception.OrderError("Your cart is empty")
+
+        order_id = rows[0][0]
+        conn.execute("""
+            INSERT INTO order_items (order_id, food_item_id, quantity, price_at_order)
+            SELECT ?, ci.food_item_id, ci.quantity, fi.price
+            FROM cart_items ci
+            JOIN food_items fi ON ci.food_item_id = fi.id
+            WHERE ci.user_id=?
+        """, (order_id, user_id))
+        conn.execute(ORDER_SNAPSHOT_SQL, (order_id,))
+        conn.execute("DELETE FROM cart_items WHERE user_id=?", (user_id,))
+        return order_id, rows[0]
+    order_id, order = writer.run(job)
+    if order is not None:
+        order_events.publish('placed', order)
+    return order_id
+
+def get_order_history(user_id: int, before: Optional[Tuple[str, int]] = None,
+                      limit: int = ORDER_HISTORY_PAGE_SIZE) -> List[Tuple]:
+    """One page of a user's orders, newest first.
+
+    Keyset pagination: pass the (order_date, id) of the last order of the
+    previous page as `before` to get the next one. Every page is a range
+    read on idx_orders_user_date_id, however deep the user scrolls.
+    """
+    if before is None:
+        return fetch_all("""
+            SELECT id, order_date, status, total_amount
+            FROM orders
+            WHERE user_id=?
+            ORDER BY order_date DESC, id DESC
+            LIMIT ?
+        """, (user_id, limit))
+    return fetch_all("""
+        SELECT id, order_date, status, total_amount
+        FROM orders
+        WHERE user_id=? AND (order_date, id) < (?, ?)
+        ORDER BY order_date DESC, id DESC
+        LIMIT ?
+    """, (user_id, before[0], before[1], limit))
+
+def get_order_header(order_id: int) -> Optional[Tuple]:
+    return fetch_one("""
+        SELECT o.order_date, o.status, o.total_amount, u.username, o.user_id
+        FROM orders o
+        JOIN users u ON o.user_id = u.id
+        WHERE o.id=?
+    """, (order_id,))
+
+def get_order_lines(order_id: int) -> List[Tuple]:
+    return fetch_all("""
+        SELECT fi.name, oi.quantity, oi.price_at_order
+        FROM order_items oi
+        JOIN food_items fi ON oi.food_item_id = fi.id
+        WHERE oi.order_id=?
+    """, (order_id,))
+
+def get_order_details(order_id: int) -> Tuple[Optional[Tuple], List[Tuple]]:
+    """Header and lines of an order from its snapshot, one primary key read.
+
+    The header is (order_date, status, total_amount, username, user_id).
+
+    Orders without a snapshot (e.g. written by an older version) fall back
+    to reading the header and lines separately.
+    """
+    row = fetch_one("SELECT snapshot FROM order_snapshots WHERE order_id=?", (order_id,))
+    if row is None:
+        return get_order_header(order_id), get_order_lines(order_id)
+    snapshot = json.loads(row[0])
+    header = (snapshot['order_date'], snapshot['status'], snapshot['total_amount'],
+              snapshot['username'], snapshot['user_id'])
+    return header, [tuple(line) for line in snapshot['lines']]
+
+# Statuses an order can move to from each open status. Orders are
+# delivered in the kitchen's order; only accepted orders can be prepared.
+ORDER_TRANSITIONS = {
+    'pending': ('accepted', 'rejected'),
+    'accepted': ('prepared', 'rejected'),
+    'prepared': ('delivered',),
+}
+
+def get_order_queue(limit: int = ORDER_QUEUE_SIZE) -> List[Tuple]:
+    """Open orders for the admin queue, newest first.
+
+    Rows are (id, order_date, status, total_amount, username), the same
+    shape as the 'order' of an order_events event.
+    """
+    return fetch_all("""
+        SELECT o.id, o.order_date, o.status, o.total_amount, u.username
+        FROM orders o
+        JOIN users u ON o.user_id = u.id
+        WHERE o.status IN ('pending', 'accepted', 'prepared')
+        ORDER BY o.id DESC
+        LIMIT ?
+    """, (limit,))
+
+def update_order_status(order_id: int, new_status: str) -> Tuple:
+    """Move an order to new_status and return its updated queue row.
+
+    A single guarded UPDATE: it only matches while the order is in a
+    status that may move to new_status (see ORDER_TRANSITIONS), so two
+    admins pressing different buttons on the same order cannot both win.
+    Raises exception.OrderError when the transition is not allowed. The
+    change is published to order_events after its commit.
+    """
+    allowed_from = [status for status, targets in ORDER_TRANSITIONS.items() if new_status in targets]
+    if not allowed_from:
+        raise exception.OrderError(f"Unknown order status: {new_status}")
+
+    def job(conn):
+        rows = conn.execute(f"""
+            UPDATE orders SET status=?
+            WHERE id=? AND status IN ({", ".join("?" * len(allowed_from))})
+            RETURNING id, order_date, status, total_amount,
+                      (SELECT username FROM users WHERE users.id = orders.user_id)
+        """, (new_status, order_id, *allowed_from)).fetchall()
+        if rows:
+            return rows[0]
+        row = conn.execute("SELECT status FROM orders WHERE id=?", (order_id,)).fetchone()
+        if row is None:
+            raise exception.OrderError(f"Order #{order_id} no longer exists")
+        raise exception.OrderError(f"Order #{order_id} is {row[0]} and cannot be marked {new_status}")
+    order = writer.run(job)
+    order_events.publish('status', order)
+    return order
+
+#Menu version
+def get_menu_version() -> int:
+    """Counter bumped by triggers on every change to food_items or categories"""
+    row = fetch_one("SELECT value FROM app_counters WHERE name=?", ('menu_version',))
+    return row[0] if row else 0
+
+#Admin
+ADMIN_STATS = ('total_orders', 'pending_orders', 'total_food_items', 'total_customers')
+
+def get_admin_stats() -> Dict:
+    """Dashboard counts from the trigger-maintained app_counters table.
+
+    Reads four small rows, so it costs the same with a thousand orders
+    or a million.
+    """
+    counters = dict(fetch_all(
+        "SELECT name, value FROM app_counters WHERE name IN (?, ?, ?, ?)",
+        ADMIN_STATS
+    ))
+    return {name: counters.get(name, 0) for name in ADMIN_STATS}
+
+#Users
+def get_user_credentials(username: str) -> Optional[Tuple]:
+    return fetch_one(
+        "SELECT id, password, is_admin FROM users WHERE username=?",
+        (username,)
+    )
+
+def update_password_hash(user_id: int, password_hash: str):
+    writer.run(lambda conn: conn.execute(
+        "UPDATE users SET password=? WHERE id=?",
+        (password_hash, user_id)
+    ).rowcount)
+
+def create_user(username: str, email: str, phone: str, password_hash: str) -> int:
+    return writer.run(lambda conn: conn.execute(
+        "INSERT INTO users (username, email, phone, password) VALUES (?, ?, ?, ?)",
+        (username, email, phone, password_hash)
+    ).lastrowid)
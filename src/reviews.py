@@ -0,0 +1,124 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import flet as ft
+
+import repository
+
+REVIEW_PAGE_SIZE = repository.REVIEW_PAGE_SIZE
+# Items whose first page of reviews is kept in memory
+FIRST_PAGE_CACHE_SIZE = 128
+# Load the next page when the scroll position is this close (px) to the end
+SCROLL_LOAD_THRESHOLD = 400
+
+#Review cache
+class ReviewCache:
+    """LRU cache of the first page of reviews per food item.
+
+    The first page is what nearly every visit to the reviews screen shows;
+    deeper pages are read straight from the index. An item's entry is
+    dropped whenever a review is posted for it through post_review().
+    """
+
+    def __init__(self, size: int = FIRST_PAGE_CACHE_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._pages: "OrderedDict[int, List[Tuple]]" = OrderedDict()
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def first_page(self, food_id: int) -> List[Tuple]:
+        with self._lock:
+            page = self._pages.get(food_id)
+            if page is not None:
+                self._pages.move_to_end(food_id)
+                self.hits += 1
+                return page
+            self.misses += 1
+            invalidations = self._invalidations
+        page = repository.get_reviews(food_id)
+        with self._lock:
+            # A review posted while we were reading may be missing from page
+            if invalidations != self._invalidations:
+                return page
+            self._pages[food_id] = page
+            self._pages.move_to_end(food_id)
+            while len(self._pages) > self.size:
+                self._pages.popitem(last=False)
+        return page
+
+    def invalidate(self, food_id: int):
+        with self._lock:
+            self._invalidations += 1
+            self._pages.pop(food_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+review_cache = ReviewCache()
+
+def post_review(user_id: int, food_id: int, rating: int, comment: str) -> int:
+    """Post a review (see repository.add_review) and drop the cached first page"""
+    review_id = repository.add_review(user_id, food_id, rating, comment)
+    review_cache.invalidate(food_id)
+    return review_id
+
+def build_review_tile(review: Tuple) -> ft.Control:
+    return ft.ListTile(
+        leading=ft.Row(
+            [ft.Icon(ft.Icons.STAR if i < review[1] else ft.Icons.STAR_OUTLINED, size=16) for i in range(5)],
+            spacing=0,
+            width=80
+        ),
+        title=ft.Text(review[4], weight=ft.FontWeight.BOLD),
+        subtitle=ft.Column([
+            ft.Text(review[2] or "", size=14),
+            ft.Text(str(review[3]), size=12, color=ft.Colors.GREY)
+        ], spacing=2)
+    )
+
+#Review list
+class ReviewList:
+    """An item's reviews, newest first, one cursor page at a time.
+
+    The first page comes from review_cache; later pages are appended as
+    the list is scrolled towards its end.
+    """
+
+    def __init__(self, food_id: int, page_size: int = REVIEW_PAGE_SIZE):
+        self.food_id = food_id
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._last_key: Optional[Tuple[str, int]] = None
+        self._exhausted = False
+        self.list_view = ft.ListView(
+            expand=1,
+            on_scroll_interval=100,
+            on_scroll=self._on_scroll
+        )
+
+    def load_more(self, update: bool = True) -> bool:
+        """Append the next page; False when there are no more reviews"""
+        with self._lock:
+            if self._exhausted:
+                return False
+            if self._last_key is None:
+                reviews = review_cache.first_page(self.food_id)
+            else:
+                reviews = repository.get_reviews(self.food_id, self._last_key, self.page_size)
+            if len(reviews) < self.page_size:
+                self._exhausted = True
+            if not reviews:
+                return False
+            self._last_key = (reviews[-1][3], reviews[-1][0])
+            self.list_view.controls.extend(build_review_tile(review) for review in reviews)
+        if update and self.list_view.page:
+            self.list_view.update()
+        return True
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - SCROLL_LOAD_THRESHOLD:
+            self.load_more()
@@ -0,0 +1,91 @@
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Who may open a route
+PUBLIC = 'public'
+USER = 'user'      # any logged in user
+ADMIN = 'admin'
+
+#Routes
+class Route:
+    """A route pattern such as "/food_details/:food_id" and its view.
+
+    `types` maps parameter names to a converter (e.g. int); parameters
+    without one are passed on as strings. A value the converter rejects
+    makes the route not match.
+    """
+
+    def __init__(self, pattern: str, view: Callable, guard: str = PUBLIC, **types: Callable):
+        self.pattern = pattern
+        self.view = view
+        self.guard = guard
+        self.params: List[Tuple[str, Callable]] = [
+            (segment[1:], types.get(segment[1:], str))
+            for segment in pattern.split("/") if segment.startswith(":")
+        ]
+        # (param, converter, regex group name), set when added to a Router
+        self.groups: List[Tuple[str, Callable, str]] = []
+
+    def regex(self, name: str) -> str:
+        """The pattern as a named regex group; parameter groups are name_param"""
+        parts = [
+            f"(?P<{name}_{segment[1:]}>[^/]+)" if segment.startswith(":") else re.escape(segment)
+            for segment in self.pattern.split("/")
+        ]
+        return f"(?P<{name}>{'/'.join(parts)})"
+
+#Router
+class Router:
+    """Resolves a page route to its Route and typed parameters.
+
+    Routes without parameters are found with one dict lookup. All the
+    others are compiled into a single regex, so resolving any path costs
+    at most one dict lookup and one regex match.
+    """
+
+    def __init__(self):
+        self._static: Dict[str, Route] = {}
+        self._dynamic: Dict[str, Route] = {}
+        self._regex = None
+
+    def add(self, pattern: str, view: Callable, guard: str = PUBLIC, **types: Callable) -> Route:
+        route = Route(pattern, view, guard, **types)
+        if route.params:
+            name = f"r{len(self._dynamic)}"
+            route.groups = [(param, convert, f"{name}_{param}") for param, convert in route.params]
+            self._dynamic[name] = route
+            self._regex = re.compile("|".join(r.regex(name) for name, r in self._dynamic.items()))
+        else:
+            self._static[self._normalize(pattern)] = route
+        return route
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        # Query strings never select a route; "/cart/" is "/cart"
+        path = path.split("?", 1)[0]
+        return path.rstrip("/") or "/"
+
+    def _match(self, path: str) -> Optional[Tuple[Route, Dict]]:
+        route = self._static.get(path)
+        if route is not None:
+            return route, {}
+        match = self._regex.fullmatch(path) if self._regex else None
+        if match is None:
+            return None
+        route = self._dynamic[match.lastgroup]
+        params = {}
+        try:
+            for param, convert, group in route.groups:
+                params[param] = convert(match.group(group))
+        except ValueError:
+            return None
+        return route, params
+
+    def resolve(self, path: str) -> Optional[Tuple[Route, Dict]]:
+        """(route, params) for a path, or None when no route matches"""
+        match = self._match(path)
+        if match is None:
+            normalized = self._normalize(path)
+            if normalized != path:
+                match = self._match(normalized)
+        return match
@@ -0,0 +1,250 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import repository
+
+SEARCH_LIMIT = 50
+# Column weights for bm25(): a hit in the name counts far more than one in the description
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+# Most suggestions tried per misspelled word in the fallback search
+MAX_CORRECTIONS = 5
+# Search-as-you-type: quiet period after a keystroke before searching, and
+# how many complete result sets to keep for narrowing longer queries
+DEBOUNCE_SECONDS = 0.25
+PREFIX_CACHE_SIZE = 32
+
+# Letters and digits; "_" separates words, as in the FTS tokenizer
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+#Menu search
+def normalize(text: str) -> str:
+    """Fold text like the index's unicode61 tokenizer (remove_diacritics 2).
+
+    Accents are stripped and the text lower-cased. Canonical (NFD) rather
+    than compatibility decomposition, and lower() rather than casefold():
+    unicode61 leaves ligatures, full-width letters and "ß" as they are.
+    """
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+def tokenize(text: str) -> List[str]:
+    # Query words and cached items go through the same folding, so
+    # narrowing from the prefix cache agrees with a fresh FTS query
+    return _TOKEN_RE.findall(normalize(text))
+
+def build_match_query(tokens: List[str]) -> str:
+    """Every word must match, the last one (still being typed) as a prefix"""
+    terms = [f'"{token}"' for token in tokens]
+    if terms:
+        terms[-1] += "*"
+    return " AND ".join(terms)
+
+def _run_match(match: str, limit: int) -> List[Tuple]:
+    return repository.fetch_all(f"""
+        SELECT fi.*
+        FROM food_items_fts
+        JOIN food_items fi ON fi.id = food_items_fts.rowid
+        WHERE food_items_fts MATCH ? AND fi.available=1
+        ORDER BY bm25(food_items_fts, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})
+        LIMIT ?
+    """, (match, limit))
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, giving up (returns limit + 1) past limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+def max_typos(token: str) -> int:
+    if len(token) <= 3:
+        return 0
+    return 1 if len(token) <= 6 else 2
+
+def suggest_terms(token: str) -> List[str]:
+    """Indexed words within a couple of typos of token, most frequent first.
+
+    Only terms starting with the first or second letter of token are
+    considered, which fts5vocab answers with a range read instead of
+    walking the whole vocabulary.
+    """
+    limit = max_typos(token)
+    if limit == 0:
+        return []
+    rows = []
+    for first in sorted(set(token[:2])):
+        rows += repository.fetch_all(
+            "SELECT term, doc FROM food_items_vocab WHERE term >= ? AND term < ? AND length(term) BETWEEN ? AND ?",
+            (first, chr(ord(first) + 1), len(token) - limit, len(token) + limit)
+        )
+    scored = []
+    for term, doc_count in rows:
+        distance = edit_distance(token, term, limit)
+        if distance <= limit:
+            scored.append((distance, -doc_count, term))
+    scored.sort()
+    return [term for _, _, term in scored[:MAX_CORRECTIONS]]
+
+def _corrected_match(tokens: List[str]) -> Optional[str]:
+    groups = []
+    changed = False
+    for index, token in enumerate(tokens):
+        prefix = index == len(tokens) - 1
+        exact = _run_match(f'"{token}"' + ("*" if prefix else ""), 1)
+        if exact:
+            groups.append(f'"{token}"' + ("*" if prefix else ""))
+            continue
+        suggestions = suggest_terms(token)
+        if not suggestions:
+            return None
+        changed = True
+        groups.append("(" + " OR ".join(f'"{term}"' for term in suggestions) + ")")
+    return " AND ".join(groups) if changed else None
+
+def search_menu(query: str, limit: int = SEARCH_LIMIT) -> List[Tuple]:
+    """BM25-ranked search over available food items.
+
+    Words are matched against name and description, the last word as a
+    prefix. When nothing matches, misspelled words are replaced by close
+    indexed terms and the search is retried once.
+    """
+    return _search(tokenize(query), limit)[0]
+
+def _search(tokens: List[str], limit: int) -> Tuple[List[Tuple], bool]:
+    """Return (results, whether typo correction was needed)"""
+    if not tokens:
+        return [], False
+
+    results = _run_match(build_match_query(tokens), limit)
+    if results:
+        return results, False
+
+    corrected = _corrected_match(tokens)
+    return (_run_match(corrected, limit) if corrected else []), True
+
+def _matches_tokens(item: Tuple, tokens: List[str]) -> bool:
+    # Same rule as build_match_query: whole words, last one as a prefix
+    words = set(tokenize(f"{item[1]} {item[2] or ''}"))
+    if any(token not in words for token in tokens[:-1]):
+        return False
+    return any(word.startswith(tokens[-1]) for word in words)
+
+#Search as you type
+class LiveSearch:
+    """Debounced incremental search for the search dialog.
+
+    Every keystroke restarts a short timer; only the text that is still
+    current when it fires is searched, and results of searches overtaken by
+    newer input are dropped instead of rendered. Complete result sets are
+    kept per query so that typing more letters is answered by filtering a
+    cached set in memory instead of querying again.
+    """
+
+    def __init__(self, on_results: Callable[[str, List[Tuple]], None],
+                 delay: float = DEBOUNCE_SECONDS, limit: int = SEARCH_LIMIT):
+        self.on_results = on_results
+        self.delay = delay
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._timer = None
+        self._generation = 0
+        self._cache: "OrderedDict[Tuple[str, ...], List[Tuple]]" = OrderedDict()
+        self.keystrokes = 0
+        self.searches_executed = 0
+        self.cache_hits = 0
+        self.discarded = 0
+
+    def on_input(self, text: str):
+        with self._lock:
+            self.keystrokes += 1
+            self._generation += 1
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._fire, (self._generation, text))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        """Drop the pending search and any result still in flight"""
+        with self._lock:
+            self._generation += 1
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _is_current(self, generation: int) -> bool:
+        with self._lock:
+            if generation == self._generation:
+                return True
+            self.discarded += 1
+            return False
+
+    def _fire(self, generation: int, text: str):
+        if not self._is_current(generation):
+            return
+        results = self.lookup(text)
+        if self._is_current(generation):
+            self.on_results(text, results)
+
+    def lookup(self, text: str) -> List[Tuple]:
+        tokens = tuple(tokenize(text))
+        if not tokens:
+            return []
+
+        with self._lock:
+            cached = self._cached_superset(tokens)
+        if cached is not None:
+            narrowed = [item for item in cached if _matches_tokens(item, list(tokens))]
+            # Nothing left means a fresh search would try typo corrections
+            if narrowed:
+                with self._lock:
+                    self.cache_hits += 1
+                return narrowed
+
+        results, corrected = _search(list(tokens), self.limit)
+        with self._lock:
+            self.searches_executed += 1
+            # Only a complete, uncorrected result set is a superset of what a
+            # longer query would return
+            if len(results) < self.limit and not corrected:
+                self._cache[tokens] = results
+                self._cache.move_to_end(tokens)
+                while len(self._cache) > PREFIX_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return results
+
+    def _cached_superset(self, tokens: Tuple[str, ...]) -> Optional[List[Tuple]]:
+        text = " ".join(tokens)
+        for key in reversed(self._cache):
+            # "bur" covers "burg" and "bur x"; a longer typed text only narrows it
+            if text.startswith(" ".join(key)) and len(key) <= len(tokens):
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def metrics(self) -> Dict:
+        return {
+            'keystrokes': self.keystrokes,
+            'searches_executed': self.searches_executed,
+            'cache_hits': self.cache_hits,
+            'discarded': self.discarded,
+        }
@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+import flet as ft
+
+from catalog import catalog
+
+# Built views kept per session
+VIEW_CACHE_SIZE = 16
+# Tag of views built from the menu; they expire when catalog.version() moves
+MENU = 'menu'
+
+#View cache
+class ViewCache:
+    """Per-session cache of built Views, keyed by route and parameters.
+
+    Each view is stored with the tags of the data it shows ('menu',
+    'cart', 'reviews', ...) and with the app attributes its handlers read
+    (e.g. the quantity Text of a details page), which get() hands back so
+    the caller can point them at the reused controls again. Views tagged
+    MENU are dropped as soon as the catalog's version changes; any other
+    tag is dropped explicitly with invalidate().
+    """
+
+    def __init__(self, size: int = VIEW_CACHE_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._views: "OrderedDict[Hashable, Tuple[ft.View, Tuple[str, ...], Dict, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[ft.View, Dict]]:
+        """(view, state) for key, or None when it was never built or is stale"""
+        with self._lock:
+            entry = self._views.get(key)
+            if entry is not None and MENU in entry[1] and entry[3] != catalog.version():
+                del self._views[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._views.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[2]
+
+    def put(self, key: Hashable, view: ft.View, tags: Iterable[str] = (), state: Optional[Dict] = None):
+        tags = tuple(tags)
+        with self._lock:
+            menu_version = catalog.version() if MENU in tags else 0
+            self._views[key] = (view, tags, state or {}, menu_version)
+            self._views.move_to_end(key)
+            while len(self._views) > self.size:
+                self._views.popitem(last=False)
+
+    def invalidate(self, tag: str):
+        """Drop every view showing data of this kind"""
+        with self._lock:
+            for key in [key for key, entry in self._views.items() if tag in entry[1]]:
+                del self._views[key]
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()